@@ -36,6 +36,118 @@ class Settings(BaseSettings):
     tts_cleanup_minutes: int = 5
     rate_limit_text: int = 20  # per minute per IP
     rate_limit_voice: int = 10
+    # /api/metrics answers only requests carrying this value in X-Metrics-Token;
+    # left empty, the endpoint is disabled
+    metrics_token: str = ""
+
+    # Text-to-speech: at most tts_max_concurrency requests on the shared client;
+    # replies are synthesized in chunks of at most tts_chunk_max_chars characters,
+    # up to tts_chunk_concurrency chunks of one reply at a time
+    tts_max_concurrency: int = 8
+    tts_chunk_max_chars: int = 300
+    tts_chunk_concurrency: int = 4
+
+    # Per-sentence TTS audio cache: memory LRU in front of a bounded disk tier
+    tts_cache_enabled: bool = True
+    tts_cache_memory_mb: int = 32
+    tts_cache_disk_mb: int = 256
+    tts_cache_dir: str = "/app/tts_cache"
+
+    # Web voice replies: /api/voice returns a stream URL as soon as the reply text exists;
+    # at most audio_stream_max_entries streams are kept (oldest finished dropped first).
+    # Reply audio when the client states no preference: "ogg" (Opus) or "mp3".
+    # Opus sample rate per language (Google TTS sets the Opus bitrate from it);
+    # Tamil and Hindi keep 24 kHz for their retroflex and aspirated consonants
+    voice_audio_streaming: bool = True
+    audio_stream_max_entries: int = 256
+    voice_audio_format: str = "ogg"
+    tts_opus_sample_rate_hz: dict[str, int] = {"ta": 24000, "hi": 24000, "en": 16000}
+
+    # Response cache (web chat)
+    response_cache_enabled: bool = True
+    response_cache_max_entries: int = 512
+    response_cache_ttl_sec: int = 3600
+    response_cache_history_turns: int = 4
+
+    # FAQ fast path (answers FAQ_ENTRIES locally, skipping the LLM)
+    faq_enabled: bool = True
+    faq_match_threshold: float = 0.65
+
+    # Greeting / thanks / goodbye fast path with pre-rendered audio
+    small_talk_enabled: bool = True
+
+    # Language ID: share of words that must look romanized Tamil/Hindi, and the
+    # confidence needed to pass the session's language to Whisper as a hint
+    language_id_romanized_min_share: float = 0.25
+    language_id_hint_min_confidence: float = 0.75
+
+    # System prompt: "scoped" sends only relevant knowledge sections, "full" sends everything
+    system_prompt_mode: str = "scoped"
+    system_prompt_top_k: int = 3
+
+    # Server-side conversation sessions (web chat + voice)
+    session_max_sessions: int = 5000
+    session_max_messages: int = 30
+    session_idle_timeout_minutes: int = 30
+
+    # Conversation history budgets; older turns are folded into a rolling summary
+    chat_history_token_budget: int = 1500
+    phone_history_token_budget: int = 800
+    summary_model: str = "gpt-4o-mini"
+    summary_max_tokens: int = 200
+
+    # Phone calls: stream LLM -> TTS -> mulaw sentence by sentence
+    phone_pipeline_enabled: bool = True
+
+    # STT backend: "whisper_api" or "local_whisper" (CPU, needs faster-whisper);
+    # the optional fallback backend is used when the primary one fails
+    stt_backend: str = "whisper_api"
+    stt_fallback_backend: str = ""
+    local_stt_model: str = "small"
+    local_stt_compute_type: str = "int8"
+    local_stt_workers: int = 1
+    local_stt_cpu_threads: int = 2
+    local_stt_beam_size: int = 1
+
+    # Uploaded recordings: decode once, mono 16 kHz, trim silence, re-encode as Opus
+    audio_preprocess_enabled: bool = True
+    audio_speech_threshold_dbfs: float = -45.0
+    audio_compact_bitrate: str = "24k"
+
+    # Phone STT: "whisper" (batch after end of speech) or "google_streaming"
+    phone_stt_backend: str = "whisper"
+    streaming_stt_final_timeout_sec: float = 2.0
+
+    # Upstream resilience: per-call deadlines, hedging and circuit breaking
+    openai_timeout_sec: float = 20.0
+    openai_stream_timeout_sec: float = 10.0  # until the stream starts
+    openai_fallback_model: str = "gpt-4o-mini"
+    whisper_timeout_sec: float = 15.0
+    tts_timeout_sec: float = 10.0
+    hedge_enabled: bool = True
+    hedge_percentile: float = 0.95
+    hedge_min_samples: int = 20
+    circuit_failure_threshold: int = 5
+    circuit_reset_sec: float = 30.0
+
+    # Shared upstream HTTP pool (OpenAI chat + Whisper), warmed at startup
+    http2_enabled: bool = True
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry_sec: float = 120.0
+    http_connect_timeout_sec: float = 5.0
+    http_read_timeout_sec: float = 60.0
+    http_warm_connections: int = 2
+    http_keepalive_ping_sec: float = 30.0  # idle ping interval, 0 disables
+
+    # Model router: simple turns (short, lead fields, near-FAQ) go to the small model
+    router_enabled: bool = True
+    router_small_model: str = "gpt-4o-mini"
+    router_small_routes: list[str] = ["short", "lead_field", "faq"]
+    router_short_max_words: int = 4
+    router_phone_short_max_words: int = 6
+    router_lead_max_words: int = 12
+    router_faq_min_score: float = 0.45
 
     class Config:
         env_file = ".env"
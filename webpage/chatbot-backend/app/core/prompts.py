@@ -194,34 +194,158 @@ Never mix languages.
 FAQ_ENTRIES = {
     "what_is_vmkd": {
         "question": "What is VMKD X AI LABS?",
-        "answer": "VMKD X AI LABS Business Solution is an AI-first technology company based in Dindigul, Tamil Nadu, India. We specialize in AI-powered business automation, chatbot development, data analytics, and digital transformation services to help businesses leverage the power of artificial intelligence."
+        "variants": [
+            "Tell me about VMKD X AI LABS",
+            "Tell me about your company",
+            "What does your company do?",
+            "Who are you?",
+            "VMKD X AI LABS enna company?",
+            "VMKD X AI LABS பற்றி சொல்லுங்கள்",
+            "நீங்கள் யார்?",
+            "VMKD X AI LABS क्या है?",
+            "आपकी कंपनी क्या करती है?",
+            "VMKD kya hai?",
+        ],
+        "answer": "VMKD X AI LABS Business Solution is an AI-first technology company based in Dindigul, Tamil Nadu, India. We specialize in AI-powered business automation, chatbot development, data analytics, and digital transformation services to help businesses leverage the power of artificial intelligence.",
+        "answer_ta": "VMKD X AI LABS Business Solution என்பது இந்தியாவின் தமிழ்நாடு, திண்டுக்கலில் உள்ள ஒரு AI-முதன்மை தொழில்நுட்ப நிறுவனம். AI மூலம் இயங்கும் வணிக ஆட்டோமேஷன், சாட்பாட் உருவாக்கம், தரவு பகுப்பாய்வு மற்றும் டிஜிட்டல் மாற்றம் சேவைகள் மூலம் வணிகங்கள் செயற்கை நுண்ணறிவின் சக்தியைப் பயன்படுத்த நாங்கள் உதவுகிறோம்.",
+        "answer_hi": "VMKD X AI LABS Business Solution डिंडीगुल, तमिलनाडु, भारत में स्थित एक AI-फर्स्ट टेक्नोलॉजी कंपनी है। हम AI-आधारित बिज़नेस ऑटोमेशन, चैटबॉट डेवलपमेंट, डेटा एनालिटिक्स और डिजिटल ट्रांसफॉर्मेशन सेवाओं के ज़रिए व्यवसायों को आर्टिफिशियल इंटेलिजेंस की ताकत का लाभ उठाने में मदद करते हैं।"
     },
     "services": {
         "question": "What services do you offer?",
-        "answer": "We offer 12 core services: AI Business Automation, AI Chatbot Development, Business Process Automation, Data Analytics & AI Insights, Custom AI Development, AI Consulting & Strategy, LLM Integration & RAG Systems, Voice AI & Workflow Automation, Digital Transformation, AI Training for Teams, SaaS & MVP Development, and Cloud AI Deployment."
+        "variants": [
+            "Which services do you provide?",
+            "List your services",
+            "neenga enna services panreenga?",
+            "enna service pannuveenga?",
+            "ungal sevaigal enna?",
+            "நீங்கள் என்ன சேவைகள் வழங்குகிறீர்கள்?",
+            "உங்கள் சேவைகள் என்ன?",
+            "आप कौन सी सेवाएं देते हैं?",
+            "आप क्या सेवाएँ देते हैं?",
+            "aap kya services dete ho?",
+        ],
+        "answer": "We offer 12 core services: AI Business Automation, AI Chatbot Development, Business Process Automation, Data Analytics & AI Insights, Custom AI Development, AI Consulting & Strategy, LLM Integration & RAG Systems, Voice AI & Workflow Automation, Digital Transformation, AI Training for Teams, SaaS & MVP Development, and Cloud AI Deployment.",
+        "answer_ta": "நாங்கள் 12 முக்கிய சேவைகளை வழங்குகிறோம்: AI வணிக ஆட்டோமேஷன், AI சாட்பாட் உருவாக்கம், வணிக செயல்முறை ஆட்டோமேஷன், தரவு பகுப்பாய்வு & AI நுண்ணறிவுகள், தனிப்பயன் AI உருவாக்கம், AI ஆலோசனை & உத்தி, LLM ஒருங்கிணைப்பு & RAG அமைப்புகள், குரல் AI & பணிப்பாய்வு ஆட்டோமேஷன், டிஜிட்டல் மாற்றம், குழுக்களுக்கான AI பயிற்சி, SaaS & MVP உருவாக்கம், மற்றும் கிளவுட் AI பயன்பாடு.",
+        "answer_hi": "हम 12 मुख्य सेवाएँ प्रदान करते हैं: AI बिज़नेस ऑटोमेशन, AI चैटबॉट डेवलपमेंट, बिज़नेस प्रोसेस ऑटोमेशन, डेटा एनालिटिक्स और AI इनसाइट्स, कस्टम AI डेवलपमेंट, AI कंसल्टिंग और रणनीति, LLM इंटीग्रेशन और RAG सिस्टम, वॉइस AI और वर्कफ़्लो ऑटोमेशन, डिजिटल ट्रांसफॉर्मेशन, टीमों के लिए AI ट्रेनिंग, SaaS और MVP डेवलपमेंट, तथा क्लाउड AI डिप्लॉयमेंट।"
     },
     "contact": {
         "question": "How can I contact you?",
-        "answer": "You can reach us at:\n- Email: info@vmkdxailabs.com\n- Phone: +91-7824030723\n- Working Hours: Monday to Saturday, 9:00 AM - 7:00 PM IST\n- Website: https://vmkdxailabs.com"
+        "variants": [
+            "What is your phone number?",
+            "What is your email address?",
+            "How do I reach you?",
+            "Contact details",
+            "unga contact number enna?",
+            "உங்களை எப்படி தொடர்பு கொள்வது?",
+            "உங்கள் தொலைபேசி எண் என்ன?",
+            "आपसे कैसे संपर्क करें?",
+            "aapka phone number kya hai?",
+        ],
+        "answer": "You can reach us at:\n- Email: info@vmkdxailabs.com\n- Phone: +91-7824030723\n- Working Hours: Monday to Saturday, 9:00 AM - 7:00 PM IST\n- Website: https://vmkdxailabs.com",
+        "answer_ta": "நீங்கள் எங்களைத் தொடர்பு கொள்ளலாம்:\n- மின்னஞ்சல்: info@vmkdxailabs.com\n- தொலைபேசி: +91-7824030723\n- வேலை நேரம்: திங்கள் முதல் சனி வரை, காலை 9:00 - மாலை 7:00 IST\n- இணையதளம்: https://vmkdxailabs.com",
+        "answer_hi": "आप हमसे यहाँ संपर्क कर सकते हैं:\n- ईमेल: info@vmkdxailabs.com\n- फ़ोन: +91-7824030723\n- कार्य समय: सोमवार से शनिवार, सुबह 9:00 - शाम 7:00 IST\n- वेबसाइट: https://vmkdxailabs.com"
     },
     "location": {
         "question": "Where are you located?",
-        "answer": "We are headquartered in Dindigul, Tamil Nadu, India."
+        "variants": [
+            "Where is your office?",
+            "Where is your company based?",
+            "unga office enga irukku?",
+            "neenga enga irukeenga?",
+            "உங்கள் அலுவலகம் எங்கே உள்ளது?",
+            "நீங்கள் எங்கே இருக்கிறீர்கள்?",
+            "आपका ऑफिस कहाँ है?",
+            "aap kahan located ho?",
+        ],
+        "answer": "We are headquartered in Dindigul, Tamil Nadu, India.",
+        "answer_ta": "எங்கள் தலைமையகம் இந்தியாவின் தமிழ்நாட்டில் உள்ள திண்டுக்கலில் அமைந்துள்ளது.",
+        "answer_hi": "हमारा मुख्यालय डिंडीगुल, तमिलनाडु, भारत में है।"
     },
     "industries": {
         "question": "What industries do you serve?",
-        "answer": "We serve a wide range of industries including Banking & Finance, Manufacturing, Healthcare, Retail & E-commerce, Insurance, Professional Services, Logistics & Supply Chain, Education, HR & Operations, ePublishing, and eBooks Automation."
+        "variants": [
+            "Which industries do you work with?",
+            "Which sectors do you cover?",
+            "enna industries-ku serve panreenga?",
+            "நீங்கள் எந்த தொழில்துறைகளுக்கு சேவை செய்கிறீர்கள்?",
+            "आप किन उद्योगों को सेवा देते हैं?",
+            "aap kaun si industries serve karte ho?",
+        ],
+        "answer": "We serve a wide range of industries including Banking & Finance, Manufacturing, Healthcare, Retail & E-commerce, Insurance, Professional Services, Logistics & Supply Chain, Education, HR & Operations, ePublishing, and eBooks Automation.",
+        "answer_ta": "வங்கி & நிதி, உற்பத்தி, சுகாதாரம், சில்லறை வணிகம் & இ-காமர்ஸ், காப்பீடு, தொழில்முறை சேவைகள், லாஜிஸ்டிக்ஸ் & விநியோகச் சங்கிலி, கல்வி, HR & செயல்பாடுகள், இ-பப்ளிஷிங் மற்றும் இ-புக்ஸ் ஆட்டோமேஷன் உள்ளிட்ட பல துறைகளுக்கு நாங்கள் சேவை செய்கிறோம்.",
+        "answer_hi": "हम कई उद्योगों को सेवाएँ देते हैं, जिनमें बैंकिंग और फाइनेंस, मैन्युफैक्चरिंग, हेल्थकेयर, रिटेल और ई-कॉमर्स, इंश्योरेंस, प्रोफेशनल सर्विसेज़, लॉजिस्टिक्स और सप्लाई चेन, शिक्षा, HR और ऑपरेशंस, ई-पब्लिशिंग तथा ई-बुक्स ऑटोमेशन शामिल हैं।"
     },
     "technologies": {
         "question": "What technologies do you use?",
-        "answer": "We work with Java, Python, AutoGen, N8N, AWS, Azure, GCP, Large Language Models (LLMs), RAG (Retrieval-Augmented Generation), NLP, and Computer Vision among other cutting-edge technologies."
+        "variants": [
+            "What is your tech stack?",
+            "Which tools and technologies do you use?",
+            "enna technology use panreenga?",
+            "நீங்கள் என்ன தொழில்நுட்பங்களைப் பயன்படுத்துகிறீர்கள்?",
+            "आप कौन सी टेक्नोलॉजी इस्तेमाल करते हैं?",
+            "aapka tech stack kya hai?",
+        ],
+        "answer": "We work with Java, Python, AutoGen, N8N, AWS, Azure, GCP, Large Language Models (LLMs), RAG (Retrieval-Augmented Generation), NLP, and Computer Vision among other cutting-edge technologies.",
+        "answer_ta": "நாங்கள் Java, Python, AutoGen, N8N, AWS, Azure, GCP, பெரிய மொழி மாதிரிகள் (LLMs), RAG (Retrieval-Augmented Generation), NLP மற்றும் கணினி பார்வை (Computer Vision) உள்ளிட்ட நவீன தொழில்நுட்பங்களுடன் பணியாற்றுகிறோம்.",
+        "answer_hi": "हम Java, Python, AutoGen, N8N, AWS, Azure, GCP, लार्ज लैंग्वेज मॉडल्स (LLMs), RAG (Retrieval-Augmented Generation), NLP और कंप्यूटर विज़न जैसी आधुनिक तकनीकों के साथ काम करते हैं।"
     },
     "pricing": {
         "question": "How much do your services cost?",
-        "answer": "Pricing depends on your specific requirements and project scope. We'd love to understand your needs and provide a tailored quote. Please schedule a free consultation with our team at info@vmkdxailabs.com or call +91-7824030723."
+        "variants": [
+            "What is the price?",
+            "How much does it cost?",
+            "What are your charges?",
+            "evvalavu cost aagum?",
+            "price evlo?",
+            "price enna?",
+            "விலை என்ன?",
+            "எவ்வளவு செலவாகும்?",
+            "कीमत क्या है?",
+            "कितना खर्च होगा?",
+            "kitna cost hoga?",
+        ],
+        "answer": "Pricing depends on your specific requirements and project scope. We'd love to understand your needs and provide a tailored quote. Please schedule a free consultation with our team at info@vmkdxailabs.com or call +91-7824030723.",
+        "answer_ta": "விலை உங்கள் குறிப்பிட்ட தேவைகள் மற்றும் திட்டத்தின் அளவைப் பொறுத்தது. உங்கள் தேவைகளைப் புரிந்துகொண்டு உங்களுக்கேற்ற விலைப்பட்டியலை வழங்க விரும்புகிறோம். info@vmkdxailabs.com என்ற மின்னஞ்சலில் அல்லது +91-7824030723 என்ற எண்ணில் எங்கள் குழுவுடன் இலவச ஆலோசனையைத் திட்டமிடுங்கள்.",
+        "answer_hi": "कीमत आपकी विशिष्ट आवश्यकताओं और प्रोजेक्ट के दायरे पर निर्भर करती है। हम आपकी ज़रूरतों को समझकर आपके लिए उपयुक्त कोटेशन देना चाहेंगे। कृपया info@vmkdxailabs.com पर ईमेल करके या +91-7824030723 पर कॉल करके हमारी टीम के साथ निःशुल्क परामर्श तय करें।"
     },
     "consultation": {
         "question": "How do I book a consultation?",
-        "answer": "You can book a free consultation by:\n- Emailing us at info@vmkdxailabs.com\n- Calling +91-7824030723 (Mon-Sat, 9 AM - 7 PM IST)\n- Visiting our website and clicking 'Book a Demo'"
+        "variants": [
+            "Can I book a demo?",
+            "How do I schedule a meeting?",
+            "demo book panna mudiyuma?",
+            "ஆலோசனையை எப்படி முன்பதிவு செய்வது?",
+            "डेमो कैसे बुक करें?",
+            "consultation kaise book karein?",
+        ],
+        "answer": "You can book a free consultation by:\n- Emailing us at info@vmkdxailabs.com\n- Calling +91-7824030723 (Mon-Sat, 9 AM - 7 PM IST)\n- Visiting our website and clicking 'Book a Demo'",
+        "answer_ta": "இலவச ஆலோசனையை நீங்கள் இவ்வாறு முன்பதிவு செய்யலாம்:\n- info@vmkdxailabs.com க்கு மின்னஞ்சல் அனுப்புங்கள்\n- +91-7824030723 ஐ அழையுங்கள் (திங்கள்-சனி, காலை 9 - மாலை 7 IST)\n- எங்கள் இணையதளத்தில் 'Book a Demo' ஐ கிளிக் செய்யுங்கள்",
+        "answer_hi": "आप निःशुल्क परामर्श इस तरह बुक कर सकते हैं:\n- info@vmkdxailabs.com पर ईमेल करें\n- +91-7824030723 पर कॉल करें (सोम-शनि, सुबह 9 - शाम 7 IST)\n- हमारी वेबसाइट पर जाकर 'Book a Demo' पर क्लिक करें"
+    },
+}
+
+# Follow-up appended to first-turn FAQ answers so lead collection still starts
+FAQ_LEAD_PROMPT = {
+    "en": "I'd love to connect you with our team for more details. May I have your name?",
+    "ta": "மேலும் விவரங்களுக்கு உங்களை எங்கள் குழுவுடன் இணைக்க விரும்புகிறேன். உங்கள் பெயரைத் தெரிந்துகொள்ளலாமா?",
+    "hi": "अधिक जानकारी के लिए मैं आपको हमारी टीम से जोड़ना चाहूँगा। क्या मैं आपका नाम जान सकता हूँ?",
+}
+
+# Pre-written replies for the greeting / thanks / goodbye fast path (text, web voice and phone)
+SMALL_TALK_REPLIES = {
+    "greeting": {
+        "en": "Hello! Welcome to VMKD X AI LABS. How can I help you today?",
+        "ta": "வணக்கம்! VMKD X AI LABS-க்கு உங்களை வரவேற்கிறோம். நான் உங்களுக்கு எப்படி உதவ முடியும்?",
+        "hi": "नमस्ते! VMKD X AI LABS में आपका स्वागत है। मैं आपकी क्या मदद कर सकता हूँ?",
+    },
+    "thanks": {
+        "en": "You're welcome! Is there anything else I can help you with?",
+        "ta": "மகிழ்ச்சி! வேறு ஏதாவது உதவி தேவையா?",
+        "hi": "आपका स्वागत है! क्या मैं आपकी और कोई मदद कर सकता हूँ?",
+    },
+    "goodbye": {
+        "en": "Thank you for contacting VMKD X AI LABS. Have a great day!",
+        "ta": "VMKD X AI LABS-ஐ தொடர்பு கொண்டதற்கு நன்றி. இனிய நாள் வாழ்த்துக்கள்!",
+        "hi": "VMKD X AI LABS से संपर्क करने के लिए धन्यवाद। आपका दिन शुभ हो!",
     },
 }
@@ -1,17 +1,33 @@
+import asyncio
 import logging
 import os
+import secrets
 import time
 from collections import defaultdict
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, Request, HTTPException
+from fastapi import FastAPI, Header, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from app.core.config import get_settings
 from app.routers import chat, voice
 from app.routers import twilio_voice
-from app.services.tts_service import AUDIO_TEMP_DIR
+from app.services.tts_cache import tts_cache
+from app.services.tts_service import AUDIO_TEMP_DIR, tts_engine
+from app.services.audio_preprocessor import audio_preprocess_stats
+from app.services.audio_stream import audio_streams
+from app.services.client_registry import clients
+from app.services.faq_service import get_faq_index
+from app.services.llm_service import completion_flight
+from app.services.model_router import model_router
+from app.services.prompt_service import get_scoped_prompt
+from app.services.resilience import provider_stats
+from app.services.response_cache import response_cache
+from app.services.session_store import session_store
+from app.services.small_talk import small_talk_audio
+from app.services.streaming_stt import streaming_stt_stats
+from app.services.stt_backends import close_stt_backends, start_stt_backends, stt_backend_stats
 
 # Configure logging
 logging.basicConfig(
@@ -29,7 +45,10 @@ rate_limit_store: dict[str, list[float]] = defaultdict(list)
 
 RATE_LIMITS = {
     "/api/chat": settings.rate_limit_text,
+    "/api/chat/stream": settings.rate_limit_text,
     "/api/voice": settings.rate_limit_voice,
+    "/api/voice/stream": settings.rate_limit_voice,
+    "/api/metrics": settings.rate_limit_text,
 }
 
 
@@ -106,6 +125,27 @@ async def lifespan(app: FastAPI):
             except Exception as e:
                 logger.warning(f"Could not remove {f}: {e}")
 
+    # Build the local FAQ and system prompt indexes so the first request is not slowed down
+    get_faq_index()
+    get_scoped_prompt()
+
+    # Open the shared upstream connection pool before the first request
+    await clients.start()
+
+    # Start the speech-to-text backend(s) (loads the model for local STT)
+    await start_stt_backends()
+
+    # Create the shared Google TTS client before the first synthesis
+    try:
+        await tts_engine.start()
+    except Exception as e:
+        logger.error(f"Google TTS client failed to start: {e}")
+    if settings.tts_cache_enabled:
+        await tts_cache.start()
+
+    # Synthesize the greeting / thanks / goodbye audio in the background
+    prerender_task = asyncio.create_task(small_talk_audio.prerender())
+
     # Validate essential configuration
     if not settings.openai_api_key:
         logger.warning("OPENAI_API_KEY is not set! Chat endpoints will fail.")
@@ -118,6 +158,7 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     logger.info("VMKD X AI LABS Chatbot Backend shutting down...")
+    prerender_task.cancel()
 
     # Final cleanup of audio temp files
     if os.path.exists(AUDIO_TEMP_DIR):
@@ -128,8 +169,18 @@ async def lifespan(app: FastAPI):
             except Exception:
                 pass
 
-    # Clear rate limit store
+    # Clear rate limit store, cached replies and conversation sessions
+    # (the TTS cache's disk tier is kept for the next run)
     rate_limit_store.clear()
+    response_cache.clear()
+    tts_cache.clear_memory()
+    audio_streams.clear()
+    session_store.clear()
+
+    # Close pooled upstream connections, STT workers and the TTS client
+    await clients.close()
+    await close_stt_backends()
+    await tts_engine.close()
 
     logger.info("Shutdown complete.")
 
@@ -216,3 +267,33 @@ async def health_check():
             "twilio_configured": bool(settings.twilio_account_sid and settings.twilio_auth_token),
         },
     }
+
+
+@app.get("/api/metrics")
+async def metrics(x_metrics_token: str | None = Header(None)):
+    """
+    Runtime metrics for the in-process caches and optimizations.
+    Requires the configured METRICS_TOKEN in the X-Metrics-Token header;
+    without a configured token the endpoint does not exist.
+    """
+    if not settings.metrics_token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not x_metrics_token or not secrets.compare_digest(x_metrics_token.encode(), settings.metrics_token.encode()):
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+    return {
+        "response_cache": response_cache.stats(),
+        "faq": get_faq_index().stats(),
+        "system_prompt": get_scoped_prompt().stats(),
+        "sessions": session_store.stats(),
+        "llm_single_flight": completion_flight.stats(),
+        "upstream": provider_stats(),
+        "upstream_pool": clients.stats(),
+        "model_router": model_router.stats(),
+        "small_talk": small_talk_audio.stats(),
+        "streaming_stt": streaming_stt_stats.stats(),
+        "stt": stt_backend_stats(),
+        "audio_preprocess": audio_preprocess_stats.stats(),
+        "tts": tts_engine.stats(),
+        "tts_cache": tts_cache.stats(),
+        "audio_streams": audio_streams.stats(),
+    }
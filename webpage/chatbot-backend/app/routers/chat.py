@@ -1,25 +1,49 @@
+import json
 import logging
-import re
+from collections.abc import AsyncIterator
+from typing import Literal
+
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
-from app.services.llm_service import get_chat_response
+from app.core.config import get_settings
+from app.services.language_id import detect_language
+from app.services.session_store import ConversationSession, session_store
+from app.services.llm_service import (
+    EMPTY_REPLY_FALLBACK,
+    get_chat_response,
+    schedule_history_summary,
+    stream_chat_response,
+)
 from app.services.email_service import (
     extract_lead_data,
     extract_lead_from_conversation,
+    lead_safe_length,
     strip_lead_marker,
 )
 
 logger = logging.getLogger(__name__)
 
+settings = get_settings()
+
 router = APIRouter()
 
 
+class HistoryMessage(BaseModel):
+    role: Literal["user", "assistant"]
+    content: str = Field(..., max_length=8000)
+
+
 class ChatRequest(BaseModel):
     message: str = Field(..., min_length=1, max_length=2000, description="User's message text")
     language: str = Field(default="auto", description="Language hint: 'ta', 'en', 'hi', or 'auto'")
     session_id: str = Field(..., min_length=1, max_length=128, description="Unique session identifier")
-    history: list[dict] = Field(default_factory=list, description="Conversation history")
+    history: list[HistoryMessage] = Field(
+        default_factory=list,
+        max_length=50,
+        description="Deprecated: the server keeps history per session_id. Only used to seed a new session.",
+    )
 
 
 class LeadData(BaseModel):
@@ -35,19 +59,44 @@ class ChatResponse(BaseModel):
     lead: LeadData | None = None
 
 
-def detect_language(text: str) -> str:
+def _load_session(request: ChatRequest) -> ConversationSession:
+    """Get the server-side session for a request, seeding it from client history if new."""
+    seed = [entry.model_dump() for entry in request.history]
+    # Older clients include the current message as the last history entry
+    if seed and seed[-1]["role"] == "user" and seed[-1]["content"] == request.message:
+        seed = seed[:-1]
+    return session_store.get_or_create(request.session_id, seed_history=seed)
+
+
+def _resolve_lead(reply: str, message: str, history: list[dict]) -> tuple[str, dict | None]:
     """
-    Detect the language of the input text based on Unicode character ranges.
+    Extract lead data from a finished reply.
+
+    Tries the LEAD_DATA marker first, then falls back to regex extraction
+    from the conversation.
+
+    Returns:
+        The reply with any lead marker stripped, and the lead dict (or None).
     """
-    tamil_pattern = re.compile(r"[\u0B80-\u0BFF]")
-    if tamil_pattern.search(text):
-        return "ta"
+    # Try marker-based extraction first
+    lead_dict = extract_lead_data(reply)
+    if lead_dict:
+        logger.info(f"Lead captured via marker (text): {lead_dict['name']}")
+        return strip_lead_marker(reply), lead_dict
+
+    # Fallback: regex-based extraction from conversation
+    lead_dict = extract_lead_from_conversation(
+        current_message=message,
+        history=history,
+    )
+    if lead_dict:
+        logger.info(f"Lead captured via regex (text): {lead_dict['name']}")
+    return reply, lead_dict
 
-    hindi_pattern = re.compile(r"[\u0900-\u097F]")
-    if hindi_pattern.search(text):
-        return "hi"
 
-    return "en"
+def _sse_event(event: str, data: dict) -> str:
+    """Format a single Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
 
 
 @router.post("/api/chat", response_model=ChatResponse)
@@ -62,34 +111,27 @@ async def chat(request: ChatRequest):
         else:
             detected_language = request.language
 
+        session = _load_session(request)
+        history = session.history()
+
         logger.info(
             f"Chat request - session: {request.session_id}, "
             f"language: {detected_language}, "
-            f"history_length: {len(request.history)}, "
+            f"history_length: {len(history)}, "
             f"message_length: {len(request.message)}"
         )
 
         reply = await get_chat_response(
             user_message=request.message,
-            history=request.history,
+            history=history,
             language_hint=detected_language,
+            summary=session.summary,
         )
 
-        # Try marker-based extraction first
-        lead_dict = extract_lead_data(reply)
-        if lead_dict:
-            logger.info(f"Lead captured via marker (text): {lead_dict['name']}")
-            reply = strip_lead_marker(reply)
-        else:
-            # Fallback: regex-based extraction from conversation
-            lead_dict = extract_lead_from_conversation(
-                current_message=request.message,
-                history=request.history,
-            )
-            if lead_dict:
-                logger.info(f"Lead captured via regex (text): {lead_dict['name']}")
-
+        reply, lead_dict = _resolve_lead(reply, request.message, session.lead_history())
         lead_response = LeadData(**lead_dict) if lead_dict else None
+        session.add_turn(request.message, reply)
+        schedule_history_summary(session, settings.chat_history_token_budget)
 
         return ChatResponse(
             reply=reply,
@@ -103,3 +145,77 @@ async def chat(request: ChatRequest):
             status_code=500,
             detail="An error occurred while processing your message. Please try again later.",
         )
+
+
+@router.post("/api/chat/stream")
+async def chat_stream(request: ChatRequest):
+    """
+    Stream a text chat reply as Server-Sent Events.
+
+    Emits "token" events ({"delta": str}) while the model is generating, then
+    a single "done" event carrying the full ChatResponse payload (final reply,
+    language and lead). On failure an "error" event is sent instead of "done".
+    """
+    if request.language == "auto":
+        detected_language = detect_language(request.message)
+    else:
+        detected_language = request.language
+
+    session = _load_session(request)
+    history = session.history()
+
+    logger.info(
+        f"Chat stream request - session: {request.session_id}, "
+        f"language: {detected_language}, "
+        f"history_length: {len(history)}, "
+        f"message_length: {len(request.message)}"
+    )
+
+    async def event_stream() -> AsyncIterator[str]:
+        reply = ""
+        sent = 0
+        try:
+            async for delta in stream_chat_response(
+                user_message=request.message,
+                history=history,
+                language_hint=detected_language,
+                summary=session.summary,
+            ):
+                reply += delta
+                safe = lead_safe_length(reply)
+                if safe > sent:
+                    yield _sse_event("token", {"delta": reply[sent:safe]})
+                    sent = safe
+
+            reply = reply.strip()
+            if not reply:
+                logger.warning("OpenAI stream returned an empty response.")
+                reply = EMPTY_REPLY_FALLBACK
+                yield _sse_event("token", {"delta": reply})
+
+            reply, lead_dict = _resolve_lead(reply, request.message, session.lead_history())
+            lead_response = LeadData(**lead_dict) if lead_dict else None
+            session.add_turn(request.message, reply)
+            schedule_history_summary(session, settings.chat_history_token_budget)
+
+            final = ChatResponse(
+                reply=reply,
+                language=detected_language,
+                lead=lead_response,
+            )
+            yield _sse_event("done", final.model_dump())
+
+        except Exception as e:
+            logger.error(f"Chat stream error: {e}", exc_info=True)
+            yield _sse_event("error", {
+                "detail": "An error occurred while processing your message. Please try again later.",
+            })
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+        },
+    )
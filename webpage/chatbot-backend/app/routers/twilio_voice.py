@@ -22,7 +22,9 @@ from app.services.stream_processor import (
     remove_session,
     detect_silence,
     process_speech_turn,
+    process_speech_turn_pipelined,
     build_media_message,
+    build_mark_message,
     SILENCE_DURATION_SEC,
 )
 
@@ -191,6 +193,7 @@ async def media_stream(websocket: WebSocket, call_sid: str):
                     session.add_audio_chunk(audio_chunk)
                     last_audio_time = time.time()
                 else:
+                    session.add_silence_chunk(audio_chunk)
                     # Check if we have buffered speech and enough silence has passed
                     if (
                         session.is_speaking
@@ -202,13 +205,25 @@ async def media_stream(websocket: WebSocket, call_sid: str):
                             "Silence detected for %s, processing %.1fs of speech",
                             call_sid, session.get_speech_duration(),
                         )
-                        mulaw_response = await process_speech_turn(session)
-
-                        if mulaw_response and stream_sid:
-                            # Send audio response back to caller
-                            media_messages = build_media_message(stream_sid, mulaw_response)
-                            for msg in media_messages:
-                                await websocket.send_text(json.dumps(msg))
+                        if settings.phone_pipeline_enabled:
+                            # Stream each sentence's audio as soon as it is ready
+                            async def send_audio(mulaw_audio: bytes) -> None:
+                                if not stream_sid:
+                                    return
+                                for msg in build_media_message(stream_sid, mulaw_audio, include_mark=False):
+                                    await websocket.send_text(json.dumps(msg))
+
+                            audio_sent = await process_speech_turn_pipelined(session, send_audio)
+                            if audio_sent and stream_sid:
+                                await websocket.send_text(json.dumps(build_mark_message(stream_sid)))
+                        else:
+                            mulaw_response = await process_speech_turn(session)
+
+                            if mulaw_response and stream_sid:
+                                # Send audio response back to caller
+                                media_messages = build_media_message(stream_sid, mulaw_response)
+                                for msg in media_messages:
+                                    await websocket.send_text(json.dumps(msg))
 
             elif event == "mark":
                 # Playback of our response finished
@@ -1,15 +1,38 @@
+import json
 import logging
 import os
 import asyncio
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form, BackgroundTasks
-from fastapi.responses import FileResponse
+from collections.abc import AsyncIterator
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Header, BackgroundTasks
+from fastapi.responses import FileResponse, StreamingResponse
 from pydantic import BaseModel
 
 from app.core.config import get_settings
+from app.services.audio_preprocessor import AudioRejected, prepare_for_stt
+from app.services.audio_stream import audio_streams
 from app.services.stt_service import transcribe_audio
-from app.services.llm_service import get_chat_response
-from app.services.tts_service import synthesize_speech, AUDIO_TEMP_DIR
-from app.services.email_service import extract_lead_data, extract_lead_from_conversation, strip_lead_marker
+from app.services.llm_service import (
+    EMPTY_REPLY_FALLBACK,
+    get_chat_response,
+    schedule_history_summary,
+    stream_chat_response,
+)
+from app.services.tts_service import (
+    MP3,
+    OGG_OPUS,
+    audio_media_type,
+    synthesize_speech,
+    AUDIO_TEMP_DIR,
+)
+from app.services.email_service import (
+    extract_lead_data,
+    extract_lead_from_conversation,
+    lead_safe_length,
+    strip_lead_marker,
+)
+from app.services.language_id import language_hint_from_history
+from app.services.session_store import session_store
+from app.services.small_talk import match_small_talk, small_talk_audio_file, small_talk_reply
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +40,9 @@ settings = get_settings()
 
 router = APIRouter()
 
+AUDIO_STREAM_PATH = "/api/audio/stream/"
+SYNTHESIS_FAILED_DETAIL = "Could not generate the reply audio. Please try again later."
+
 
 class LeadData(BaseModel):
     name: str
@@ -72,110 +98,269 @@ async def _cleanup_audio_file(filepath: str, delay_minutes: int) -> None:
         logger.warning(f"Failed to clean up audio file {filepath}: {e}")
 
 
+# audio_format form values and Accept media types -> TTS encoding
+AUDIO_FORMAT_ENCODINGS = {"ogg": OGG_OPUS, "mp3": MP3}
+ACCEPT_ENCODINGS = {
+    "audio/ogg": OGG_OPUS,
+    "audio/opus": OGG_OPUS,
+    "audio/mpeg": MP3,
+    "audio/mp3": MP3,
+}
+
+
+def _negotiate_audio_encoding(audio_format: str, accept: str | None) -> str:
+    """
+    Pick the reply audio encoding.
+
+    Args:
+        audio_format: "ogg", "mp3", or "auto" to decide from the Accept header.
+        accept: The request's Accept header, if any.
+
+    Returns:
+        OGG_OPUS or MP3. With no stated preference, voice_audio_format
+        decides (Opus by default: a fraction of the MP3 size for speech).
+    """
+    if audio_format in AUDIO_FORMAT_ENCODINGS:
+        return AUDIO_FORMAT_ENCODINGS[audio_format]
+
+    best, best_q = None, 0.0
+    for item in (accept or "").split(","):
+        media_type, *params = (part.strip() for part in item.split(";"))
+        encoding = ACCEPT_ENCODINGS.get(media_type.lower())
+        if encoding is None:
+            continue
+        q = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        # Equal preference goes to the first listed type
+        if q > best_q:
+            best, best_q = encoding, q
+    if best is not None:
+        return best
+    return AUDIO_FORMAT_ENCODINGS.get(settings.voice_audio_format, OGG_OPUS)
+
+
+async def _read_audio_upload(audio: UploadFile) -> tuple[bytes, str]:
+    """
+    Validate and read an uploaded recording.
+
+    Returns:
+        The audio bytes and their content type.
+
+    Raises:
+        HTTPException: If validation fails.
+    """
+    _validate_audio_file(audio)
+
+    # Read the audio content
+    audio_content = await audio.read()
+
+    # Validate size after reading (in case file.size was not available)
+    max_size = settings.max_audio_size_mb * 1024 * 1024
+    if len(audio_content) > max_size:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Audio file too large. Maximum size is {settings.max_audio_size_mb}MB.",
+        )
+
+    if len(audio_content) == 0:
+        raise HTTPException(
+            status_code=400,
+            detail="Audio file is empty.",
+        )
+
+    return audio_content, audio.content_type or "audio/webm"
+
+
+async def _transcribe_upload(
+    audio_content: bytes,
+    content_type: str,
+    language: str,
+    history: list[dict],
+) -> tuple[str, str]:
+    """
+    Compact a recording and transcribe it.
+
+    Returns:
+        The transcript and its detected language.
+
+    Raises:
+        HTTPException: If the recording is rejected or nothing was transcribed.
+    """
+    # Compact the recording (mono 16 kHz, silence trimmed); reject
+    # over-long or silent recordings before any provider call
+    try:
+        prepared = await prepare_for_stt(audio_content, content_type)
+    except AudioRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+    # A session whose language is already known lets Whisper skip detection
+    if language == "auto" and history:
+        language = language_hint_from_history(history)
+
+    stt_result = await transcribe_audio(
+        audio_content=prepared.content,
+        content_type=prepared.content_type,
+        language_hint=language,
+    )
+
+    transcript = stt_result["transcript"]
+    detected_language = stt_result["detected_language"]
+
+    if not transcript:
+        raise HTTPException(
+            status_code=422,
+            detail="Could not transcribe the audio. Please speak clearly and try again.",
+        )
+
+    logger.info(f"STT result - language: {detected_language}, transcript: {transcript[:100]}...")
+    return transcript, detected_language
+
+
+def _resolve_voice_lead(reply: str, transcript: str, history: list[dict]) -> tuple[str, LeadData | None]:
+    """
+    Check a finished reply for lead data - marker first, then regex fallback.
+
+    Returns:
+        The reply with any lead marker stripped, and the lead (or None).
+    """
+    lead_dict = extract_lead_data(reply)
+    if lead_dict:
+        logger.info(f"Lead captured via marker (voice): {lead_dict['name']}")
+        return strip_lead_marker(reply), LeadData(**lead_dict)
+
+    lead_dict = extract_lead_from_conversation(
+        current_message=transcript,
+        history=history,
+    )
+    if lead_dict:
+        logger.info(f"Lead captured via regex (voice): {lead_dict['name']}")
+        return reply, LeadData(**lead_dict)
+    return reply, None
+
+
+async def _reply_audio_url(
+    reply: str,
+    language: str,
+    small_talk: tuple[str, str] | None,
+    background_tasks: BackgroundTasks,
+    encoding: str = MP3,
+) -> str:
+    """Start (or finish) speech synthesis for a reply and return its audio URL."""
+    # Pre-rendered small-talk audio is shared and never cleaned up
+    audio_filename = small_talk_audio_file(*small_talk, encoding) if small_talk else None
+    if audio_filename is not None:
+        return f"/api/audio/{audio_filename}"
+
+    if settings.voice_audio_streaming:
+        # Synthesis continues in the background; the browser starts playing
+        # the stream as soon as the first sentence is ready
+        return f"{AUDIO_STREAM_PATH}{audio_streams.start(reply, language, encoding)}"
+
+    audio_filename = await synthesize_speech(
+        text=reply,
+        language=language,
+        encoding=encoding,
+    )
+
+    # Schedule cleanup of the audio file
+    audio_filepath = os.path.join(AUDIO_TEMP_DIR, audio_filename)
+    background_tasks.add_task(
+        _cleanup_audio_file,
+        audio_filepath,
+        settings.tts_cleanup_minutes,
+    )
+    return f"/api/audio/{audio_filename}"
+
+
+async def _check_audio_stream(audio_url: str) -> None:
+    """Raise 502 if a streamed reply's synthesis fails before producing any audio."""
+    if not audio_url.startswith(AUDIO_STREAM_PATH):
+        return
+    stream = audio_streams.get(audio_url[len(AUDIO_STREAM_PATH):])
+    if stream is not None and not await stream.wait_for_audio():
+        raise HTTPException(status_code=502, detail=SYNTHESIS_FAILED_DETAIL)
+
+
+def _sse_event(event: str, data: dict) -> str:
+    """Format a single Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
 @router.post("/api/voice", response_model=VoiceResponse)
 async def voice(
     background_tasks: BackgroundTasks,
     audio: UploadFile = File(..., description="Audio file to transcribe"),
     language: str = Form(default="auto", description="Language hint: 'ta', 'en', 'hi', or 'auto'"),
+    session_id: str | None = Form(default=None, max_length=128, description="Session shared with /api/chat"),
+    audio_format: str = Form(
+        default="auto",
+        pattern="^(auto|ogg|mp3)$",
+        description="Reply audio: 'ogg' (Opus), 'mp3', or 'auto' (from the Accept header)",
+    ),
+    accept: str | None = Header(default=None),
 ):
     """
     Process a voice message through the complete pipeline:
     Audio -> Google STT -> GPT-4o -> Azure TTS -> Response
 
     Returns the transcript, AI reply text, audio URL, and detected language.
+    The reply audio is Ogg Opus or MP3, as negotiated from `audio_format`
+    and the Accept header.
     """
-    # Validate the uploaded audio file
-    _validate_audio_file(audio)
+    audio_content, content_type = await _read_audio_upload(audio)
+    encoding = _negotiate_audio_encoding(audio_format, accept)
 
     try:
-        # Read the audio content
-        audio_content = await audio.read()
-
-        # Validate size after reading (in case file.size was not available)
-        max_size = settings.max_audio_size_mb * 1024 * 1024
-        if len(audio_content) > max_size:
-            raise HTTPException(
-                status_code=413,
-                detail=f"Audio file too large. Maximum size is {settings.max_audio_size_mb}MB.",
-            )
-
-        if len(audio_content) == 0:
-            raise HTTPException(
-                status_code=400,
-                detail="Audio file is empty.",
-            )
-
-        content_type = audio.content_type or "audio/webm"
-
         logger.info(
             f"Voice request - content_type: {content_type}, "
             f"size: {len(audio_content)} bytes, "
-            f"language_hint: {language}"
+            f"language_hint: {language}, reply_audio: {encoding}"
         )
 
+        session = session_store.get_or_create(session_id) if session_id else None
+        history = session.history() if session else []
+
         # Step 1: Speech-to-Text
-        stt_result = await transcribe_audio(
-            audio_content=audio_content,
-            content_type=content_type,
-            language_hint=language,
+        transcript, detected_language = await _transcribe_upload(
+            audio_content, content_type, language, history,
         )
 
-        transcript = stt_result["transcript"]
-        detected_language = stt_result["detected_language"]
-
-        if not transcript:
-            raise HTTPException(
-                status_code=422,
-                detail="Could not transcribe the audio. Please speak clearly and try again.",
+        # Step 2: Get AI response from GPT-4o, with the session's conversation as context
+        # Greetings, thanks and goodbyes use a pre-written reply and pre-rendered audio
+        small_talk = match_small_talk(transcript, detected_language, history)
+        if small_talk is not None:
+            reply = small_talk_reply(*small_talk)
+        else:
+            reply = await get_chat_response(
+                user_message=transcript,
+                history=history,
+                language_hint=detected_language,
+                summary=session.summary if session else "",
             )
 
-        logger.info(f"STT result - language: {detected_language}, transcript: {transcript[:100]}...")
-
-        # Step 2: Get AI response from GPT-4o
-        reply = await get_chat_response(
-            user_message=transcript,
-            history=[],
-            language_hint=detected_language,
+        reply, lead_response = _resolve_voice_lead(
+            reply, transcript, session.lead_history() if session else history,
         )
 
-        # Check for lead data - marker first, then regex fallback
-        lead_dict = extract_lead_data(reply)
-        lead_response = None
-        if lead_dict:
-            logger.info(f"Lead captured via marker (voice): {lead_dict['name']}")
-            reply = strip_lead_marker(reply)
-            lead_response = LeadData(**lead_dict)
-        else:
-            lead_dict = extract_lead_from_conversation(
-                current_message=transcript,
-                history=[],
-            )
-            if lead_dict:
-                logger.info(f"Lead captured via regex (voice): {lead_dict['name']}")
-                lead_response = LeadData(**lead_dict)
+        if session:
+            session.add_turn(transcript, reply)
+            schedule_history_summary(session, settings.chat_history_token_budget)
 
         logger.info(f"LLM reply length: {len(reply)} chars")
 
         # Step 3: Text-to-Speech
-        audio_filename = await synthesize_speech(
-            text=reply,
-            language=detected_language,
+        audio_url = await _reply_audio_url(
+            reply, detected_language, small_talk, background_tasks, encoding,
         )
 
-        # Schedule cleanup of the audio file
-        audio_filepath = os.path.join(AUDIO_TEMP_DIR, audio_filename)
-        background_tasks.add_task(
-            _cleanup_audio_file,
-            audio_filepath,
-            settings.tts_cleanup_minutes,
-        )
-
-        # Build audio URL
-        audio_url = f"/api/audio/{audio_filename}"
-
         logger.info(
             f"Voice pipeline complete - language: {detected_language}, "
-            f"audio_file: {audio_filename}"
+            f"audio: {audio_url}"
         )
 
         return VoiceResponse(
@@ -196,6 +381,155 @@ async def voice(
         )
 
 
+@router.post("/api/voice/stream")
+async def voice_stream(
+    background_tasks: BackgroundTasks,
+    audio: UploadFile = File(..., description="Audio file to transcribe"),
+    language: str = Form(default="auto", description="Language hint: 'ta', 'en', 'hi', or 'auto'"),
+    session_id: str | None = Form(default=None, max_length=128, description="Session shared with /api/chat"),
+    audio_format: str = Form(
+        default="auto",
+        pattern="^(auto|ogg|mp3)$",
+        description="Reply audio: 'ogg' (Opus), 'mp3', or 'auto' (from the Accept header)",
+    ),
+    accept: str | None = Header(default=None),
+):
+    """
+    Run the voice pipeline, streaming each stage as Server-Sent Events.
+
+    Emits "transcript" ({"transcript", "detected_language"}) once STT is done,
+    "reply_delta" ({"delta": str}) while the model is generating, "reply"
+    ({"reply": str}) with the final text, "lead" ({"lead": LeadData}) if one
+    was captured, "audio_url" ({"audio_url": str}) as soon as synthesis has
+    started, then a single "done" event carrying the full VoiceResponse
+    payload once audio is available. On failure (including synthesis failing
+    before any audio) an "error" event ({"status_code", "detail"}) is sent
+    instead.
+    The reply audio format is negotiated as for /api/voice.
+    """
+    audio_content, content_type = await _read_audio_upload(audio)
+    encoding = _negotiate_audio_encoding(audio_format, accept)
+
+    logger.info(
+        f"Voice stream request - content_type: {content_type}, "
+        f"size: {len(audio_content)} bytes, "
+        f"language_hint: {language}, reply_audio: {encoding}"
+    )
+
+    session = session_store.get_or_create(session_id) if session_id else None
+    history = session.history() if session else []
+
+    async def event_stream() -> AsyncIterator[str]:
+        try:
+            transcript, detected_language = await _transcribe_upload(
+                audio_content, content_type, language, history,
+            )
+            yield _sse_event("transcript", {
+                "transcript": transcript,
+                "detected_language": detected_language,
+            })
+
+            small_talk = match_small_talk(transcript, detected_language, history)
+            if small_talk is not None:
+                reply = small_talk_reply(*small_talk)
+                yield _sse_event("reply_delta", {"delta": reply})
+            else:
+                reply = ""
+                sent = 0
+                async for delta in stream_chat_response(
+                    user_message=transcript,
+                    history=history,
+                    language_hint=detected_language,
+                    summary=session.summary if session else "",
+                ):
+                    reply += delta
+                    # Hold back anything that could be the start of a lead marker
+                    safe = lead_safe_length(reply)
+                    if safe > sent:
+                        yield _sse_event("reply_delta", {"delta": reply[sent:safe]})
+                        sent = safe
+
+                reply = reply.strip()
+                if not reply:
+                    logger.warning("OpenAI stream returned an empty response.")
+                    reply = EMPTY_REPLY_FALLBACK
+                    yield _sse_event("reply_delta", {"delta": reply})
+
+            reply, lead_response = _resolve_voice_lead(
+                reply, transcript, session.lead_history() if session else history,
+            )
+            yield _sse_event("reply", {"reply": reply})
+            if lead_response is not None:
+                yield _sse_event("lead", {"lead": lead_response.model_dump()})
+
+            if session:
+                session.add_turn(transcript, reply)
+                schedule_history_summary(session, settings.chat_history_token_budget)
+
+            audio_url = await _reply_audio_url(
+                reply, detected_language, small_talk, background_tasks, encoding,
+            )
+            yield _sse_event("audio_url", {"audio_url": audio_url})
+            await _check_audio_stream(audio_url)
+
+            final = VoiceResponse(
+                transcript=transcript,
+                reply=reply,
+                audio_url=audio_url,
+                detected_language=detected_language,
+                lead=lead_response,
+            )
+            yield _sse_event("done", final.model_dump())
+
+        except HTTPException as e:
+            yield _sse_event("error", {"status_code": e.status_code, "detail": e.detail})
+        except Exception as e:
+            logger.error(f"Voice stream error: {e}", exc_info=True)
+            yield _sse_event("error", {
+                "status_code": 500,
+                "detail": "An error occurred while processing your voice message. Please try again later.",
+            })
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+
+@router.get("/api/audio/stream/{stream_id}")
+async def get_audio_stream(stream_id: str):
+    """
+    Stream a reply's audio while it is still being synthesized.
+
+    Args:
+        stream_id: The id from the audio_url returned by /api/voice.
+
+    Returns:
+        The MP3 or Ogg Opus audio, sent with chunked transfer one sentence
+        at a time. The response starts once the first sentence is ready, so
+        a synthesis failure before that is a 502 rather than an empty body.
+    """
+    stream = audio_streams.get(stream_id)
+    if stream is None:
+        raise HTTPException(status_code=404, detail="Audio stream not found or has expired.")
+    if not await stream.wait_for_audio():
+        raise HTTPException(status_code=502, detail=SYNTHESIS_FAILED_DETAIL)
+
+    return StreamingResponse(
+        stream.read(),
+        media_type=stream.media_type,
+        headers={
+            "Cache-Control": "no-cache, no-store, must-revalidate",
+            "Pragma": "no-cache",
+            "Expires": "0",
+        },
+    )
+
+
 @router.get("/api/audio/{filename}")
 async def get_audio(filename: str):
     """
@@ -218,7 +552,7 @@ async def get_audio(filename: str):
 
     return FileResponse(
         path=filepath,
-        media_type="audio/mpeg",
+        media_type=audio_media_type(filename),
         filename=filename,
         headers={
             "Cache-Control": "no-cache, no-store, must-revalidate",
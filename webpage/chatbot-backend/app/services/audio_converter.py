@@ -1,14 +1,14 @@
 """Audio format conversion utilities for Twilio voice integration.
 
 Handles conversion between Twilio's mulaw format and the formats
-used by Whisper STT (WAV) and Google Cloud TTS (MP3).
+used by Whisper STT (WAV) and Google Cloud TTS (MP3, Ogg Opus,
+WAV-wrapped mulaw).
 """
 
 import audioop
-import io
 import struct
 import logging
-from pydub import AudioSegment
+import zlib
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +17,18 @@ MULAW_SAMPLE_WIDTH = 1  # 8-bit mulaw
 PCM_SAMPLE_WIDTH = 2    # 16-bit PCM
 
 
+def _wav_header(data_size: int, sample_rate: int, num_channels: int = 1) -> bytes:
+    """Build a PCM WAV header for `data_size` bytes of 16-bit samples."""
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF", 36 + data_size, b"WAVE",
+        b"fmt ", 16, 1, num_channels, sample_rate,
+        sample_rate * num_channels * PCM_SAMPLE_WIDTH,
+        num_channels * PCM_SAMPLE_WIDTH, PCM_SAMPLE_WIDTH * 8,
+        b"data", data_size,
+    )
+
+
 def mulaw_to_wav(mulaw_chunks: list[bytes], sample_rate: int = MULAW_SAMPLE_RATE) -> bytes:
     """Convert Twilio mulaw audio chunks to WAV bytes for Whisper STT.
 
@@ -34,27 +46,9 @@ def mulaw_to_wav(mulaw_chunks: list[bytes], sample_rate: int = MULAW_SAMPLE_RATE
     # Decode mulaw to 16-bit PCM
     pcm_data = audioop.ulaw2lin(mulaw_data, PCM_SAMPLE_WIDTH)
 
-    # Build WAV file in memory
-    wav_buffer = io.BytesIO()
-    num_channels = 1
-    data_size = len(pcm_data)
-    # WAV header
-    wav_buffer.write(b"RIFF")
-    wav_buffer.write(struct.pack("<I", 36 + data_size))
-    wav_buffer.write(b"WAVE")
-    wav_buffer.write(b"fmt ")
-    wav_buffer.write(struct.pack("<I", 16))  # chunk size
-    wav_buffer.write(struct.pack("<H", 1))   # PCM format
-    wav_buffer.write(struct.pack("<H", num_channels))
-    wav_buffer.write(struct.pack("<I", sample_rate))
-    wav_buffer.write(struct.pack("<I", sample_rate * num_channels * PCM_SAMPLE_WIDTH))
-    wav_buffer.write(struct.pack("<H", num_channels * PCM_SAMPLE_WIDTH))
-    wav_buffer.write(struct.pack("<H", PCM_SAMPLE_WIDTH * 8))
-    wav_buffer.write(b"data")
-    wav_buffer.write(struct.pack("<I", data_size))
-    wav_buffer.write(pcm_data)
-
-    wav_bytes = wav_buffer.getvalue()
+    # Prepend a 44-byte WAV header; the result goes to Whisper straight from memory
+    wav_bytes = _wav_header(len(pcm_data), sample_rate) + pcm_data
+
     logger.debug(
         "Converted %d mulaw chunks (%d bytes) to WAV (%d bytes)",
         len(mulaw_chunks), len(mulaw_data), len(wav_bytes),
@@ -62,34 +56,243 @@ def mulaw_to_wav(mulaw_chunks: list[bytes], sample_rate: int = MULAW_SAMPLE_RATE
     return wav_bytes
 
 
-def mp3_to_mulaw(mp3_bytes: bytes) -> bytes:
-    """Convert Google TTS MP3 output to mulaw for Twilio playback.
+def strip_wav_header(audio: bytes) -> bytes:
+    """Return the sample data of a RIFF/WAV file, or `audio` unchanged if it has no header.
 
-    Args:
-        mp3_bytes: MP3 audio bytes from Google Cloud TTS.
+    Google TTS wraps LINEAR16 and MULAW output in a WAV container; Twilio
+    media messages need the bare samples.
+    """
+    if audio[:4] != b"RIFF" or audio[8:12] != b"WAVE":
+        return audio
+    offset = 12
+    while offset + 8 <= len(audio):
+        chunk_id, chunk_size = struct.unpack_from("<4sI", audio, offset)
+        offset += 8
+        if chunk_id == b"data":
+            return audio[offset:offset + chunk_size]
+        offset += chunk_size + (chunk_size & 1)  # chunks are word aligned
+    return audio
 
-    Returns:
-        Raw mulaw-encoded audio bytes at 8000 Hz mono.
+
+def _strip_id3(mp3_bytes: bytes) -> bytes:
+    """Drop a leading ID3v2 tag and a trailing ID3v1 tag, leaving MPEG frames."""
+    if mp3_bytes[:3] == b"ID3" and len(mp3_bytes) >= 10:
+        # Tag size is a 28-bit "synchsafe" integer (7 bits per byte)
+        size = 0
+        for byte in mp3_bytes[6:10]:
+            size = (size << 7) | (byte & 0x7F)
+        footer = 10 if mp3_bytes[5] & 0x10 else 0
+        mp3_bytes = mp3_bytes[10 + size + footer:]
+    if len(mp3_bytes) >= 128 and mp3_bytes[-128:-125] == b"TAG":
+        mp3_bytes = mp3_bytes[:-128]
+    return mp3_bytes
+
+
+# MPEG audio Layer III bitrates (kbps) by header index, MPEG-1 and MPEG-2/2.5
+_MP3_BITRATES = {
+    1: (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 0),
+    2: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160, 0),
+}
+_MP3_SAMPLE_RATES = {
+    1: (44100, 48000, 32000),
+    2: (22050, 24000, 16000),
+    25: (11025, 12000, 8000),
+}
+# Metadata frames describing one whole file (frame count, duration, seek table)
+_MP3_INFO_TAGS = (b"Xing", b"Info", b"VBRI")
+
+
+def _mp3_frame_info(header: bytes) -> tuple[int, int, int] | None:
+    """(frame length, sample rate, samples per frame) of a Layer III frame, or None if not a frame header."""
+    if len(header) < 4 or header[0] != 0xFF or header[1] & 0xE0 != 0xE0:
+        return None
+    version_bits = (header[1] >> 3) & 0x03
+    layer_bits = (header[1] >> 1) & 0x03
+    bitrate_index = header[2] >> 4
+    rate_index = (header[2] >> 2) & 0x03
+    if version_bits == 0b01 or layer_bits != 0b01 or rate_index == 3:
+        return None
+    version = {0b11: 1, 0b10: 2, 0b00: 25}[version_bits]
+    bitrate = _MP3_BITRATES[1 if version == 1 else 2][bitrate_index] * 1000
+    if not bitrate:
+        return None
+    sample_rate = _MP3_SAMPLE_RATES[version][rate_index]
+    padding = (header[2] >> 1) & 0x01
+    length = (144 if version == 1 else 72) * bitrate // sample_rate + padding
+    return length, sample_rate, 1152 if version == 1 else 576
+
+
+def _mp3_frame_length(header: bytes) -> int | None:
+    """Length of a Layer III frame from its 4-byte header, or None if not a frame header."""
+    info = _mp3_frame_info(header)
+    return info[0] if info else None
+
+
+def _strip_info_frame(mp3_bytes: bytes) -> bytes:
+    """Drop a leading Xing/Info/VBRI frame: its totals only describe its own clip."""
+    frame_length = _mp3_frame_length(mp3_bytes[:4])
+    if frame_length and any(tag in mp3_bytes[4:frame_length] for tag in _MP3_INFO_TAGS):
+        return mp3_bytes[frame_length:]
+    return mp3_bytes
+
+
+def mp3_frames(clip: bytes) -> bytes:
+    """The bare MPEG audio frames of one clip, ready to be appended to a stream."""
+    return _strip_info_frame(_strip_id3(clip))
+
+
+def join_mp3(parts: list[bytes]) -> bytes:
+    """Concatenate MP3 clips into one seamless stream at frame level.
+
+    MPEG audio frames are self-contained, so clips can be appended frame
+    stream to frame stream once per-clip ID3 tags and Xing/Info header
+    frames are removed (left in, players would report the first clip's
+    duration for the whole file and seek wrongly).
     """
-    if not mp3_bytes:
-        raise ValueError("No MP3 data to convert")
+    if len(parts) == 1:
+        return parts[0]
+    return b"".join(mp3_frames(part) for part in parts)
 
-    # Load MP3 with pydub (requires ffmpeg)
-    audio = AudioSegment.from_mp3(io.BytesIO(mp3_bytes))
 
-    # Convert to 8000 Hz mono 16-bit PCM
-    audio = audio.set_frame_rate(MULAW_SAMPLE_RATE)
-    audio = audio.set_channels(1)
-    audio = audio.set_sample_width(PCM_SAMPLE_WIDTH)
+def mp3_duration_sec(mp3_bytes: bytes) -> float:
+    """Playback length of an MP3, summed over its frame headers."""
+    data = mp3_frames(mp3_bytes)
+    offset = 0
+    duration = 0.0
+    while offset < len(data):
+        info = _mp3_frame_info(data[offset:offset + 4])
+        if info is None:
+            break
+        length, sample_rate, samples = info
+        duration += samples / sample_rate
+        offset += length
+    return duration
 
-    pcm_data = audio.raw_data
 
-    # Encode PCM to mulaw
-    mulaw_data = audioop.lin2ulaw(pcm_data, PCM_SAMPLE_WIDTH)
+# Ogg pages (RFC 3533): 27-byte header, segment table, then the page body
+_OGG_CAPTURE = b"OggS"
+_OGG_HEADER = struct.Struct("<4sBBqIII B")
+_OGG_BOS = 0x02
+_OGG_EOS = 0x04
+_OGG_NO_GRANULE = -1  # page on which no packet ends
+# Opus granule positions always count 48 kHz samples (RFC 7845)
+OPUS_GRANULE_RATE = 48000
 
-    logger.debug(
-        "Converted MP3 (%d bytes) to mulaw (%d bytes, %.1fs)",
-        len(mp3_bytes), len(mulaw_data),
-        len(mulaw_data) / MULAW_SAMPLE_RATE,
+
+# Each byte with its bit order reversed
+_BIT_REVERSED = bytes(int(f"{value:08b}"[::-1], 2) for value in range(256))
+
+
+def _ogg_crc(page: bytes) -> int:
+    """Ogg page checksum: CRC-32, polynomial 0x04C11DB7, unreflected, zero initial value.
+
+    zlib implements the bit-reflected form of the same polynomial, so the
+    checksum is computed in C over the bit-reversed page and reversed back.
+    """
+    reflected = zlib.crc32(page.translate(_BIT_REVERSED), 0xFFFFFFFF) ^ 0xFFFFFFFF
+    return int(f"{reflected:032b}"[::-1], 2)
+
+
+def _ogg_pages(data: bytes):
+    """Yield (header_type, granule, page body incl. segment table) for each page."""
+    offset = 0
+    while offset + _OGG_HEADER.size <= len(data):
+        capture, _, header_type, granule, _, _, _, segments = _OGG_HEADER.unpack_from(data, offset)
+        if capture != _OGG_CAPTURE:
+            break
+        table_end = offset + _OGG_HEADER.size + segments
+        page_end = table_end + sum(data[offset + _OGG_HEADER.size:table_end])
+        yield header_type, granule, data[offset + _OGG_HEADER.size - 1:page_end]
+        offset = page_end
+
+
+def _opus_pre_skip(data: bytes) -> int:
+    """Decoder priming samples from the OpusHead packet of an Ogg Opus clip."""
+    head = data.find(b"OpusHead")
+    if head < 0 or head + 12 > len(data):
+        return 0
+    return struct.unpack_from("<H", data, head + 10)[0]
+
+
+def ogg_opus_duration_sec(ogg_bytes: bytes) -> float:
+    """Playback length of an Ogg Opus stream, from its last granule position."""
+    last_granule = 0
+    for _, granule, _ in _ogg_pages(ogg_bytes):
+        if granule != _OGG_NO_GRANULE:
+            last_granule = granule
+    return max(last_granule - _opus_pre_skip(ogg_bytes), 0) / OPUS_GRANULE_RATE
+
+
+class OggOpusJoiner:
+    """Append Ogg Opus clips into one logical stream, one clip at a time.
+
+    Unlike MPEG frames, Ogg pages carry a stream serial number, a page
+    sequence number and a running sample position, and every clip starts
+    with its own OpusHead/OpusTags header pages. Simply concatenating clips
+    gives a "chained" stream that several browsers stop playing after the
+    first link, so each later clip's header pages are dropped and its audio
+    pages are renumbered into the first clip's stream.
+    """
+
+    def __init__(self, serial: int | None = None):
+        self.serial = serial
+        self.sequence = 0
+        self.granule_offset = 0
+        self.clips = 0
+
+    def _page(self, header_type: int, granule: int, body: bytes) -> bytes:
+        header = _OGG_HEADER.pack(
+            _OGG_CAPTURE, 0, header_type, granule, self.serial, self.sequence, 0, body[0],
+        )
+        page = bytearray(header[:-1] + body)
+        struct.pack_into("<I", page, 22, _ogg_crc(page))
+        self.sequence += 1
+        return bytes(page)
+
+    def append(self, clip: bytes, last: bool = False) -> bytes:
+        """
+        Remux the next clip.
+
+        Args:
+            clip: A complete Ogg Opus file.
+            last: Whether this is the final clip (keeps its end-of-stream flag).
+
+        Returns:
+            Pages to append to everything returned so far.
+        """
+        first = self.clips == 0
+        if self.serial is None:
+            self.serial = struct.unpack_from("<I", clip, 14)[0] if len(clip) >= 18 else 0
+        out = []
+        in_headers = True
+        clip_end = 0
+        for header_type, granule, body in _ogg_pages(clip):
+            # Header pages (OpusHead, OpusTags) carry granule position 0
+            if in_headers and granule in (0, _OGG_NO_GRANULE):
+                if not first:
+                    continue
+            else:
+                in_headers = False
+            if granule != _OGG_NO_GRANULE:
+                clip_end = granule
+                granule += self.granule_offset
+            if not first:
+                header_type &= ~_OGG_BOS
+            if not last:
+                header_type &= ~_OGG_EOS
+            out.append(self._page(header_type, granule, body))
+        # Later clips' priming samples are decoded as audio, so positions run on from this clip's end
+        self.granule_offset += clip_end
+        self.clips += 1
+        return b"".join(out)
+
+
+def join_ogg_opus(parts: list[bytes]) -> bytes:
+    """Join Ogg Opus clips into one seamless, single-link Ogg stream."""
+    if len(parts) == 1:
+        return parts[0]
+    joiner = OggOpusJoiner()
+    return b"".join(
+        joiner.append(part, last=index == len(parts) - 1)
+        for index, part in enumerate(parts)
     )
-    return mulaw_data
@@ -0,0 +1,225 @@
+"""Server-side compaction of browser recordings before speech-to-text.
+
+Uploads arrive as whatever the browser recorded (webm/ogg/wav, often stereo
+48 kHz). Before any provider call the recording is decoded once, downmixed
+to mono, resampled to 16 kHz, trimmed of leading/trailing silence and
+re-encoded as low-bitrate Opus. Recordings longer than
+`max_audio_duration_sec` or without any speech are rejected up front.
+"""
+
+import asyncio
+import audioop
+import io
+import logging
+import math
+import time
+
+from pydub import AudioSegment
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+TARGET_SAMPLE_RATE = 16000
+SAMPLE_WIDTH = 2  # 16-bit PCM
+
+# Speech detection over 20 ms frames
+FRAME_MS = 20
+MIN_SPEECH_MS = 200
+# Silence kept around the speech so words are not clipped
+TRIM_PADDING_MS = 250
+
+COMPACT_CONTENT_TYPE = "audio/ogg"
+
+# Content type -> ffmpeg input format
+_INPUT_FORMATS = {
+    "webm": "webm",
+    "ogg": "ogg",
+    "wav": "wav",
+    "mp3": "mp3",
+    "mpeg": "mp3",
+    "mp4": "mp4",
+}
+
+
+class AudioRejected(ValueError):
+    """The recording cannot be transcribed (too long, or no speech)."""
+
+    def __init__(self, message: str, status_code: int):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class PreparedAudio:
+    """Audio ready for STT, with what compaction changed."""
+
+    def __init__(
+        self,
+        content: bytes,
+        content_type: str,
+        original_bytes: int,
+        duration_sec: float = 0.0,
+        speech_sec: float = 0.0,
+    ):
+        self.content = content
+        self.content_type = content_type
+        self.original_bytes = original_bytes
+        self.duration_sec = duration_sec
+        self.speech_sec = speech_sec
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.original_bytes - len(self.content)
+
+
+def _input_format(content_type: str) -> str | None:
+    content_type = content_type.lower()
+    for marker, audio_format in _INPUT_FORMATS.items():
+        if marker in content_type:
+            return audio_format
+    return None
+
+
+def _speech_bounds(pcm: bytes, threshold_dbfs: float) -> tuple[int, int, int] | None:
+    """
+    Find speech in 16 kHz mono PCM with one RMS pass over 20 ms frames.
+
+    Returns:
+        (first speech frame, last speech frame, speech frame count), or None.
+    """
+    frame_bytes = TARGET_SAMPLE_RATE * FRAME_MS // 1000 * SAMPLE_WIDTH
+    # dBFS threshold -> RMS amplitude of 16-bit samples
+    threshold_rms = 32768 * math.pow(10, threshold_dbfs / 20)
+
+    first = last = None
+    speech_frames = 0
+    for index in range(len(pcm) // frame_bytes):
+        frame = pcm[index * frame_bytes:(index + 1) * frame_bytes]
+        if audioop.rms(frame, SAMPLE_WIDTH) >= threshold_rms:
+            if first is None:
+                first = index
+            last = index
+            speech_frames += 1
+    if first is None:
+        return None
+    return first, last, speech_frames
+
+
+def _compact(audio_content: bytes, content_type: str) -> PreparedAudio:
+    """Blocking decode / trim / re-encode (runs in a worker thread)."""
+    original_bytes = len(audio_content)
+    audio = AudioSegment.from_file(io.BytesIO(audio_content), format=_input_format(content_type))
+    audio = (
+        audio.set_channels(1)
+        .set_frame_rate(TARGET_SAMPLE_RATE)
+        .set_sample_width(SAMPLE_WIDTH)
+    )
+
+    duration_sec = len(audio) / 1000
+    if duration_sec > settings.max_audio_duration_sec:
+        raise AudioRejected(
+            f"Recording too long ({duration_sec:.0f}s). "
+            f"Maximum duration is {settings.max_audio_duration_sec} seconds.",
+            status_code=413,
+        )
+
+    bounds = _speech_bounds(audio.raw_data, settings.audio_speech_threshold_dbfs)
+    if bounds is None or bounds[2] * FRAME_MS < MIN_SPEECH_MS:
+        raise AudioRejected(
+            "No speech detected in the recording. Please speak clearly and try again.",
+            status_code=422,
+        )
+
+    first, last, speech_frames = bounds
+    start_ms = max(0, first * FRAME_MS - TRIM_PADDING_MS)
+    end_ms = min(len(audio), (last + 1) * FRAME_MS + TRIM_PADDING_MS)
+    trimmed = audio[start_ms:end_ms]
+
+    buffer = io.BytesIO()
+    trimmed.export(buffer, format="ogg", codec="libopus", bitrate=settings.audio_compact_bitrate)
+    compact = buffer.getvalue()
+
+    speech_sec = speech_frames * FRAME_MS / 1000
+    if len(compact) >= original_bytes:
+        # Already compact (e.g. a short low-bitrate clip): keep the original bytes
+        return PreparedAudio(audio_content, content_type, original_bytes, duration_sec, speech_sec)
+    return PreparedAudio(compact, COMPACT_CONTENT_TYPE, original_bytes, duration_sec, speech_sec)
+
+
+class AudioPreprocessStats:
+    """Bytes saved and rejections across requests."""
+
+    def __init__(self):
+        self.requests = 0
+        self.original_bytes = 0
+        self.compact_bytes = 0
+        self.rejected_no_speech = 0
+        self.rejected_too_long = 0
+        self.decode_failures = 0
+        self.total_ms = 0.0
+
+    def stats(self) -> dict:
+        return {
+            "enabled": settings.audio_preprocess_enabled,
+            "requests": self.requests,
+            "original_bytes": self.original_bytes,
+            "compact_bytes": self.compact_bytes,
+            "bytes_saved": self.original_bytes - self.compact_bytes,
+            "compression_ratio": round(self.compact_bytes / self.original_bytes, 3) if self.original_bytes else None,
+            "rejected_no_speech": self.rejected_no_speech,
+            "rejected_too_long": self.rejected_too_long,
+            "decode_failures": self.decode_failures,
+            "avg_preprocess_ms": round(self.total_ms / self.requests, 1) if self.requests else 0.0,
+        }
+
+
+audio_preprocess_stats = AudioPreprocessStats()
+
+
+async def prepare_for_stt(audio_content: bytes, content_type: str) -> PreparedAudio:
+    """
+    Compact an uploaded recording for speech-to-text.
+
+    Args:
+        audio_content: Raw uploaded audio bytes.
+        content_type: MIME type of the upload.
+
+    Returns:
+        The audio to send to STT. If the upload cannot be decoded it is passed
+        through unchanged, and STT gets a chance at it.
+
+    Raises:
+        AudioRejected: If the recording is too long or contains no speech.
+    """
+    if not settings.audio_preprocess_enabled:
+        return PreparedAudio(audio_content, content_type, len(audio_content))
+
+    stats = audio_preprocess_stats
+    start = time.perf_counter()
+    try:
+        prepared = await asyncio.to_thread(_compact, audio_content, content_type)
+    except AudioRejected as e:
+        if e.status_code == 413:
+            stats.rejected_too_long += 1
+        else:
+            stats.rejected_no_speech += 1
+        logger.info(f"Audio rejected before STT: {e}")
+        raise
+    except Exception as e:
+        stats.decode_failures += 1
+        logger.warning(f"Audio preprocessing failed, sending original upload: {e}")
+        return PreparedAudio(audio_content, content_type, len(audio_content))
+
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    stats.requests += 1
+    stats.original_bytes += prepared.original_bytes
+    stats.compact_bytes += len(prepared.content)
+    stats.total_ms += elapsed_ms
+    logger.info(
+        f"Audio compacted: {prepared.original_bytes} -> {len(prepared.content)} bytes "
+        f"(saved {prepared.bytes_saved}), {prepared.duration_sec:.1f}s recorded, "
+        f"{prepared.speech_sec:.1f}s speech, {elapsed_ms:.0f} ms"
+    )
+    return prepared
@@ -0,0 +1,186 @@
+"""Progressive audio delivery for /api/voice.
+
+As soon as the reply text exists, /api/voice starts synthesizing it in the
+background and returns a stream URL. GET /api/audio/stream/{stream_id}
+sends the MP3 or Ogg Opus audio with chunked transfer, sentence by sentence
+as each chunk is synthesized, so the browser starts playing after the first
+chunk instead of waiting for the whole file. Any number of readers can
+follow one stream (a replay re-reads it from memory); streams expire after
+tts_cleanup_minutes, and at most audio_stream_max_entries are kept.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Callable
+
+from app.core.config import get_settings
+from app.services.tts_service import MP3, WEB_AUDIO_FORMATS, stream_speech
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+
+class AudioStream:
+    """One reply being synthesized; its audio pieces are kept for every reader."""
+
+    def __init__(
+        self,
+        stream_id: str,
+        text: str,
+        language: str,
+        encoding: str = MP3,
+        on_done: Callable[["AudioStream"], None] | None = None,
+    ):
+        self.stream_id = stream_id
+        self.encoding = encoding
+        self.on_done = on_done
+        self.created_at = time.monotonic()
+        self.pieces: list[bytes] = []
+        self.done = False
+        self.error: BaseException | None = None
+        self.first_piece_ms: float | None = None
+        self._changed = asyncio.Event()
+        self._task = asyncio.create_task(self._produce(text, language))
+
+    @property
+    def media_type(self) -> str:
+        return WEB_AUDIO_FORMATS[self.encoding][1]
+
+    async def _produce(self, text: str, language: str) -> None:
+        try:
+            async for piece in stream_speech(text, language=language, encoding=self.encoding):
+                if self.first_piece_ms is None:
+                    self.first_piece_ms = (time.monotonic() - self.created_at) * 1000
+                self.pieces.append(piece)
+                self._notify()
+        except Exception as e:
+            logger.error(f"Audio stream {self.stream_id} failed: {e}", exc_info=True)
+            self.error = e
+        except asyncio.CancelledError as e:
+            # Expired or cleared before finishing: readers must not see a short stream as a success
+            self.error = e
+            raise
+        finally:
+            self.done = True
+            self._notify()
+            if self.on_done is not None:
+                self.on_done(self)
+
+    def _notify(self) -> None:
+        # Wake every waiting reader, then re-arm for the next piece
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def read(self) -> AsyncIterator[bytes]:
+        """Yield the audio from the beginning, waiting for pieces still being synthesized."""
+        index = 0
+        while True:
+            while index < len(self.pieces):
+                yield self.pieces[index]
+                index += 1
+            if self.done:
+                return
+            await self._changed.wait()
+
+    async def wait_for_audio(self) -> bool:
+        """Wait for the first piece; False if synthesis failed before producing any audio."""
+        while not self.pieces and not self.done:
+            await self._changed.wait()
+        return bool(self.pieces) or self.error is None
+
+    def cancel(self) -> None:
+        if not self._task.done():
+            self._task.cancel()
+
+
+class AudioStreamStore:
+    """Live and recently finished audio streams, expiring after a fixed time.
+
+    Past max_entries the oldest finished streams are dropped first; streams
+    still being synthesized are only dropped when they expire.
+    """
+
+    def __init__(self, ttl_sec: float, max_entries: int):
+        self.ttl_sec = ttl_sec
+        self.max_entries = max_entries
+        self._streams: OrderedDict[str, AudioStream] = OrderedDict()
+        self.started = 0
+        self.failed = 0
+        self.evicted = 0
+        self.total_first_piece_ms = 0.0
+        self.timed = 0
+
+    def _sweep(self) -> None:
+        """Drop expired streams (kept in creation order)."""
+        now = time.monotonic()
+        while self._streams:
+            stream_id, stream = next(iter(self._streams.items()))
+            if now - stream.created_at < self.ttl_sec:
+                break
+            stream.cancel()
+            del self._streams[stream_id]
+
+    def _evict(self) -> None:
+        """Drop the oldest finished streams until there is room for a new one."""
+        excess = len(self._streams) - self.max_entries + 1
+        if excess <= 0:
+            return
+        finished = [stream_id for stream_id, stream in self._streams.items() if stream.done]
+        for stream_id in finished[:excess]:
+            del self._streams[stream_id]
+            self.evicted += 1
+
+    def _finished(self, stream: AudioStream) -> None:
+        if stream.error is not None:
+            self.failed += 1
+        if stream.first_piece_ms is not None:
+            self.total_first_piece_ms += stream.first_piece_ms
+            self.timed += 1
+
+    def start(self, text: str, language: str, encoding: str = MP3) -> str:
+        """
+        Start synthesizing a reply in the background.
+
+        Args:
+            text: The reply text.
+            language: Language code ("ta", "en", "hi").
+            encoding: MP3 or OGG_OPUS.
+
+        Returns:
+            The stream id for /api/audio/stream/{stream_id}.
+        """
+        self._sweep()
+        self._evict()
+        stream_id = uuid.uuid4().hex
+        self._streams[stream_id] = AudioStream(stream_id, text, language, encoding, self._finished)
+        self.started += 1
+        return stream_id
+
+    def get(self, stream_id: str) -> AudioStream | None:
+        self._sweep()
+        return self._streams.get(stream_id)
+
+    def clear(self) -> None:
+        for stream in self._streams.values():
+            stream.cancel()
+        self._streams.clear()
+
+    def stats(self) -> dict:
+        return {
+            "active": sum(1 for stream in self._streams.values() if not stream.done),
+            "retained": len(self._streams),
+            "started": self.started,
+            "failed": self.failed,
+            "evicted": self.evicted,
+            "avg_first_audio_ms": round(self.total_first_piece_ms / self.timed, 1) if self.timed else 0.0,
+        }
+
+
+audio_streams = AudioStreamStore(
+    ttl_sec=settings.tts_cleanup_minutes * 60,
+    max_entries=settings.audio_stream_max_entries,
+)
@@ -0,0 +1,180 @@
+"""Shared upstream clients, owned by the application lifespan.
+
+Every OpenAI caller (chat completions, streams, Whisper) shares one tuned
+httpx connection pool. At startup the pool is pre-opened so the first
+request after a deploy skips DNS/TLS/HTTP2 setup; while idle, light pings
+keep the connections alive; on shutdown everything is closed cleanly.
+"""
+
+import asyncio
+import logging
+import time
+
+import httpx
+from openai import AsyncOpenAI
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+# Marks keepalive/warm-up requests so they don't count as traffic
+PING_EXTENSION = "upstream_ping"
+
+
+def _http2_available() -> bool:
+    """HTTP/2 needs the optional h2 package (httpx[http2])."""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class ClientRegistry:
+    """Owns the shared httpx pool and the OpenAI client built on it."""
+
+    def __init__(self):
+        self._http: httpx.AsyncClient | None = None
+        self._openai: AsyncOpenAI | None = None
+        self._keepalive_task: asyncio.Task | None = None
+        self.http2 = False
+        self.last_used = time.monotonic()
+        self.requests = 0
+        self.new_connections = 0
+        self.cold_requests = 0  # requests that had to open a connection
+        self.pings = 0
+        self.ping_failures = 0
+
+    async def _on_request(self, request: httpx.Request) -> None:
+        """Count requests and trace connection setup to measure reuse."""
+        if request.extensions.get(PING_EXTENSION):
+            request.extensions["trace"] = self._trace_ping
+            return
+        request.extensions["trace"] = self._trace_request
+        self.requests += 1
+        self.last_used = time.monotonic()
+
+    async def _trace_ping(self, event_name: str, info: dict) -> None:
+        if event_name == "connection.connect_tcp.complete":
+            self.new_connections += 1
+
+    async def _trace_request(self, event_name: str, info: dict) -> None:
+        if event_name == "connection.connect_tcp.complete":
+            self.new_connections += 1
+            self.cold_requests += 1
+
+    def _build(self) -> None:
+        """Create the shared pool and clients (no network I/O)."""
+        self.http2 = settings.http2_enabled and _http2_available()
+        if settings.http2_enabled and not self.http2:
+            logger.warning("HTTP/2 requested but the h2 package is not installed; using HTTP/1.1")
+
+        self._http = httpx.AsyncClient(
+            http2=self.http2,
+            limits=httpx.Limits(
+                max_connections=settings.http_max_connections,
+                max_keepalive_connections=settings.http_max_keepalive_connections,
+                keepalive_expiry=settings.http_keepalive_expiry_sec,
+            ),
+            timeout=httpx.Timeout(
+                settings.http_read_timeout_sec,
+                connect=settings.http_connect_timeout_sec,
+            ),
+            event_hooks={"request": [self._on_request]},
+        )
+        self._openai = AsyncOpenAI(
+            api_key=settings.openai_api_key,
+            http_client=self._http,
+        )
+
+    @property
+    def openai(self) -> AsyncOpenAI:
+        """The shared OpenAI client (built lazily if the lifespan has not started it)."""
+        if self._openai is None:
+            self._build()
+        return self._openai
+
+    async def _ping(self) -> None:
+        """Light request that opens or refreshes a pooled connection."""
+        try:
+            await self._http.head(str(self._openai.base_url), extensions={PING_EXTENSION: True})
+            self.pings += 1
+        except httpx.HTTPError as e:
+            self.ping_failures += 1
+            logger.debug("Upstream ping failed: %s", e)
+
+    async def _keepalive_loop(self) -> None:
+        """Ping when the pool has been idle for a full interval."""
+        interval = settings.http_keepalive_ping_sec
+        while True:
+            await asyncio.sleep(interval)
+            if time.monotonic() - self.last_used >= interval:
+                await self._ping()
+
+    async def start(self) -> None:
+        """Build the clients, pre-open connections and start idle keepalive pings."""
+        if self._openai is None:
+            self._build()
+
+        # One ping per connection to open; with HTTP/2 they share a single connection
+        warm = 1 if self.http2 else settings.http_warm_connections
+        if warm > 0:
+            start = time.perf_counter()
+            await asyncio.gather(*(self._ping() for _ in range(warm)))
+            logger.info(
+                "Upstream pool warmed: %d connection(s) in %.0f ms (http2=%s)",
+                self.new_connections, (time.perf_counter() - start) * 1000, self.http2,
+            )
+
+        if settings.http_keepalive_ping_sec > 0:
+            self._keepalive_task = asyncio.create_task(self._keepalive_loop())
+
+    async def close(self) -> None:
+        """Stop pings and close every pooled connection."""
+        if self._keepalive_task is not None:
+            self._keepalive_task.cancel()
+            try:
+                await self._keepalive_task
+            except asyncio.CancelledError:
+                pass
+            self._keepalive_task = None
+        if self._openai is not None:
+            await self._openai.close()
+        if self._http is not None:
+            await self._http.aclose()
+        self._openai = None
+        self._http = None
+
+    def stats(self) -> dict:
+        """Pool utilization and connection-reuse counters."""
+        connections = []
+        if self._http is not None:
+            # httpx exposes no public pool API; read httpcore's pool defensively
+            pool = getattr(getattr(self._http, "_transport", None), "_pool", None)
+            connections = list(getattr(pool, "connections", []))
+        idle = sum(1 for connection in connections if connection.is_idle())
+        return {
+            "http2": self.http2,
+            "max_connections": settings.http_max_connections,
+            "open_connections": len(connections),
+            "active_connections": len(connections) - idle,
+            "idle_connections": idle,
+            "requests": self.requests,
+            "new_connections": self.new_connections,
+            "cold_requests": self.cold_requests,
+            "connection_reuse_ratio": (
+                round(1 - self.cold_requests / self.requests, 4) if self.requests else 0.0
+            ),
+            "keepalive_pings": self.pings,
+            "keepalive_ping_failures": self.ping_failures,
+        }
+
+
+clients = ClientRegistry()
+
+
+def get_openai_client() -> AsyncOpenAI:
+    """Get the shared OpenAI client."""
+    return clients.openai
@@ -13,10 +13,45 @@ LEAD_PATTERN = re.compile(
     re.DOTALL,
 )
 
+# Lead blocks start with "|||LEAD_DATA|||" — streamed text is never sent past this
+LEAD_MARKER_PREFIX = "|||"
+
 # Regex patterns for extracting lead info from conversation
 EMAIL_PATTERN = re.compile(r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}")
 PHONE_PATTERN = re.compile(r"(?:\+?\d{1,3}[-.\s]?)?\(?\d{3,5}\)?[-.\s]?\d{3,5}[-.\s]?\d{3,5}")
 
+# Name statements: "my name is X", "I am X", Tamil என் பெயர் (en peyar)
+NAME_PATTERNS = (
+    re.compile(r"(?:my\s+)?name\s+(?:is\s+)?([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)", re.IGNORECASE),
+    re.compile(r"(?:i\s+am|i'm)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)", re.IGNORECASE),
+    re.compile(r"(?:\u0baa\u0bc6\u0baf\u0bb0\u0bcd|\u0baa\u0bc7\u0bb0\u0bcd)\s+(.+?)(?:[,.\s]|$)"),
+)
+
+# Requirement statements: need/want/require ..., Tamil வேண்டும் (vendum)
+REQUIREMENT_PATTERNS = (
+    re.compile(r"(?:i\s+)?(?:need|want|require|looking\s+for|interested\s+in)\s+(.+?)(?:\.|$)", re.IGNORECASE),
+    re.compile(r"(.+?)\s+\u0bb5\u0bc7\u0ba3\u0bcd\u0b9f\u0bc1\u0bae\u0bcd"),
+)
+
+# Words the assistant uses when asking for a lead field (English, Tamil, Hindi).
+# Tamil entries are stems without the final virama, so inflected forms
+# (பெயரை, எண்ணை) match too.
+LEAD_FIELD_KEYWORDS = (
+    "name", "mobile", "phone number", "email", "requirement",
+    "பெயர", "மொபைல", "எண", "மின்னஞ்சல", "இமெயில", "தேவை",
+    "नाम", "मोबाइल", "नंबर", "ईमेल", "आवश्यकता", "ज़रूरत",
+)
+
+# How a Tamil or Hindi sentence asks a question or politely requests
+# something when it does not end with "?"
+QUESTION_MARKERS = (
+    "என்ன", "எது", "முடியுமா", "லாமா", "சொல்லுங்கள்", "பகிரவும்",
+    "क्या", "कौन", "बताइए", "बताएं", "बताएँ", "दीजिए",
+)
+
+# Sentence boundaries in an assistant reply
+_SENTENCE_BREAK = re.compile(r"(?<=[.!?।])\s+|\n+")
+
 
 def extract_lead_data(text: str) -> dict | None:
     """
@@ -75,13 +110,7 @@ def extract_lead_from_conversation(
 
     # Extract name - look for patterns like "name is X", "I am X", "my name X"
     name = None
-    name_patterns = [
-        re.compile(r"(?:my\s+)?name\s+(?:is\s+)?([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)", re.IGNORECASE),
-        re.compile(r"(?:i\s+am|i'm)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)", re.IGNORECASE),
-        # Tamil: என் பெயர் (en peyar)
-        re.compile(r"(?:\u0baa\u0bc6\u0baf\u0bb0\u0bcd|\u0baa\u0bc7\u0bb0\u0bcd)\s+(.+?)(?:[,.\s]|$)"),
-    ]
-    for pattern in name_patterns:
+    for pattern in NAME_PATTERNS:
         for text in user_texts:
             m = pattern.search(text)
             if m:
@@ -98,12 +127,7 @@ def extract_lead_from_conversation(
 
     # Extract requirement - look for need/want/require patterns, or use the first user message
     requirement = None
-    req_patterns = [
-        re.compile(r"(?:i\s+)?(?:need|want|require|looking\s+for|interested\s+in)\s+(.+?)(?:\.|$)", re.IGNORECASE),
-        # Tamil: வேண்டும் (vendum)
-        re.compile(r"(.+?)\s+\u0bb5\u0bc7\u0ba3\u0bcd\u0b9f\u0bc1\u0bae\u0bcd"),
-    ]
-    for pattern in req_patterns:
+    for pattern in REQUIREMENT_PATTERNS:
         for text in user_texts:
             m = pattern.search(text)
             if m:
@@ -128,6 +152,51 @@ def extract_lead_from_conversation(
     }
 
 
+def has_lead_details(text: str) -> bool:
+    """Whether a user message states any lead field (email, phone, name or requirement)."""
+    return any(
+        pattern.search(text)
+        for pattern in (EMAIL_PATTERN, PHONE_PATTERN, *NAME_PATTERNS, *REQUIREMENT_PATTERNS)
+    )
+
+
 def strip_lead_marker(text: str) -> str:
     """Remove the lead data marker block from the response text."""
     return LEAD_PATTERN.sub("", text).strip()
+
+
+def lead_safe_length(text: str) -> int:
+    """
+    Return how many leading characters of a partial reply are safe to stream.
+
+    Everything from the start of a lead marker is held back, as is a trailing
+    run of "|" that could be the beginning of one.
+    """
+    marker_index = text.find(LEAD_MARKER_PREFIX)
+    if marker_index != -1:
+        return marker_index
+    return len(text.rstrip("|"))
+
+
+def _is_lead_question(sentence: str) -> bool:
+    """Whether one sentence is a question (or request) for a lead field."""
+    if not sentence.endswith(("?", "？")) and not any(marker in sentence for marker in QUESTION_MARKERS):
+        return False
+    sentence = sentence.lower()
+    return any(keyword in sentence for keyword in LEAD_FIELD_KEYWORDS)
+
+
+def asks_for_lead_field(history: list[dict]) -> bool:
+    """
+    Whether the last assistant message ends by asking for a lead field.
+
+    Only the final sentence counts, and it must be a question ("May I have
+    your name?", or its Tamil/Hindi equivalent), so replies that merely
+    mention contact details ("Email: info@...") do not count.
+    """
+    for entry in reversed(history):
+        if entry.get("role") == "assistant":
+            content = strip_lead_marker(entry.get("content", ""))
+            sentences = [part.strip() for part in _SENTENCE_BREAK.split(content) if part.strip()]
+            return bool(sentences) and _is_lead_question(sentences[-1])
+    return False
@@ -0,0 +1,200 @@
+"""Local FAQ answering over FAQ_ENTRIES.
+
+Builds a character n-gram index over each FAQ question and its paraphrases
+(English, Tamil, Hindi and romanized forms). Queries scoring above the
+configured threshold are answered directly with the curated answer in the
+user's language, skipping the LLM entirely. A match is rejected when the
+query adds a content word the entry does not cover ("services in Dubai",
+"located in Chennai"): the canned answer would not answer it.
+"""
+
+import logging
+import time
+from collections import Counter
+
+from app.core.config import get_settings
+from app.core.prompts import FAQ_ENTRIES, FAQ_LEAD_PROMPT
+from app.services.email_service import EMAIL_PATTERN, PHONE_PATTERN, asks_for_lead_field
+from app.services.retrieval import CharNgramIndex, char_ngrams, normalize_for_index
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+# Longer messages are real questions, not FAQ lookups
+MAX_FAQ_QUERY_WORDS = 12
+
+# Words that never qualify a question (English, romanized and native Tamil/Hindi).
+# Words used by the questions of several FAQ entries are added to these.
+FAQ_FILLER_WORDS = frozenset(normalize_for_index(" ".join((
+    "a an the in on at of for to do does did you your yours we our i me my is are am be",
+    "can could would will please pls kindly tell about what which who how where when",
+    "and or with any some this that it there sir madam hi hello ok okay know want",
+    "enna unga ungal neenga naan enaku konjam sollunga pathi",
+    "aap aapka aapki aapke mujhe kya hai hain ho ka ki ke ko mein bhai ji",
+    "என்ன என்னென்ன உங்கள் நீங்கள் எனக்கு சொல்லுங்கள் பற்றி தயவுசெய்து",
+    "क्या है हैं आप आपका आपकी आपके मुझे का की के को में कृपया बताइए बताएं",
+))).split())
+
+# Entries whose questions share a word before it counts as filler
+FILLER_MIN_ENTRIES = 3
+
+# Share of a query word's character trigrams an entry word must contain for
+# the entry to cover it (inflections: service/services, சேவை/சேவைகள்)
+WORD_COVERAGE = 0.6
+
+
+class FAQIndex:
+    """Retrieval index over FAQ_ENTRIES with precomputed per-language answers."""
+
+    def __init__(self, entries: dict[str, dict], threshold: float):
+        self.threshold = threshold
+
+        documents = []
+        self.answers: dict[str, dict[str, str]] = {}
+        self.vocabulary: dict[str, frozenset[str]] = {}
+        for key, entry in entries.items():
+            questions = [entry["question"], *entry.get("variants", [])]
+            documents.extend((key, question) for question in questions)
+            self.vocabulary[key] = frozenset(normalize_for_index(" ".join(questions)).split())
+            self.answers[key] = {
+                "en": entry["answer"],
+                "ta": entry.get("answer_ta", entry["answer"]),
+                "hi": entry.get("answer_hi", entry["answer"]),
+            }
+        self.index = CharNgramIndex(documents)
+
+        entries_per_word = Counter(word for words in self.vocabulary.values() for word in words)
+        self.filler_words = FAQ_FILLER_WORDS | {
+            word for word, count in entries_per_word.items() if count >= FILLER_MIN_ENTRIES
+        }
+        self._word_trigrams = {
+            word: set(char_ngrams(word, (3,)))
+            for words in self.vocabulary.values() for word in words
+        }
+
+        self.lookups = 0
+        self.matches = 0
+        self.qualified = 0
+        self.total_lookup_ms = 0.0
+        self.max_lookup_ms = 0.0
+
+    def _covers(self, key: str, word: str) -> bool:
+        """Whether an entry's questions contain the word, or an inflection of it."""
+        if word in self.vocabulary[key]:
+            return True
+        trigrams = set(char_ngrams(word, (3,)))
+        return any(
+            len(trigrams & self._word_trigrams[known]) >= WORD_COVERAGE * len(trigrams)
+            for known in self.vocabulary[key]
+        )
+
+    def uncovered_words(self, query: str, key: str) -> list[str]:
+        """Content words of a query that the entry's questions do not cover."""
+        return [
+            word for word in normalize_for_index(query).split()
+            if word not in self.filler_words and not self._covers(key, word)
+        ]
+
+    def match(self, query: str) -> tuple[str, float] | None:
+        """
+        Find the FAQ entry for a query.
+
+        Returns:
+            (entry key, score) if the best match clears the threshold and
+            covers every content word of the query, else None.
+        """
+        start = time.perf_counter()
+        try:
+            if len(query.split()) > MAX_FAQ_QUERY_WORDS:
+                return None
+            # Users sharing contact details are mid lead-collection, not asking an FAQ
+            if EMAIL_PATTERN.search(query) or PHONE_PATTERN.search(query):
+                return None
+
+            results = self.index.search(query, top_k=1)
+            if not results or results[0][1] < self.threshold:
+                return None
+            # "Do you offer services in Dubai?" is not answered by the services list
+            extra = self.uncovered_words(query, results[0][0])
+            if extra:
+                self.qualified += 1
+                logger.debug("FAQ match %s rejected, query adds %s", results[0][0], extra)
+                return None
+            self.matches += 1
+            return results[0]
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self.lookups += 1
+            self.total_lookup_ms += elapsed_ms
+            self.max_lookup_ms = max(self.max_lookup_ms, elapsed_ms)
+
+    def answer(self, key: str, language: str) -> str:
+        """Return the precomputed answer for an entry in the given language."""
+        answers = self.answers[key]
+        return answers.get(language, answers["en"])
+
+    def stats(self) -> dict:
+        """Return match-rate and lookup latency counters."""
+        return {
+            "entries": len(self.answers),
+            "threshold": self.threshold,
+            "lookups": self.lookups,
+            "matches": self.matches,
+            "rejected_qualified": self.qualified,
+            "match_rate": round(self.matches / self.lookups, 4) if self.lookups else 0.0,
+            "avg_lookup_ms": round(self.total_lookup_ms / self.lookups, 3) if self.lookups else 0.0,
+            "max_lookup_ms": round(self.max_lookup_ms, 3),
+        }
+
+
+_faq_index: FAQIndex | None = None
+
+
+def get_faq_index() -> FAQIndex:
+    """Get or build the FAQ index (built once, normally at startup)."""
+    global _faq_index
+    if _faq_index is None:
+        _faq_index = FAQIndex(FAQ_ENTRIES, settings.faq_match_threshold)
+        logger.info("FAQ index built: %d entries", len(_faq_index.answers))
+    return _faq_index
+
+
+def answer_from_faq(
+    user_message: str,
+    history: list[dict],
+    language: str,
+) -> str | None:
+    """
+    Answer a message from the FAQ index if it is a confident match.
+
+    Args:
+        user_message: The user's message text.
+        history: Conversation history (used to decide whether to start lead
+            collection); while the assistant is waiting for a lead field the
+            LLM handles the turn instead.
+        language: Reply language ("ta", "en", "hi"; "auto" falls back to English).
+
+    Returns:
+        The FAQ reply, or None if the LLM should handle the message.
+    """
+    if not settings.faq_enabled:
+        return None
+    # "Website development" answering "what is your requirement?" is a lead field, not an FAQ
+    if history and asks_for_lead_field(history):
+        return None
+
+    faq_index = get_faq_index()
+    result = faq_index.match(user_message)
+    if result is None:
+        return None
+
+    key, score = result
+    reply = faq_index.answer(key, language)
+    logger.info("FAQ match: %s (score=%.2f, language=%s)", key, score, language)
+
+    # Mirror the system prompt: after the first answer, start collecting the lead
+    if not any(entry.get("role") == "assistant" for entry in history):
+        lead_prompt = FAQ_LEAD_PROMPT.get(language, FAQ_LEAD_PROMPT["en"])
+        reply = f"{reply}\n\n{lead_prompt}"
+    return reply
@@ -0,0 +1,124 @@
+"""Token-budgeted conversation history with a rolling summary.
+
+Instead of keeping a fixed number of messages, history is trimmed to a
+token budget (newest messages first). Messages that fall out of the budget
+are folded into a running summary by a background LLM call, so long chats
+and calls keep their important details (name, requirement, ...) while the
+per-turn prompt size stays bounded.
+
+User messages that leave the history (folded or over the hard cap) are
+still kept for the regex lead fallback when they carry lead details, so a
+name or phone number given early in a long conversation is not lost.
+"""
+
+import logging
+
+from app.services.email_service import has_lead_details
+from app.services.token_counter import count_tokens, TOKENS_PER_MESSAGE
+
+logger = logging.getLogger(__name__)
+
+# Dropped user messages kept for lead extraction (the first one is always kept)
+MAX_LEAD_MESSAGES = 8
+
+
+def message_tokens(message: dict) -> int:
+    """Tokens a single history message costs in the prompt."""
+    return TOKENS_PER_MESSAGE + count_tokens(message.get("content", ""))
+
+
+def trim_history(history: list[dict], budget_tokens: int) -> list[dict]:
+    """
+    Keep the most recent user/assistant messages that fit in a token budget.
+
+    Args:
+        history: Messages, oldest first, each with "role" and "content".
+        budget_tokens: Maximum tokens the kept messages may use.
+
+    Returns:
+        The kept messages, oldest first.
+    """
+    kept = []
+    used = 0
+    for entry in reversed(history):
+        role = entry.get("role", "user")
+        content = entry.get("content", "")
+        if role not in ("user", "assistant") or not content:
+            continue
+        cost = message_tokens(entry)
+        if used + cost > budget_tokens:
+            break
+        kept.append({"role": role, "content": content})
+        used += cost
+    kept.reverse()
+    return kept
+
+
+class ConversationMemory:
+    """Recent messages plus a summary of everything older."""
+
+    def __init__(self, max_messages: int):
+        self.max_messages = max_messages
+        self.messages: list[dict] = []
+        self.summary: str = ""
+        self.summarizing: bool = False
+        # Dropped user messages with lead details, oldest first
+        self.lead_messages: list[str] = []
+        self._dropped_user_messages = 0
+
+    def _retain_for_lead(self, dropped: list[dict]) -> None:
+        """Keep dropped user messages the lead fallback may still need."""
+        for message in dropped:
+            if message["role"] != "user":
+                continue
+            # The conversation's first message doubles as the fallback requirement
+            first = self._dropped_user_messages == 0
+            self._dropped_user_messages += 1
+            if first or has_lead_details(message["content"]):
+                self.lead_messages.append(message["content"])
+                if len(self.lead_messages) > MAX_LEAD_MESSAGES:
+                    del self.lead_messages[1]
+
+    def add_message(self, role: str, content: str) -> None:
+        """Append a message; past the hard cap the oldest are dropped unsummarized."""
+        if role not in ("user", "assistant") or not content:
+            return
+        self.messages.append({"role": role, "content": content})
+        if len(self.messages) > self.max_messages:
+            dropped = len(self.messages) - self.max_messages
+            self._retain_for_lead(self.messages[:dropped])
+            del self.messages[:dropped]
+
+    def add_turn(self, user_message: str, reply: str) -> None:
+        """Record a completed user/assistant exchange."""
+        self.add_message("user", user_message)
+        self.add_message("assistant", reply)
+
+    def history(self) -> list[dict]:
+        """Return the unsummarized messages, oldest first."""
+        return list(self.messages)
+
+    def lead_history(self) -> list[dict]:
+        """History for lead extraction: retained older user messages, then the current ones."""
+        retained = [{"role": "user", "content": content} for content in self.lead_messages]
+        return retained + self.messages
+
+    def overflow(self, budget_tokens: int) -> int:
+        """Number of oldest messages that no longer fit in the budget."""
+        used = 0
+        for index in range(len(self.messages) - 1, -1, -1):
+            used += message_tokens(self.messages[index])
+            if used > budget_tokens:
+                return index + 1
+        return 0
+
+    def fold(self, folded: list[dict], summary: str) -> None:
+        """Replace summarized messages with the updated summary."""
+        folded_ids = {id(message) for message in folded}
+        self._retain_for_lead([m for m in self.messages if id(m) in folded_ids])
+        self.messages = [m for m in self.messages if id(m) not in folded_ids]
+        self.summary = summary
+        logger.debug(
+            "Folded %d messages into summary (%d messages kept)",
+            len(folded), len(self.messages),
+        )
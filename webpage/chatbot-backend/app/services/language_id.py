@@ -0,0 +1,153 @@
+"""Script and language identification for Tamil, Hindi and English.
+
+One pass per string maps every character through a precomputed code-point
+table (Tamil block, Devanagari block, Latin letters) and counts each script.
+Native script decides directly. Latin-only text is then checked for
+romanized Tamil ("Tanglish") and romanized Hindi ("Hinglish") with a small
+lexicon / suffix classifier, so "enna price irukku" gets a Tamil reply
+instead of an English one.
+"""
+
+import re
+from typing import NamedTuple
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+_TAMIL, _DEVANAGARI, _LATIN = "\x01", "\x02", "\x03"
+
+# Code point -> script marker; the markers themselves are deleted from the
+# input first, so counting them after translate() counts script characters
+_SCRIPT_TABLE: dict[int, str | None] = {ord(marker): None for marker in (_TAMIL, _DEVANAGARI, _LATIN)}
+_SCRIPT_TABLE.update({cp: _TAMIL for cp in range(0x0B80, 0x0C00)})
+_SCRIPT_TABLE.update({cp: _DEVANAGARI for cp in range(0x0900, 0x0980)})
+_SCRIPT_TABLE.update({cp: _LATIN for cp in range(ord("a"), ord("z") + 1)})
+_SCRIPT_TABLE.update({cp: _LATIN for cp in range(ord("A"), ord("Z") + 1)})
+
+_WORD = re.compile(r"[a-z]+")
+
+# Frequent romanized words that are not (common) English words
+ROMANIZED_TAMIL_WORDS = frozenset((
+    "enna", "enn", "ennaku", "enaku", "enakku", "epdi", "eppadi", "eppo", "epo", "enga",
+    "engey", "yaaru", "yen", "evlo", "evvalavu", "ethana", "naan", "nan", "neenga", "nee",
+    "unga", "ungaluku", "ungalukku", "namma", "avanga", "ivanga", "idhu", "ithu",
+    "adhu", "athu", "inga", "anga", "irukku", "iruku", "irukka", "irukkinga", "irukeenga",
+    "illa", "illai", "illaya", "venum", "vendum", "venam", "vendam", "pannanum", "pannunga",
+    "panna", "pannu", "panren", "pannalam", "sollunga", "sollu", "solla", "theriyum",
+    "theriyala", "theriyuma", "mudiyuma", "mudiyum", "kudunga", "kodunga", "kedaikuma",
+    "paakalam", "pakalam", "vaanga", "vanga", "ponga", "romba", "konjam", "aama", "aamam",
+    "seri", "sari", "nalla", "nallairukku", "vanakkam", "nandri", "dhaan", "thaan", "kitta",
+    "kooda", "appuram", "apram", "ippo", "ipo", "innum",
+    "edhuku", "ethuku", "yenna", "pathi", "patthi", "vilai", "kaasu", "panam", "velai",
+))
+
+ROMANIZED_HINDI_WORDS = frozenset((
+    "kya", "kyaa", "kaise", "kaisa", "kaisi", "kyun", "kyon", "kab", "kahan", "kaun", "kitna",
+    "kitne", "kitni", "hai", "hain", "hoga", "hogi", "tha", "thi", "nahi", "nahin", "mujhe",
+    "mera", "meri", "mere", "hum", "humein", "hamara", "aap", "aapka", "aapki", "aapke",
+    "tum", "tumhara", "yeh", "ye", "woh", "wo", "karna", "karni", "karo", "kijiye", "karein",
+    "karenge", "chahiye", "chahte", "chahta", "chahti", "batao", "bataiye", "bataye", "milega",
+    "sakte", "sakta", "sakti", "accha", "acha", "achha", "theek", "thik", "haan", "ji",
+    "bhi", "aur", "lekin", "ka", "ki", "ke", "ko", "se", "mein", "liye", "wala",
+    "wali", "namaste", "namaskar", "dhanyavad", "dhanyawad", "shukriya", "kripya", "bahut",
+    "zaroor", "jaldi", "abhi", "kaam", "paisa", "keemat", "kimat",
+))
+
+# Verb/case endings typical of romanized Tamil ("pannunga", "irukkinga", "vaangala")
+_TAMIL_SUFFIXES = ("unga", "inga", "kku", "ngala", "chu", "nga", "laam", "num", "reenga")
+
+# Common English words, counted against both romanized classifiers
+_ENGLISH_WORDS = frozenset((
+    "the", "a", "an", "is", "are", "was", "were", "i", "you", "we", "they", "it", "what",
+    "how", "when", "where", "why", "who", "do", "does", "can", "could", "would", "will",
+    "my", "your", "our", "to", "of", "for", "in", "on", "with", "and", "or", "but", "not",
+    "this", "that", "have", "has", "need", "want", "please", "about", "me", "much", "cost",
+))
+
+
+class LanguageGuess(NamedTuple):
+    """Result of identify_language."""
+
+    language: str  # "ta", "en" or "hi"
+    confidence: float  # 0.0-1.0
+    romanized: bool  # True if Tamil/Hindi was recognized in Latin script
+
+
+def _romanized_scores(text: str) -> tuple[float, float, float]:
+    """Share of words that look romanized-Tamil, romanized-Hindi and English."""
+    words = _WORD.findall(text.lower())
+    if not words:
+        return 0.0, 0.0, 0.0
+    tamil = hindi = english = 0.0
+    for word in words:
+        if word in ROMANIZED_TAMIL_WORDS:
+            tamil += 1
+        elif word in ROMANIZED_HINDI_WORDS:
+            hindi += 1
+        elif word in _ENGLISH_WORDS:
+            english += 1
+        elif len(word) > 4 and word.endswith(_TAMIL_SUFFIXES):
+            tamil += 0.5
+    return tamil / len(words), hindi / len(words), english / len(words)
+
+
+def identify_language(text: str) -> LanguageGuess:
+    """
+    Identify the language of a message or transcript.
+
+    Args:
+        text: Any text; native Tamil/Devanagari script, romanized or English.
+
+    Returns:
+        LanguageGuess. Text with no Tamil/Hindi signal is English, with a
+        confidence that reflects how much of it looked like English.
+    """
+    scripts = text.translate(_SCRIPT_TABLE)
+    tamil_chars = scripts.count(_TAMIL)
+    hindi_chars = scripts.count(_DEVANAGARI)
+
+    # Native script is decisive; Tamil wins a tie, as it always has
+    if tamil_chars or hindi_chars:
+        latin_chars = scripts.count(_LATIN)
+        native = max(tamil_chars, hindi_chars)
+        confidence = round(native / (native + latin_chars), 2)
+        if tamil_chars >= hindi_chars:
+            return LanguageGuess("ta", confidence, False)
+        return LanguageGuess("hi", confidence, False)
+
+    tamil, hindi, english = _romanized_scores(text)
+    best = max(tamil, hindi)
+    if best >= settings.language_id_romanized_min_share and best > english:
+        language = "ta" if tamil >= hindi else "hi"
+        # Share of the recognized (non-neutral) words that voted for the winner
+        confidence = best / max(tamil + hindi + english, 0.5)
+        return LanguageGuess(language, round(min(1.0, confidence), 2), True)
+    # No English function words either (e.g. "website price"): English by default, unsure
+    confidence = english / (english + best) if english else 0.5
+    return LanguageGuess("en", round(confidence, 2), False)
+
+
+def detect_language(text: str) -> str:
+    """Language code ("ta", "en" or "hi") of a message or transcript."""
+    return identify_language(text).language
+
+
+def language_hint_from_history(history: list[dict]) -> str:
+    """
+    Language of the conversation so far, for use as an STT language hint.
+
+    Args:
+        history: Conversation history as {"role", "content"} dicts.
+
+    Returns:
+        "ta", "en" or "hi" when the latest user message identifies the
+        language confidently, otherwise "auto" (let the STT engine detect).
+    """
+    for message in reversed(history):
+        if message["role"] == "user":
+            guess = identify_language(message["content"])
+            if guess.confidence >= settings.language_id_hint_min_confidence:
+                return guess.language
+            break
+    return "auto"
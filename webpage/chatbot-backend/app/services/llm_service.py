@@ -1,20 +1,114 @@
+import asyncio
 import logging
-from openai import AsyncOpenAI
+import time
+from collections.abc import AsyncIterator
 
 from app.core.config import get_settings
-from app.core.prompts import SYSTEM_PROMPT, PHONE_SYSTEM_PROMPT
+from app.core.prompts import PHONE_SYSTEM_PROMPT
+from app.services.client_registry import get_openai_client
+from app.services.faq_service import answer_from_faq
+from app.services.history_manager import ConversationMemory, trim_history
+from app.services.model_router import model_router
+from app.services.prompt_service import build_base_system_prompt
+from app.services.resilience import openai_provider, openai_stream_provider
+from app.services.response_cache import response_cache, build_cache_key
+from app.services.single_flight import SingleFlight, request_key
+from app.services.small_talk import match_small_talk, small_talk_reply
+from app.services.token_counter import count_message_tokens
 
 logger = logging.getLogger(__name__)
 
 settings = get_settings()
 
-client = AsyncOpenAI(api_key=settings.openai_api_key)
+EMPTY_REPLY_FALLBACK = (
+    "I'm sorry, I couldn't generate a response. "
+    "Please try again or contact us at info@vmkdxailabs.com."
+)
+
+SUMMARY_PROMPT = (
+    "You maintain a running summary of a customer conversation with the "
+    "VMKD X AI LABS assistant. Update the existing summary with the new "
+    "messages. Keep every detail the assistant will need later: the "
+    "customer's name, mobile number, email, requirement, language, questions "
+    "already answered and what is still pending. Write at most 5 short "
+    "sentences in English. Output only the summary."
+)
+
+PHONE_EMPTY_REPLY_FALLBACK = "I'm sorry, could you please repeat that?"
+
+# Identical concurrent completions share one upstream request
+completion_flight = SingleFlight("chat.completions")
+
+# Keep references to fire-and-forget summary tasks so they are not garbage collected
+_background_tasks: set[asyncio.Task] = set()
+
+
+def _fallback_completion(params: dict):
+    """Coroutine factory retrying `params` on the fallback model, or None if it is the same model."""
+    fallback_model = settings.openai_fallback_model
+    if not fallback_model or params.get("model") == fallback_model:
+        return None
+    return lambda: get_openai_client().chat.completions.create(**{**params, "model": fallback_model})
+
+
+async def create_completion(**params):
+    """
+    Create a (non-streaming) chat completion, coalescing identical concurrent requests.
+
+    The upstream call runs under the OpenAI deadline, hedging and circuit
+    breaker, falling back to the faster model when it fails.
+
+    Args:
+        **params: Keyword arguments for client.chat.completions.create.
+
+    Returns:
+        The ChatCompletion, shared with any concurrent identical request.
+    """
+    return await completion_flight.do(
+        request_key(params),
+        lambda: openai_provider.call(
+            lambda: get_openai_client().chat.completions.create(**params),
+            fallback=_fallback_completion(params),
+        ),
+    )
+
+
+async def create_stream(**params):
+    """
+    Start a streaming chat completion under the streaming deadline and circuit breaker.
+
+    Streams are not hedged (the losing stream would stay open); on failure the
+    stream is started on the faster model instead.
+
+    Args:
+        **params: Keyword arguments for client.chat.completions.create (stream=True).
+
+    Returns:
+        The AsyncStream of completion chunks.
+    """
+    return await openai_stream_provider.call(
+        lambda: get_openai_client().chat.completions.create(**params),
+        fallback=_fallback_completion(params),
+        hedge=False,
+    )
+
+
+def _reply_language(language_hint: str) -> str:
+    """Map a language hint to a concrete reply language ("auto" means English)."""
+    return language_hint if language_hint in ("ta", "en", "hi") else "en"
+
+
+def _is_cacheable(reply: str) -> bool:
+    """Only generic replies are cached: no fallbacks and no captured leads."""
+    return bool(reply) and reply != EMPTY_REPLY_FALLBACK and "|||LEAD_DATA|||" not in reply
 
 
 def build_messages(
     system_prompt: str,
     history: list[dict],
     user_message: str,
+    summary: str = "",
+    history_budget: int | None = None,
 ) -> list[dict]:
     """
     Build the messages array for the OpenAI Chat Completions API.
@@ -23,39 +117,140 @@ def build_messages(
         system_prompt: The system-level instruction prompt.
         history: List of previous messages, each with "role" and "content".
         user_message: The latest user message.
+        summary: Rolling summary of turns older than `history`.
+        history_budget: Token budget for history (defaults to the chat budget).
 
     Returns:
         A list of message dicts ready for the API call.
     """
-    messages = [{"role": "system", "content": system_prompt}]
+    if history_budget is None:
+        history_budget = settings.chat_history_token_budget
 
-    # Include only the last 10 messages from history to stay within context limits
-    recent_history = history[-10:] if len(history) > 10 else history
+    messages = [{"role": "system", "content": system_prompt}]
+    if summary:
+        messages.append({
+            "role": "system",
+            "content": f"Summary of the earlier conversation: {summary}",
+        })
 
-    for entry in recent_history:
-        role = entry.get("role", "user")
-        content = entry.get("content", "")
-        if role in ("user", "assistant") and content:
-            messages.append({"role": role, "content": content})
+    # Include as much recent history as fits in the token budget
+    messages.extend(trim_history(history, history_budget))
 
     messages.append({"role": "user", "content": user_message})
 
     return messages
 
 
-async def get_phone_response(
-    user_message: str,
-    history: list[dict] | None = None,
-    language_hint: str = "auto",
-) -> str:
-    """Get a chat response optimized for phone calls.
+async def summarize_conversation(previous_summary: str, messages: list[dict]) -> str:
+    """
+    Fold messages into the running conversation summary.
+
+    Args:
+        previous_summary: The current summary (may be empty).
+        messages: Messages to fold in, oldest first.
 
-    Uses the phone system prompt (shorter, no markdown) and keeps
-    more conversation history since phone calls are multi-turn.
+    Returns:
+        The updated summary.
     """
-    if history is None:
-        history = []
+    transcript = "\n".join(f"{m['role']}: {m['content']}" for m in messages)
+    response = await get_openai_client().chat.completions.create(
+        model=settings.summary_model,
+        messages=[
+            {"role": "system", "content": SUMMARY_PROMPT},
+            {
+                "role": "user",
+                "content": f"Existing summary:\n{previous_summary or '(none)'}\n\nNew messages:\n{transcript}",
+            },
+        ],
+        temperature=0.0,
+        max_tokens=settings.summary_max_tokens,
+    )
+    summary = response.choices[0].message.content
+    return summary.strip() if summary else previous_summary
+
+
+async def _summarize_overflow(memory: ConversationMemory, folded: list[dict]) -> None:
+    """Background task: fold overflowing messages into the memory's summary."""
+    try:
+        summary = await summarize_conversation(memory.summary, folded)
+        memory.fold(folded, summary)
+        logger.info("Conversation summary updated (%d messages folded)", len(folded))
+    except Exception as e:
+        # Messages stay in memory; trim_history still bounds the prompt
+        logger.warning(f"Conversation summary failed: {e}")
+    finally:
+        memory.summarizing = False
+
+
+def schedule_history_summary(memory: ConversationMemory, history_budget: int) -> None:
+    """
+    Summarize messages that no longer fit in the history budget, off the hot path.
+
+    Call after a turn has been answered; at most one summary runs per memory.
+    """
+    if memory.summarizing:
+        return
+    count = memory.overflow(history_budget)
+    if count == 0:
+        return
+
+    memory.summarizing = True
+    task = asyncio.create_task(_summarize_overflow(memory, memory.messages[:count]))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+def retrieval_query(user_message: str, history: list[dict]) -> str:
+    """Text used to pick prompt sections: the message plus the previous turn for follow-ups."""
+    recent = [
+        entry.get("content", "")
+        for entry in history[-2:]
+        if entry.get("role") in ("user", "assistant") and entry.get("content") != user_message
+    ]
+    return "\n".join([*recent, user_message])
+
+
+def build_chat_system_prompt(language_hint: str = "auto", query: str = "") -> str:
+    """
+    Build the web chat system prompt with a strong language instruction appended.
+
+    Args:
+        language_hint: Detected or specified language hint (e.g., "ta", "en", "hi").
+        query: Text used to select the relevant knowledge sections.
+
+    Returns:
+        The system prompt to send as the first message.
+    """
+    system_prompt = build_base_system_prompt(query)
+    if language_hint and language_hint != "auto":
+        language_map = {
+            "ta": (
+                "**CRITICAL LANGUAGE INSTRUCTION:** The user is speaking in TAMIL (தமிழ்). "
+                "You MUST respond ENTIRELY in Tamil script (தமிழ் எழுத்து). "
+                "Do NOT respond in Hindi, English, or any other language. "
+                "If the user mixes English words (Tanglish), still respond in Tamil script. "
+                "Begin with 'வணக்கம்' if greeting."
+            ),
+            "hi": (
+                "**CRITICAL LANGUAGE INSTRUCTION:** The user is speaking in HINDI (हिंदी). "
+                "You MUST respond ENTIRELY in Hindi/Devanagari script. "
+                "Do NOT respond in Tamil or English. Begin with 'नमस्ते' if greeting."
+            ),
+            "en": (
+                "**CRITICAL LANGUAGE INSTRUCTION:** The user is speaking in English. "
+                "You MUST respond ENTIRELY in English. "
+                "Do NOT respond in Tamil or Hindi."
+            ),
+        }
+        hint = language_map.get(language_hint, "")
+        if hint:
+            system_prompt = f"{system_prompt}\n\n{hint}"
+
+    return system_prompt
 
+
+def build_phone_system_prompt(language_hint: str = "auto") -> str:
+    """Build the phone system prompt with a language instruction appended."""
     system_prompt = PHONE_SYSTEM_PROMPT
     if language_hint and language_hint != "auto":
         language_map = {
@@ -76,27 +271,49 @@ async def get_phone_response(
         if hint:
             system_prompt = f"{system_prompt}\n\n{hint}"
 
-    # Keep more history for phone calls (up to 20 turns)
-    messages = [{"role": "system", "content": system_prompt}]
-    recent_history = history[-20:] if len(history) > 20 else history
-    for entry in recent_history:
-        role = entry.get("role", "user")
-        content = entry.get("content", "")
-        if role in ("user", "assistant") and content:
-            messages.append({"role": role, "content": content})
-    messages.append({"role": "user", "content": user_message})
+    return system_prompt
+
+
+async def get_phone_response(
+    user_message: str,
+    history: list[dict] | None = None,
+    language_hint: str = "auto",
+    summary: str = "",
+) -> str:
+    """Get a chat response optimized for phone calls.
+
+    Uses the phone system prompt (shorter, no markdown) and its own
+    history token budget, since phone calls are multi-turn.
+    """
+    if history is None:
+        history = []
+
+    system_prompt = build_phone_system_prompt(language_hint)
+    messages = build_messages(
+        system_prompt,
+        history,
+        user_message,
+        summary=summary,
+        history_budget=settings.phone_history_token_budget,
+    )
+
+    route, model = model_router.route(user_message, history, "phone")
 
     try:
-        response = await client.chat.completions.create(
-            model=settings.openai_model,
+        start = time.perf_counter()
+        response = await create_completion(
+            model=model,
             messages=messages,
             temperature=0.3,
             max_tokens=300,
         )
+        model_router.record(
+            "phone", route, model, (time.perf_counter() - start) * 1000, response.usage
+        )
         reply = response.choices[0].message.content
         if not reply:
             logger.warning("OpenAI returned empty response for phone call.")
-            return "I'm sorry, could you please repeat that?"
+            return PHONE_EMPTY_REPLY_FALLBACK
         return reply.strip()
     except Exception as e:
         logger.error(f"OpenAI API error (phone): {e}", exc_info=True)
@@ -107,14 +324,16 @@ async def get_chat_response(
     user_message: str,
     history: list[dict] | None = None,
     language_hint: str = "auto",
+    summary: str = "",
 ) -> str:
     """
-    Get a chat response from OpenAI GPT-4o.
+    Get a chat response from OpenAI (primary or small model, per the model router).
 
     Args:
         user_message: The user's message text.
         history: Optional conversation history.
         language_hint: Detected or specified language hint (e.g., "ta", "en", "hi").
+        summary: Rolling summary of turns older than `history`.
 
     Returns:
         The assistant's reply text.
@@ -125,49 +344,199 @@ async def get_chat_response(
     if history is None:
         history = []
 
-    # Append a strong language instruction to the system prompt
-    system_prompt = SYSTEM_PROMPT
-    if language_hint and language_hint != "auto":
-        language_map = {
-            "ta": (
-                "**CRITICAL LANGUAGE INSTRUCTION:** The user is speaking in TAMIL (தமிழ்). "
-                "You MUST respond ENTIRELY in Tamil script (தமிழ் எழுத்து). "
-                "Do NOT respond in Hindi, English, or any other language. "
-                "If the user mixes English words (Tanglish), still respond in Tamil script. "
-                "Begin with 'வணக்கம்' if greeting."
-            ),
-            "hi": (
-                "**CRITICAL LANGUAGE INSTRUCTION:** The user is speaking in HINDI (हिंदी). "
-                "You MUST respond ENTIRELY in Hindi/Devanagari script. "
-                "Do NOT respond in Tamil or English. Begin with 'नमस्ते' if greeting."
-            ),
-            "en": (
-                "**CRITICAL LANGUAGE INSTRUCTION:** The user is speaking in English. "
-                "You MUST respond ENTIRELY in English. "
-                "Do NOT respond in Tamil or Hindi."
-            ),
-        }
-        hint = language_map.get(language_hint, "")
-        if hint:
-            system_prompt = f"{system_prompt}\n\n{hint}"
+    small_talk = match_small_talk(user_message, language_hint, history)
+    if small_talk is not None:
+        return small_talk_reply(*small_talk)
+
+    faq_reply = answer_from_faq(user_message, history, _reply_language(language_hint))
+    if faq_reply is not None:
+        return faq_reply
 
-    messages = build_messages(system_prompt, history, user_message)
+    system_prompt = build_chat_system_prompt(
+        language_hint, retrieval_query(user_message, history)
+    )
+
+    cache_key = None
+    if settings.response_cache_enabled:
+        cache_key = build_cache_key(user_message, language_hint, history, system_prompt)
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            logger.info("Response cache hit")
+            return cached
+
+    messages = build_messages(system_prompt, history, user_message, summary=summary)
+    logger.info("Chat prompt: %d input tokens", count_message_tokens(messages))
+    route, model = model_router.route(user_message, history, "chat")
 
     try:
-        response = await client.chat.completions.create(
-            model=settings.openai_model,
+        start = time.perf_counter()
+        response = await create_completion(
+            model=model,
             messages=messages,
             temperature=0.3,
             max_tokens=500,
         )
+        model_router.record(
+            "chat", route, model, (time.perf_counter() - start) * 1000, response.usage
+        )
+
+        if response.usage:
+            logger.info(
+                "OpenAI usage: %d prompt, %d completion tokens",
+                response.usage.prompt_tokens, response.usage.completion_tokens,
+            )
 
         reply = response.choices[0].message.content
         if not reply:
             logger.warning("OpenAI returned an empty response.")
-            return "I'm sorry, I couldn't generate a response. Please try again or contact us at info@vmkdxailabs.com."
+            return EMPTY_REPLY_FALLBACK
 
-        return reply.strip()
+        reply = reply.strip()
+        if cache_key and _is_cacheable(reply):
+            response_cache.set(cache_key, reply)
+        return reply
 
     except Exception as e:
         logger.error(f"OpenAI API error: {e}", exc_info=True)
         raise
+
+
+async def stream_chat_response(
+    user_message: str,
+    history: list[dict] | None = None,
+    language_hint: str = "auto",
+    summary: str = "",
+) -> AsyncIterator[str]:
+    """
+    Stream a chat response from OpenAI token by token.
+
+    Uses the same prompt and parameters as get_chat_response, but yields
+    content deltas as soon as the OpenAI stream produces them.
+
+    Args:
+        user_message: The user's message text.
+        history: Optional conversation history.
+        language_hint: Detected or specified language hint (e.g., "ta", "en", "hi").
+        summary: Rolling summary of turns older than `history`.
+
+    Yields:
+        Text deltas of the assistant's reply.
+
+    Raises:
+        Exception: If the OpenAI API call fails.
+    """
+    if history is None:
+        history = []
+
+    small_talk = match_small_talk(user_message, language_hint, history)
+    if small_talk is not None:
+        yield small_talk_reply(*small_talk)
+        return
+
+    faq_reply = answer_from_faq(user_message, history, _reply_language(language_hint))
+    if faq_reply is not None:
+        yield faq_reply
+        return
+
+    system_prompt = build_chat_system_prompt(
+        language_hint, retrieval_query(user_message, history)
+    )
+
+    cache_key = None
+    if settings.response_cache_enabled:
+        cache_key = build_cache_key(user_message, language_hint, history, system_prompt)
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            logger.info("Response cache hit (stream)")
+            yield cached
+            return
+
+    messages = build_messages(system_prompt, history, user_message, summary=summary)
+    logger.info("Chat prompt: %d input tokens", count_message_tokens(messages))
+    route, model = model_router.route(user_message, history, "chat")
+
+    try:
+        start = time.perf_counter()
+        stream = await create_stream(
+            model=model,
+            messages=messages,
+            temperature=0.3,
+            max_tokens=500,
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+
+        parts = []
+        usage = None
+        async for chunk in stream:
+            if chunk.usage:
+                usage = chunk.usage
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                parts.append(delta)
+                yield delta
+
+        model_router.record("chat", route, model, (time.perf_counter() - start) * 1000, usage)
+
+        reply = "".join(parts).strip()
+        if cache_key and _is_cacheable(reply):
+            response_cache.set(cache_key, reply)
+
+    except Exception as e:
+        logger.error(f"OpenAI API streaming error: {e}", exc_info=True)
+        raise
+
+
+async def stream_phone_response(
+    user_message: str,
+    history: list[dict] | None = None,
+    language_hint: str = "auto",
+    summary: str = "",
+) -> AsyncIterator[str]:
+    """Stream a phone-call response token by token.
+
+    Same prompt and parameters as get_phone_response, used by the
+    sentence-pipelined phone path so TTS can start on the first sentence.
+    """
+    if history is None:
+        history = []
+
+    system_prompt = build_phone_system_prompt(language_hint)
+    messages = build_messages(
+        system_prompt,
+        history,
+        user_message,
+        summary=summary,
+        history_budget=settings.phone_history_token_budget,
+    )
+
+    route, model = model_router.route(user_message, history, "phone")
+
+    try:
+        start = time.perf_counter()
+        stream = await create_stream(
+            model=model,
+            messages=messages,
+            temperature=0.3,
+            max_tokens=300,
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+
+        usage = None
+        async for chunk in stream:
+            if chunk.usage:
+                usage = chunk.usage
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                yield delta
+
+        model_router.record("phone", route, model, (time.perf_counter() - start) * 1000, usage)
+
+    except Exception as e:
+        logger.error(f"OpenAI API streaming error (phone): {e}", exc_info=True)
+        raise
@@ -0,0 +1,145 @@
+"""Routes each LLM turn to the small or the primary model.
+
+Turns are classified with cheap local heuristics, no extra model call:
+- "short": greetings, thanks, "ok", "yes" (few words, not a question)
+- "lead_field": a reply to the assistant asking for name / mobile / email /
+  requirement during lead collection, or a message carrying contact details
+- "faq": close to an FAQ question but below the FAQ fast-path threshold
+- "primary": everything else
+
+Routes listed in `router_small_routes` go to `router_small_model`. Per-route
+latency and token usage are recorded so the savings show up in /api/metrics.
+"""
+
+import logging
+
+from app.core.config import get_settings
+from app.services.email_service import EMAIL_PATTERN, PHONE_PATTERN, asks_for_lead_field
+from app.services.faq_service import get_faq_index
+from app.services.resilience import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+PRIMARY_ROUTE = "primary"
+
+# A short message starting with one of these is a question, not small talk
+QUESTION_WORDS = frozenset({
+    "what", "how", "why", "when", "where", "which", "who",
+    "can", "could", "do", "does", "is", "are", "will",
+})
+
+
+class RouteStats:
+    """Turn count, latency and token usage for one channel/route pair."""
+
+    def __init__(self, model: str):
+        self.model = model
+        self.turns = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.latency = LatencyHistogram()
+
+    def snapshot(self) -> dict:
+        return {
+            "model": self.model,
+            "turns": self.turns,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "avg_prompt_tokens": round(self.prompt_tokens / self.turns, 1) if self.turns else 0.0,
+            "avg_completion_tokens": round(self.completion_tokens / self.turns, 1) if self.turns else 0.0,
+            "latency": self.latency.snapshot(),
+        }
+
+
+class ModelRouter:
+    """Classifies turns and records per-route usage."""
+
+    def __init__(self):
+        self._stats: dict[str, RouteStats] = {}
+
+    def classify(self, user_message: str, history: list[dict], channel: str) -> str:
+        """
+        Classify a turn.
+
+        Args:
+            user_message: The user's message text.
+            history: Conversation history, oldest first.
+            channel: "chat" or "phone".
+
+        Returns:
+            The route name.
+        """
+        text = user_message.strip()
+        words = len(text.split())
+
+        if EMAIL_PATTERN.search(text) or PHONE_PATTERN.search(text):
+            return "lead_field"
+        if words <= settings.router_lead_max_words and asks_for_lead_field(history):
+            return "lead_field"
+
+        short_max_words = (
+            settings.router_phone_short_max_words if channel == "phone"
+            else settings.router_short_max_words
+        )
+        first_word = text.split()[0].lower() if words else ""
+        if words <= short_max_words and "?" not in text and first_word not in QUESTION_WORDS:
+            return "short"
+
+        results = get_faq_index().index.search(text, top_k=1)
+        if results and results[0][1] >= settings.router_faq_min_score:
+            return "faq"
+
+        return PRIMARY_ROUTE
+
+    def route(self, user_message: str, history: list[dict], channel: str) -> tuple[str, str]:
+        """
+        Pick the model for a turn.
+
+        Returns:
+            (route name, model name).
+        """
+        if not settings.router_enabled:
+            return PRIMARY_ROUTE, settings.openai_model
+
+        route = self.classify(user_message, history, channel)
+        if route in settings.router_small_routes:
+            model = settings.router_small_model
+        else:
+            model = settings.openai_model
+        logger.info("Model route (%s): %s -> %s", channel, route, model)
+        return route, model
+
+    def record(self, channel: str, route: str, model: str, latency_ms: float, usage=None) -> None:
+        """
+        Record a completed turn.
+
+        Args:
+            channel: "chat" or "phone".
+            route: Route name from route().
+            model: Model the turn was sent to.
+            latency_ms: Time until the full reply was received.
+            usage: The OpenAI usage object, if the response had one.
+        """
+        key = f"{channel}.{route}"
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = RouteStats(model)
+        stats.turns += 1
+        stats.latency.observe(latency_ms)
+        if usage is not None:
+            stats.prompt_tokens += usage.prompt_tokens
+            stats.completion_tokens += usage.completion_tokens
+
+    def stats(self) -> dict:
+        """Return per channel/route usage."""
+        return {
+            "enabled": settings.router_enabled,
+            "small_model": settings.router_small_model,
+            "small_routes": list(settings.router_small_routes),
+            "routes": {key: stats.snapshot() for key, stats in sorted(self._stats.items())},
+        }
+
+
+model_router = ModelRouter()
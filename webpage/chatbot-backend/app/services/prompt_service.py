@@ -0,0 +1,169 @@
+"""Retrieval-scoped system prompt for web chat.
+
+SYSTEM_PROMPT is split on its section banners. Identity, company info,
+guardrails, lead collection and language rules are always sent; the
+knowledge sections (individual services, industries, technology stack) are
+chunked and indexed, and only the top-k chunks relevant to the current
+question are included. A one-line catalogue of all service names is always
+kept so the model never claims we lack a service that was left out.
+"""
+
+import logging
+import re
+
+from app.core import prompts
+from app.core.config import get_settings
+from app.services.retrieval import CharNgramIndex
+from app.services.token_counter import count_tokens
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+BANNER_PATTERN = re.compile(r"^(━+)\n(.+?)\n━+\n", re.MULTILINE)
+SERVICE_ITEM_PATTERN = re.compile(r"^\d+\.\s+\*\*(.+?)\*\*", re.MULTILINE)
+
+# Sections whose content is retrieved per question instead of always sent
+KNOWLEDGE_SECTIONS = ("SERVICES", "INDUSTRIES SERVED", "TECHNOLOGY STACK")
+
+# Chunks scoring below this are noise, not relevant context
+MIN_CHUNK_SCORE = 0.05
+
+
+class ScopedPrompt:
+    """SYSTEM_PROMPT parsed into always-on sections and retrievable knowledge chunks."""
+
+    def __init__(self, system_prompt: str):
+        self.source = system_prompt
+
+        first = BANNER_PATTERN.search(system_prompt)
+        self.banner = first.group(1) if first else ""
+        self.preamble = system_prompt[:first.start()].strip() if first else system_prompt.strip()
+
+        # (title, body, chunks) in prompt order; chunks is None for core sections
+        self.sections: list[tuple[str, str, list[str] | None]] = []
+        self.service_names: list[str] = []
+        matches = list(BANNER_PATTERN.finditer(system_prompt))
+        for i, match in enumerate(matches):
+            title = match.group(2).strip()
+            end = matches[i + 1].start() if i + 1 < len(matches) else len(system_prompt)
+            body = system_prompt[match.end():end].strip()
+            if title.startswith(KNOWLEDGE_SECTIONS):
+                self.sections.append((title, body, self._chunk(title, body)))
+            else:
+                self.sections.append((title, body, None))
+
+        documents = []
+        for section_index, (title, _, chunks) in enumerate(self.sections):
+            for chunk_index, chunk in enumerate(chunks or []):
+                documents.append((f"{section_index}:{chunk_index}", f"{title}\n{chunk}"))
+        self.index = CharNgramIndex(documents) if documents else None
+
+        self.full_prompt_tokens = count_tokens(system_prompt)
+        self.requests = 0
+        self.total_system_tokens = 0
+
+    def _chunk(self, title: str, body: str) -> list[str]:
+        """Split a knowledge section into chunks (one per numbered service, else whole)."""
+        if not title.startswith("SERVICES"):
+            return [body]
+        starts = [m.start() for m in SERVICE_ITEM_PATTERN.finditer(body)]
+        self.service_names = SERVICE_ITEM_PATTERN.findall(body)
+        if not starts:
+            return [body]
+        return [
+            body[start:end].strip()
+            for start, end in zip(starts, starts[1:] + [len(body)])
+        ]
+
+    def _section(self, title: str, body: str) -> str:
+        return f"{self.banner}\n{title}\n{self.banner}\n{body}"
+
+    def build(self, query: str, top_k: int) -> str:
+        """Render the system prompt with only the top-k knowledge chunks for a query."""
+        selected: set[str] = set()
+        if self.index is not None and query.strip():
+            for key, score in self.index.search(query, top_k=top_k):
+                if score >= MIN_CHUNK_SCORE:
+                    selected.add(key)
+
+        parts = [self.preamble]
+        for section_index, (title, body, chunks) in enumerate(self.sections):
+            if chunks is None:
+                parts.append(self._section(title, body))
+                continue
+
+            kept = [
+                chunk for chunk_index, chunk in enumerate(chunks)
+                if f"{section_index}:{chunk_index}" in selected
+            ]
+            if title.startswith("SERVICES") and self.service_names:
+                catalogue = "We offer: " + ", ".join(self.service_names) + "."
+                if kept:
+                    catalogue += "\nDetails relevant to this question:\n\n" + "\n\n".join(kept)
+                parts.append(self._section(title, catalogue))
+            elif kept:
+                parts.append(self._section(title, "\n\n".join(kept)))
+
+        return "\n\n".join(parts) + "\n"
+
+    def record(self, system_prompt: str) -> int:
+        """Count a built prompt's tokens and add it to the running stats."""
+        tokens = count_tokens(system_prompt)
+        self.requests += 1
+        self.total_system_tokens += tokens
+        return tokens
+
+    def stats(self) -> dict:
+        """Return system prompt token statistics for the current mode."""
+        avg = self.total_system_tokens / self.requests if self.requests else 0.0
+        return {
+            "mode": settings.system_prompt_mode,
+            "top_k": settings.system_prompt_top_k,
+            "full_prompt_tokens": self.full_prompt_tokens,
+            "requests": self.requests,
+            "avg_system_tokens": round(avg, 1),
+            "avg_reduction": round(1 - avg / self.full_prompt_tokens, 4) if self.requests else 0.0,
+        }
+
+
+_scoped_prompt: ScopedPrompt | None = None
+
+
+def get_scoped_prompt() -> ScopedPrompt:
+    """Get the parsed SYSTEM_PROMPT, re-parsing it if the prompt has changed."""
+    global _scoped_prompt
+    if _scoped_prompt is None or _scoped_prompt.source is not prompts.SYSTEM_PROMPT:
+        _scoped_prompt = ScopedPrompt(prompts.SYSTEM_PROMPT)
+        logger.info(
+            "System prompt indexed: %d sections, %d full-prompt tokens",
+            len(_scoped_prompt.sections), _scoped_prompt.full_prompt_tokens,
+        )
+    return _scoped_prompt
+
+
+def build_base_system_prompt(query: str) -> str:
+    """
+    Build the base web chat system prompt for a question.
+
+    In "scoped" mode only the relevant knowledge chunks are included; in
+    "full" mode the whole SYSTEM_PROMPT is sent as before.
+
+    Args:
+        query: Text used to pick relevant sections (user message plus recent context).
+
+    Returns:
+        The system prompt, before the language instruction is appended.
+    """
+    scoped = get_scoped_prompt()
+    if settings.system_prompt_mode == "scoped":
+        system_prompt = scoped.build(query, settings.system_prompt_top_k)
+    else:
+        system_prompt = prompts.SYSTEM_PROMPT
+
+    tokens = scoped.record(system_prompt)
+    logger.info(
+        "System prompt (%s): %d tokens (full prompt: %d)",
+        settings.system_prompt_mode, tokens, scoped.full_prompt_tokens,
+    )
+    return system_prompt
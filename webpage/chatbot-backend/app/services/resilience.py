@@ -0,0 +1,342 @@
+"""Resilience layer for upstream providers (OpenAI chat, Whisper, Google TTS).
+
+Each provider gets:
+- a per-call deadline,
+- a hedged second attempt once the first has been running longer than the
+  provider's recent latency percentile,
+- a circuit breaker that fails fast (to a fallback, if one is given) after
+  repeated failures; only timeouts, connection errors, 429 and 5xx count,
+  since a rejected request (other 4xx) says nothing about the provider,
+- a latency histogram exported through /api/metrics.
+
+Streaming chat calls use their own provider: their latency is the time until
+the stream starts, which is not comparable to a full completion.
+
+Calls are plain coroutine factories, so the layer can be exercised with
+local fake providers that inject delays and errors.
+"""
+
+import asyncio
+import bisect
+import logging
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+# Histogram bucket upper bounds in milliseconds (last bucket is +Inf)
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2000, 4000, 8000, 16000)
+
+# Recent samples kept for percentile estimates
+RECENT_SAMPLES = 200
+
+
+class CircuitOpenError(Exception):
+    """Raised when a provider's circuit is open and no fallback was given."""
+
+
+class LatencyHistogram:
+    """Cumulative bucket counts plus a window of recent samples for percentiles."""
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.recent: deque[float] = deque(maxlen=RECENT_SAMPLES)
+        self.total = 0
+        self.sum_ms = 0.0
+
+    def observe(self, latency_ms: float) -> None:
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS_MS, latency_ms)] += 1
+        self.recent.append(latency_ms)
+        self.total += 1
+        self.sum_ms += latency_ms
+
+    def percentile(self, fraction: float) -> float | None:
+        """Latency at the given fraction (0-1) of recent samples, or None if empty."""
+        if not self.recent:
+            return None
+        ordered = sorted(self.recent)
+        index = min(len(ordered) - 1, int(fraction * len(ordered)))
+        return ordered[index]
+
+    def snapshot(self) -> dict:
+        buckets = {}
+        cumulative = 0
+        for bound, count in zip((*LATENCY_BUCKETS_MS, "+Inf"), self.counts):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+        return {
+            "count": self.total,
+            "sum_ms": round(self.sum_ms, 1),
+            "buckets_ms": buckets,
+            "p50_ms": _round(self.percentile(0.50)),
+            "p95_ms": _round(self.percentile(0.95)),
+            "p99_ms": _round(self.percentile(0.99)),
+        }
+
+
+def _round(value: float | None) -> float | None:
+    return round(value, 1) if value is not None else None
+
+
+# 4xx statuses that still mean the provider is struggling
+RETRYABLE_CLIENT_STATUSES = (408, 429)
+
+
+def _status_code(error: BaseException) -> int | None:
+    """HTTP status of an upstream error, if it carries one.
+
+    OpenAI errors have `status_code`, Google API errors an integer `code`,
+    httpx errors a `response.status_code`.
+    """
+    for status in (
+        getattr(error, "status_code", None),
+        getattr(error, "code", None),
+        getattr(getattr(error, "response", None), "status_code", None),
+    ):
+        if isinstance(status, int):
+            return status
+    return None
+
+
+def is_client_error(error: BaseException) -> bool:
+    """Whether the provider rejected the request itself (4xx other than 408/429)."""
+    status = _status_code(error)
+    return status is not None and 400 <= status < 500 and status not in RETRYABLE_CLIENT_STATUSES
+
+
+class CircuitBreaker:
+    """Closed -> open after N consecutive failures; half-open after a cool-down.
+
+    Half-open lets exactly one probe call upstream; every other call is
+    rejected until the probe succeeds (closed) or fails (open again).
+    """
+
+    def __init__(self, failure_threshold: int, reset_sec: float):
+        self.failure_threshold = failure_threshold
+        self.reset_sec = reset_sec
+        self.consecutive_failures = 0
+        self.opened_at: float | None = None
+        self.probing = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_sec:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        """Whether a call may go upstream (half-open lets a single probe through)."""
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "open" or self.probing:
+            return False
+        self.probing = True
+        return True
+
+    def record_success(self) -> None:
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.probing = False
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        if self.probing or self.consecutive_failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+        self.probing = False
+
+    def release_probe(self) -> None:
+        """Let another probe through after one was cancelled without a result."""
+        self.probing = False
+
+
+class ResilientProvider:
+    """Wraps calls to one upstream provider with deadline, hedging and circuit breaking."""
+
+    def __init__(
+        self,
+        name: str,
+        timeout_sec: float,
+        hedge_percentile: float | None = None,
+        hedge_min_samples: int = 20,
+        failure_threshold: int = 5,
+        reset_sec: float = 30.0,
+    ):
+        self.name = name
+        self.timeout_sec = timeout_sec
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.breaker = CircuitBreaker(failure_threshold, reset_sec)
+        self.latency = LatencyHistogram()
+        self.calls = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.client_errors = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.fallbacks = 0
+        self.short_circuits = 0
+
+    def _hedge_delay(self) -> float | None:
+        """Seconds to wait before hedging, or None if hedging is off or unwarmed."""
+        if self.hedge_percentile is None or len(self.latency.recent) < self.hedge_min_samples:
+            return None
+        return self.latency.percentile(self.hedge_percentile) / 1000
+
+    async def _attempt(
+        self,
+        fn: Callable[[], Awaitable[Any]],
+        deadline: float,
+        hedge: bool,
+    ) -> tuple[Any, bool]:
+        """Run fn with an optional hedge; returns (result, hedge_won)."""
+        loop = asyncio.get_running_loop()
+        attempts = [asyncio.ensure_future(fn())]
+        try:
+            hedge_delay = self._hedge_delay() if hedge else None
+            if hedge_delay is not None:
+                done, _ = await asyncio.wait(attempts, timeout=min(hedge_delay, deadline - loop.time()))
+                if not done and loop.time() < deadline:
+                    self.hedges += 1
+                    logger.info("%s: hedging after %.0f ms", self.name, hedge_delay * 1000)
+                    attempts.append(asyncio.ensure_future(fn()))
+
+            pending = set(attempts)
+            last_error: BaseException | None = None
+            while pending:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    raise asyncio.TimeoutError()
+                done, pending = await asyncio.wait(
+                    pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    raise asyncio.TimeoutError()
+                for task in done:
+                    if task.exception() is None:
+                        return task.result(), task is not attempts[0]
+                    last_error = task.exception()
+            raise last_error
+        finally:
+            for task in attempts:
+                if not task.done():
+                    task.cancel()
+
+    async def call(
+        self,
+        fn: Callable[[], Awaitable[Any]],
+        fallback: Callable[[], Awaitable[Any]] | None = None,
+        hedge: bool = True,
+    ) -> Any:
+        """
+        Call the provider.
+
+        Args:
+            fn: Zero-argument coroutine factory making the upstream call. It may
+                be invoked twice when hedging, so it must be safe to repeat.
+            fallback: Optional coroutine factory used when the call fails, times
+                out or the circuit is open. It gets the same deadline.
+            hedge: Set to False for calls whose losing result would have to be
+                cleaned up (e.g. open streams).
+
+        Returns:
+            The result of `fn` (or of `fallback`).
+
+        Raises:
+            CircuitOpenError: If the circuit is open and there is no fallback.
+            Exception: The upstream error (or TimeoutError) if there is no fallback,
+                and any client error (4xx other than 408/429), which neither
+                counts against the circuit nor uses the fallback.
+        """
+        self.calls += 1
+        if not self.breaker.allow():
+            self.short_circuits += 1
+            if fallback is None:
+                raise CircuitOpenError(f"{self.name} circuit is open")
+            self.fallbacks += 1
+            logger.warning("%s circuit open, using fallback", self.name)
+            return await asyncio.wait_for(fallback(), self.timeout_sec)
+
+        # A half-open probe is a single upstream call, never hedged
+        probe = self.breaker.probing
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        try:
+            result, hedge_won = await self._attempt(fn, start + self.timeout_sec, hedge and not probe)
+        except asyncio.CancelledError:
+            if probe:
+                self.breaker.release_probe()
+            raise
+        except Exception as e:
+            if is_client_error(e):
+                # The provider answered; re-sending the same request would fail too
+                self.client_errors += 1
+                logger.warning("%s rejected the request: %s", self.name, e)
+                if probe:
+                    self.breaker.release_probe()
+                raise
+            self.failures += 1
+            if isinstance(e, asyncio.TimeoutError):
+                self.timeouts += 1
+                logger.warning("%s: no response within %.1fs", self.name, self.timeout_sec)
+            else:
+                logger.warning("%s call failed: %s", self.name, e)
+            self.breaker.record_failure()
+            if fallback is None:
+                raise
+            self.fallbacks += 1
+            return await asyncio.wait_for(fallback(), self.timeout_sec)
+
+        self.latency.observe((loop.time() - start) * 1000)
+        self.breaker.record_success()
+        if hedge_won:
+            self.hedge_wins += 1
+        return result
+
+    def stats(self) -> dict:
+        return {
+            "state": self.breaker.state,
+            "timeout_sec": self.timeout_sec,
+            "calls": self.calls,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "client_errors": self.client_errors,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "fallbacks": self.fallbacks,
+            "short_circuits": self.short_circuits,
+            "latency": self.latency.snapshot(),
+        }
+
+
+def _provider(name: str, timeout_sec: float) -> ResilientProvider:
+    return ResilientProvider(
+        name=name,
+        timeout_sec=timeout_sec,
+        hedge_percentile=settings.hedge_percentile if settings.hedge_enabled else None,
+        hedge_min_samples=settings.hedge_min_samples,
+        failure_threshold=settings.circuit_failure_threshold,
+        reset_sec=settings.circuit_reset_sec,
+    )
+
+
+openai_provider = _provider("openai_chat", settings.openai_timeout_sec)
+openai_stream_provider = _provider("openai_stream", settings.openai_stream_timeout_sec)
+whisper_provider = _provider("whisper", settings.whisper_timeout_sec)
+tts_provider = _provider("google_tts", settings.tts_timeout_sec)
+
+
+def provider_stats() -> dict:
+    """Per-provider resilience and latency metrics."""
+    return {
+        provider.name: provider.stats()
+        for provider in (openai_provider, openai_stream_provider, whisper_provider, tts_provider)
+    }
@@ -0,0 +1,115 @@
+"""In-process LRU + TTL cache for web chat replies.
+
+Keys are built from the normalized user message, the language hint, a
+fingerprint of the recent history and a hash of the system prompt the turn
+was built with, so the common first-turn questions ("what services do you
+offer") are answered without an OpenAI round trip. Replies written for one
+prompt (scoped sections, language instruction, or an edited SYSTEM_PROMPT)
+are never served for another; stale entries age out by TTL and LRU.
+"""
+
+import hashlib
+import logging
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+_TRAILING_PUNCTUATION = " .,!?;:।"
+
+
+def normalize_message(text: str) -> str:
+    """Normalize a message for cache lookups (case, width, whitespace, trailing punctuation)."""
+    text = unicodedata.normalize("NFKC", text).casefold()
+    text = _WHITESPACE_PATTERN.sub(" ", text)
+    return text.strip(_TRAILING_PUNCTUATION)
+
+
+def history_fingerprint(history: list[dict], turns: int) -> str:
+    """Hash the last `turns` user/assistant messages of a conversation."""
+    digest = hashlib.sha1()
+    for entry in history[-turns:] if turns > 0 else []:
+        role = entry.get("role", "user")
+        content = entry.get("content", "")
+        if role in ("user", "assistant") and content:
+            digest.update(role.encode())
+            digest.update(b"\x00")
+            digest.update(normalize_message(content).encode())
+            digest.update(b"\x01")
+    return digest.hexdigest()
+
+
+def build_cache_key(user_message: str, language_hint: str, history: list[dict], system_prompt: str) -> str:
+    """Build the cache key for a chat turn answered with `system_prompt`."""
+    fingerprint = history_fingerprint(history, settings.response_cache_history_turns)
+    prompt_hash = hashlib.sha1(system_prompt.encode()).hexdigest()
+    return f"{language_hint}:{prompt_hash}:{fingerprint}:{normalize_message(user_message)}"
+
+
+class ResponseCache:
+    """Bounded LRU cache with a per-entry TTL and hit/miss counters."""
+
+    def __init__(self, max_entries: int, ttl_sec: float):
+        self.max_entries = max_entries
+        self.ttl_sec = ttl_sec
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> str | None:
+        """Return the cached reply for `key`, or None on a miss or expired entry."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, reply = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return reply
+
+    def set(self, key: str, reply: str) -> None:
+        """Store a reply, evicting the least recently used entries when full."""
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl_sec, reply)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Remove all entries (counters are kept)."""
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        """Return cache size and hit/miss counters."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_sec": self.ttl_sec,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+        }
+
+
+response_cache = ResponseCache(
+    max_entries=settings.response_cache_max_entries,
+    ttl_sec=settings.response_cache_ttl_sec,
+)
@@ -0,0 +1,99 @@
+"""Lightweight local text retrieval using character n-gram TF-IDF.
+
+Character n-grams (rather than words) keep matching robust for Tamil and
+Hindi inflections, romanized Tanglish spellings and small typos, without
+any external model or dependency.
+"""
+
+import math
+import unicodedata
+from collections import Counter
+
+NGRAM_SIZES = (3, 4, 5)
+
+
+def normalize_for_index(text: str) -> str:
+    """Casefold and keep only letters, combining marks and digits (Tamil/Hindi vowel signs are marks)."""
+    text = unicodedata.normalize("NFKC", text).casefold()
+    chars = [
+        ch if unicodedata.category(ch)[0] in ("L", "M", "N") else " "
+        for ch in text
+    ]
+    return " ".join("".join(chars).split())
+
+
+def char_ngrams(text: str, sizes: tuple[int, ...] = NGRAM_SIZES) -> Counter:
+    """Count character n-grams of each word, padded with spaces at word boundaries."""
+    grams: Counter = Counter()
+    for word in normalize_for_index(text).split():
+        padded = f" {word} "
+        for n in sizes:
+            for i in range(len(padded) - n + 1):
+                grams[padded[i:i + n]] += 1
+    return grams
+
+
+class CharNgramIndex:
+    """TF-IDF index over short documents, queried by cosine similarity.
+
+    Each document carries a key; several documents may share a key (e.g.
+    paraphrases of the same FAQ question) and a key scores as its best
+    matching document.
+    """
+
+    def __init__(self, documents: list[tuple[str, str]]):
+        """
+        Args:
+            documents: (key, text) pairs to index.
+        """
+        self.keys = [key for key, _ in documents]
+        counts = [char_ngrams(text) for _, text in documents]
+
+        doc_freq: Counter = Counter()
+        for grams in counts:
+            doc_freq.update(grams.keys())
+
+        total = len(documents)
+        self.idf = {
+            gram: math.log((1 + total) / (1 + df)) + 1.0
+            for gram, df in doc_freq.items()
+        }
+        # Unseen query n-grams still count toward the query norm
+        self.unknown_idf = math.log(1 + total) + 1.0
+        self.vectors = [self._weigh(grams) for grams in counts]
+
+    def _weigh(self, grams: Counter) -> dict[str, float]:
+        """Turn raw n-gram counts into an L2-normalized TF-IDF vector."""
+        vector = {
+            gram: (1.0 + math.log(count)) * self.idf.get(gram, self.unknown_idf)
+            for gram, count in grams.items()
+        }
+        norm = math.sqrt(sum(w * w for w in vector.values()))
+        if norm:
+            for gram in vector:
+                vector[gram] /= norm
+        return vector
+
+    def search(self, query: str, top_k: int = 1) -> list[tuple[str, float]]:
+        """
+        Return the best matching keys for a query.
+
+        Args:
+            query: Free-form query text.
+            top_k: Maximum number of distinct keys to return.
+
+        Returns:
+            (key, cosine score) pairs, best first.
+        """
+        query_vector = self._weigh(char_ngrams(query))
+        if not query_vector:
+            return []
+
+        best: dict[str, float] = {}
+        for key, vector in zip(self.keys, self.vectors):
+            score = sum(w * vector.get(gram, 0.0) for gram, w in query_vector.items())
+            if score > best.get(key, 0.0):
+                best[key] = score
+
+        ranked = sorted(best.items(), key=lambda item: item[1], reverse=True)
+        return ranked[:top_k]
@@ -0,0 +1,108 @@
+"""Incremental sentence splitting for streamed LLM output.
+
+Cuts text at sentence boundaries for English, Tamil and Hindi: ".", "?",
+"!", the Devanagari danda "।" / "॥", and newlines. Punctuation only counts
+as a boundary when followed by whitespace, so "9.00", "vmkdxailabs.com"
+and "+91-7824030723" stay intact while text is still streaming in.
+
+split_for_synthesis also breaks over-long sentences at clause boundaries so
+each TTS request stays short.
+"""
+
+SENTENCE_END_CHARS = frozenset(".?!।॥")
+
+# Very short fragments ("Hi.") are merged into the next sentence
+MIN_SENTENCE_CHARS = 12
+
+
+class SentenceSplitter:
+    """Accumulates text deltas and emits complete sentences as soon as they end."""
+
+    def __init__(self, min_chars: int = MIN_SENTENCE_CHARS):
+        self.min_chars = min_chars
+        self._buffer = ""
+        self._start = 0
+        self._scan = 0
+
+    def _is_boundary(self, index: int) -> bool | None:
+        """True/False if index ends a sentence, None if the next char is not known yet."""
+        char = self._buffer[index]
+        if char == "\n":
+            return True
+        if char not in SENTENCE_END_CHARS:
+            return False
+        if index + 1 >= len(self._buffer):
+            return None
+        return self._buffer[index + 1].isspace()
+
+    def feed(self, delta: str) -> list[str]:
+        """
+        Add streamed text and return any sentences completed by it.
+
+        Args:
+            delta: The next piece of streamed text.
+
+        Returns:
+            Complete sentences, stripped, in order.
+        """
+        self._buffer += delta
+        sentences = []
+        while self._scan < len(self._buffer):
+            boundary = self._is_boundary(self._scan)
+            if boundary is None:
+                break
+            if boundary:
+                candidate = self._buffer[self._start:self._scan + 1].strip()
+                if len(candidate) >= self.min_chars:
+                    sentences.append(candidate)
+                    self._start = self._scan + 1
+            self._scan += 1
+        return sentences
+
+    def flush(self) -> list[str]:
+        """Return whatever text remains once the stream has ended."""
+        rest = self._buffer[self._start:].strip()
+        self._buffer = ""
+        self._start = self._scan = 0
+        return [rest] if rest else []
+
+
+def split_sentences(text: str, min_chars: int = MIN_SENTENCE_CHARS) -> list[str]:
+    """Split a complete text into sentences."""
+    splitter = SentenceSplitter(min_chars)
+    return splitter.feed(text) + splitter.flush()
+
+
+# Clause boundaries used to break up over-long sentences, strongest first
+CLAUSE_SEPARATORS = ("; ", ": ", ", ", " - ", " – ", " — ")
+
+
+def _split_long(text: str, max_chars: int) -> list[str]:
+    """Split one over-long sentence at clause boundaries, then at spaces."""
+    if len(text) <= max_chars:
+        return [text]
+    for separator in (*CLAUSE_SEPARATORS, " "):
+        # Last separator that keeps the head within the limit
+        cut = text.rfind(separator, 0, max_chars)
+        if cut > 0:
+            head = text[:cut + len(separator)].strip()
+            return [head, *_split_long(text[cut + len(separator):].strip(), max_chars)]
+    return [text[:max_chars].rstrip(), *_split_long(text[max_chars:].lstrip(), max_chars)]
+
+
+def split_for_synthesis(text: str, max_chars: int) -> list[str]:
+    """
+    Plan TTS chunks for a complete text.
+
+    Args:
+        text: Cleaned reply text.
+        max_chars: Longest chunk to send in one TTS request.
+
+    Returns:
+        Sentences in order, with sentences longer than `max_chars` split at
+        clause boundaries (";", ":", ",", dashes), or at spaces as a last resort.
+    """
+    chunks = []
+    for sentence in split_sentences(text):
+        chunks.extend(_split_long(sentence, max_chars))
+    return chunks
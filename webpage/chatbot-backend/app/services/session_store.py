@@ -0,0 +1,124 @@
+"""Server-side conversation store for web chat and voice, keyed by session_id.
+
+Clients only send the new message; the server keeps the recent turns.
+Memory is bounded per session (a hard cap on messages, with older turns
+folded into a rolling summary by the history manager), sessions
+expire after an idle timeout, and the total number of sessions is capped
+with least-recently-used eviction.
+"""
+
+import logging
+import time
+from collections import OrderedDict
+
+from app.core.config import get_settings
+from app.services.history_manager import ConversationMemory
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+# How often expired sessions are swept (seconds)
+SWEEP_INTERVAL_SEC = 60.0
+
+
+class ConversationSession(ConversationMemory):
+    """Recent conversation turns (plus rolling summary) for a single web chat/voice session."""
+
+    def __init__(self, session_id: str, max_messages: int):
+        super().__init__(max_messages)
+        self.session_id = session_id
+        self.created_at: float = time.time()
+        self.last_active: float = time.monotonic()
+
+
+class SessionStore:
+    """Bounded, idle-expiring map of session_id -> ConversationSession."""
+
+    def __init__(self, max_sessions: int, max_messages: int, idle_timeout_sec: float):
+        self.max_sessions = max_sessions
+        self.max_messages = max_messages
+        self.idle_timeout_sec = idle_timeout_sec
+        self._sessions: OrderedDict[str, ConversationSession] = OrderedDict()
+        self._last_sweep = time.monotonic()
+        self.created = 0
+        self.expired = 0
+        self.evicted = 0
+
+    def _sweep(self, now: float) -> None:
+        """Drop sessions idle for longer than the timeout."""
+        self._last_sweep = now
+        # Sessions are kept in last-active order, so stop at the first live one
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            if now - session.last_active < self.idle_timeout_sec:
+                break
+            del self._sessions[session_id]
+            self.expired += 1
+
+    def get_or_create(
+        self,
+        session_id: str,
+        seed_history: list[dict] | None = None,
+    ) -> ConversationSession:
+        """
+        Get a live session, or create one.
+
+        Args:
+            session_id: Client-provided session identifier.
+            seed_history: History sent by older clients; only used to seed a
+                new session (e.g. after a server restart).
+
+        Returns:
+            The session, marked as active.
+        """
+        now = time.monotonic()
+        if now - self._last_sweep >= SWEEP_INTERVAL_SEC:
+            self._sweep(now)
+
+        session = self._sessions.get(session_id)
+        if session is not None and now - session.last_active >= self.idle_timeout_sec:
+            del self._sessions[session_id]
+            self.expired += 1
+            session = None
+
+        if session is None:
+            session = ConversationSession(session_id, self.max_messages)
+            for entry in seed_history or []:
+                session.add_message(entry.get("role", "user"), entry.get("content", ""))
+            self._sessions[session_id] = session
+            self.created += 1
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+                self.evicted += 1
+
+        session.last_active = now
+        self._sessions.move_to_end(session_id)
+        return session
+
+    def remove(self, session_id: str) -> None:
+        """Forget a session."""
+        self._sessions.pop(session_id, None)
+
+    def clear(self) -> None:
+        """Forget all sessions."""
+        self._sessions.clear()
+
+    def stats(self) -> dict:
+        """Return session counts."""
+        return {
+            "active_sessions": len(self._sessions),
+            "max_sessions": self.max_sessions,
+            "max_messages_per_session": self.max_messages,
+            "idle_timeout_sec": self.idle_timeout_sec,
+            "created": self.created,
+            "expired": self.expired,
+            "evicted": self.evicted,
+        }
+
+
+session_store = SessionStore(
+    max_sessions=settings.session_max_sessions,
+    max_messages=settings.session_max_messages,
+    idle_timeout_sec=settings.session_idle_timeout_minutes * 60,
+)
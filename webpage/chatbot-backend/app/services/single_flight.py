@@ -0,0 +1,91 @@
+"""Single-flight coalescing of identical concurrent upstream calls.
+
+When many visitors send the same message at once, only the first call
+(the leader) goes upstream; everyone else awaits the same task and gets
+the same result or exception. A waiter being cancelled (e.g. the client
+disconnects) does not cancel the shared call for the others; the upstream
+call is only cancelled once every waiter has gone.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+def request_key(params: dict) -> str:
+    """Stable hash of a request's parameters."""
+    payload = json.dumps(params, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class SingleFlight:
+    """Deduplicates concurrent calls that share a key."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._waiters: dict[str, int] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    def _on_done(self, key: str, task: asyncio.Task) -> None:
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+            self._waiters.pop(key, None)
+        # Mark the exception as retrieved even if every waiter has gone
+        if not task.cancelled():
+            task.exception()
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run `fn` once per key among concurrent callers.
+
+        Args:
+            key: Identity of the call (see request_key).
+            fn: Zero-argument coroutine factory performing the upstream call.
+
+        Returns:
+            The shared result of `fn`.
+
+        Raises:
+            Whatever `fn` raised, in every waiter.
+        """
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.create_task(fn())
+            self._tasks[key] = task
+            self._waiters[key] = 0
+            task.add_done_callback(lambda t: self._on_done(key, t))
+            self.leaders += 1
+        else:
+            self.coalesced += 1
+            logger.debug("%s: coalesced request onto in-flight call", self.name)
+
+        self._waiters[key] += 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.done() and self._tasks.get(key) is task:
+                self._waiters[key] -= 1
+                if self._waiters[key] == 0:
+                    # Forget the call before cancelling it: a caller arriving
+                    # while the cancellation unwinds must start a fresh call
+                    del self._tasks[key]
+                    del self._waiters[key]
+                    task.cancel()
+            raise
+
+    def stats(self) -> dict:
+        """Return in-flight and coalescing counters."""
+        total = self.leaders + self.coalesced
+        return {
+            "in_flight": len(self._tasks),
+            "upstream_calls": self.leaders,
+            "coalesced": self.coalesced,
+            "coalesced_ratio": round(self.coalesced / total, 4) if total else 0.0,
+        }
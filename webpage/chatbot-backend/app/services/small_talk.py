@@ -0,0 +1,196 @@
+"""Greeting / thanks / goodbye fast path.
+
+Messages that are only small talk ("hi", "vanakkam", "धन्यवाद", "bye") are
+detected locally and answered with the pre-written SMALL_TALK_REPLIES in
+Tamil, Hindi or English. The audio for every reply is synthesized once at
+startup: as Ogg Opus and MP3 files for /api/voice and as Twilio-ready mulaw
+for phone calls, so these turns skip the LLM and TTS entirely.
+"""
+
+import asyncio
+import logging
+import os
+import re
+import time
+
+from app.core.config import get_settings
+from app.core.prompts import SMALL_TALK_REPLIES
+from app.services.email_service import asks_for_lead_field
+from app.services.tts_service import (
+    AUDIO_TEMP_DIR,
+    MP3,
+    OGG_OPUS,
+    WEB_AUDIO_FORMATS,
+    synthesize_speech_bytes,
+    synthesize_speech_mulaw,
+)
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+# Whole-message phrases (after normalization) per kind and language
+SMALL_TALK_PHRASES = {
+    "greeting": {
+        "en": (
+            "hi", "hii", "hello", "hey", "hi there", "hello there", "hey there",
+            "good morning", "good afternoon", "good evening",
+            "hi good morning", "hello good morning", "hello hello",
+        ),
+        "ta": (
+            "வணக்கம்", "வணக்கம் சார்", "வணக்கம் மேடம்", "ஹலோ", "ஹாய்",
+            "vanakkam", "vanakam", "vannakam", "vanakkam sir",
+        ),
+        "hi": (
+            "नमस्ते", "नमस्कार", "नमस्ते जी", "हेलो", "हैलो", "हाय",
+            "namaste", "namaskar", "namaste ji",
+        ),
+    },
+    "thanks": {
+        "en": (
+            "thanks", "thank you", "thank u", "thx", "thanks a lot",
+            "thank you so much", "ok thanks", "ok thank you", "okay thanks", "okay thank you",
+        ),
+        "ta": (
+            "நன்றி", "மிக்க நன்றி", "ரொம்ப நன்றி", "சரி நன்றி",
+            "nandri", "romba nandri", "mikka nandri",
+        ),
+        "hi": (
+            "धन्यवाद", "शुक्रिया", "बहुत धन्यवाद", "बहुत शुक्रिया",
+            "dhanyavad", "dhanyawad", "shukriya", "bahut shukriya",
+        ),
+    },
+    "goodbye": {
+        "en": (
+            "bye", "goodbye", "good bye", "bye bye", "see you", "see you later",
+            "ok bye", "okay bye", "thanks bye", "thank you bye",
+        ),
+        "ta": (
+            "போய் வருகிறேன்", "பை", "சரி பை", "நன்றி பை",
+            "poitu varen", "poittu varen", "sari bye",
+        ),
+        "hi": (
+            "अलविदा", "बाय", "फिर मिलेंगे", "ठीक है बाय",
+            "alvida", "phir milenge",
+        ),
+    },
+}
+
+# Punctuation stripped before matching (Unicode letters and vowel signs are kept)
+_PUNCTUATION = re.compile(r"[!?.,;:'\"।॥~…\-]+")
+
+# Normalized phrase -> (kind, language); built once at import
+_PHRASE_INDEX: dict[str, tuple[str, str]] = {
+    phrase: (kind, language)
+    for kind, languages in SMALL_TALK_PHRASES.items()
+    for language, phrases in languages.items()
+    for phrase in phrases
+}
+
+
+def _normalize(text: str) -> str:
+    return " ".join(_PUNCTUATION.sub(" ", text.lower()).split())
+
+
+class SmallTalkAudio:
+    """Pre-rendered audio for every (kind, language) reply."""
+
+    def __init__(self):
+        # (kind, language, encoding) -> filename
+        self.files: dict[tuple[str, str, str], str] = {}
+        self.mulaw: dict[tuple[str, str], bytes] = {}
+        self.hits: dict[str, int] = {}
+        self.render_ms = 0.0
+
+    async def _render(self, kind: str, language: str) -> None:
+        text = SMALL_TALK_REPLIES[kind][language]
+        ogg_bytes, mp3_bytes, mulaw_bytes = await asyncio.gather(
+            synthesize_speech_bytes(text, language=language, encoding=OGG_OPUS),
+            synthesize_speech_bytes(text, language=language, encoding=MP3),
+            synthesize_speech_mulaw(text, language=language),
+        )
+
+        for encoding, audio in ((OGG_OPUS, ogg_bytes), (MP3, mp3_bytes)):
+            extension, _ = WEB_AUDIO_FORMATS[encoding]
+            filename = f"smalltalk_{kind}_{language}{extension}"
+            with open(os.path.join(AUDIO_TEMP_DIR, filename), "wb") as f:
+                f.write(audio)
+            self.files[(kind, language, encoding)] = filename
+        self.mulaw[(kind, language)] = mulaw_bytes
+
+    async def prerender(self) -> None:
+        """Synthesize every reply once; failures only disable the audio fast path for that reply."""
+        start = time.perf_counter()
+        os.makedirs(AUDIO_TEMP_DIR, exist_ok=True)
+        keys = [(kind, language) for kind, replies in SMALL_TALK_REPLIES.items() for language in replies]
+        results = await asyncio.gather(
+            *(self._render(kind, language) for kind, language in keys),
+            return_exceptions=True,
+        )
+        for (kind, language), result in zip(keys, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Small-talk audio not pre-rendered for {kind}/{language}: {result}")
+        self.render_ms = (time.perf_counter() - start) * 1000
+        logger.info(
+            f"Small-talk audio pre-rendered: {len(self.mulaw)}/{len(keys)} replies "
+            f"in {self.render_ms:.0f} ms"
+        )
+
+    def stats(self) -> dict:
+        return {
+            "prerendered_ogg": sum(1 for key in self.files if key[2] == OGG_OPUS),
+            "prerendered_mp3": sum(1 for key in self.files if key[2] == MP3),
+            "prerendered_mulaw": len(self.mulaw),
+            "render_ms": round(self.render_ms, 1),
+            "hits": dict(self.hits),
+        }
+
+
+small_talk_audio = SmallTalkAudio()
+
+
+def match_small_talk(
+    user_message: str,
+    language_hint: str = "auto",
+    history: list[dict] | None = None,
+) -> tuple[str, str] | None:
+    """
+    Detect a greeting, thanks or goodbye.
+
+    Args:
+        user_message: The user's message (or transcript).
+        language_hint: Conversation language; "auto" uses the phrase's language.
+        history: Conversation history; while the assistant is waiting for a
+            lead field the LLM handles the turn instead.
+
+    Returns:
+        (kind, reply language), or None if the message is not small talk.
+    """
+    if not settings.small_talk_enabled:
+        return None
+
+    match = _PHRASE_INDEX.get(_normalize(user_message))
+    if match is None:
+        return None
+    if history and asks_for_lead_field(history):
+        return None
+
+    kind, phrase_language = match
+    language = language_hint if language_hint in ("ta", "en", "hi") else phrase_language
+    small_talk_audio.hits[kind] = small_talk_audio.hits.get(kind, 0) + 1
+    return kind, language
+
+
+def small_talk_reply(kind: str, language: str) -> str:
+    """The pre-written reply text."""
+    return SMALL_TALK_REPLIES[kind][language]
+
+
+def small_talk_audio_file(kind: str, language: str, encoding: str = MP3) -> str | None:
+    """Filename of the pre-rendered MP3 or Ogg Opus audio (served from /api/audio/), or None."""
+    return small_talk_audio.files.get((kind, language, encoding))
+
+
+def small_talk_mulaw(kind: str, language: str) -> bytes | None:
+    """Pre-rendered 8 kHz mulaw audio for Twilio, or None."""
+    return small_talk_audio.mulaw.get((kind, language))
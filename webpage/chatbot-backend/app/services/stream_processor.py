@@ -1,7 +1,8 @@
 """Real-time stream processor for Twilio Media Streams.
 
 Manages per-call state, audio buffering, silence detection (energy-based VAD),
-and orchestrates the STT -> LLM -> TTS pipeline for each call turn.
+and orchestrates the STT -> LLM -> TTS pipeline for each call turn, either
+sequentially or pipelined sentence by sentence.
 """
 
 import asyncio
@@ -9,15 +10,32 @@ import audioop
 import base64
 import logging
 import time
+from collections.abc import Awaitable, Callable
 
-from app.services.audio_converter import mulaw_to_wav, mp3_to_mulaw
+from app.core.config import get_settings
+from app.services.audio_converter import mulaw_to_wav
 from app.services.stt_service import transcribe_audio
-from app.services.llm_service import get_phone_response
-from app.services.tts_service import synthesize_speech_bytes
-from app.services.email_service import extract_lead_data, strip_lead_marker
+from app.services.history_manager import ConversationMemory
+from app.services.llm_service import (
+    PHONE_EMPTY_REPLY_FALLBACK,
+    get_phone_response,
+    schedule_history_summary,
+    stream_phone_response,
+)
+from app.services.sentence_splitter import SentenceSplitter
+from app.services.small_talk import match_small_talk, small_talk_mulaw, small_talk_reply
+from app.services.streaming_stt import (
+    StreamingRecognizer,
+    create_streaming_recognizer,
+    finish_streaming_turn,
+)
+from app.services.tts_service import synthesize_speech_mulaw
+from app.services.email_service import extract_lead_data, lead_safe_length, strip_lead_marker
 
 logger = logging.getLogger(__name__)
 
+settings = get_settings()
+
 # VAD / silence detection settings
 SILENCE_THRESHOLD = 500       # RMS energy below this = silence (mulaw at 8kHz)
 SILENCE_DURATION_SEC = 1.5    # Seconds of silence to trigger end-of-speech
@@ -32,7 +50,7 @@ class CallSession:
     def __init__(self, call_sid: str, stream_sid: str | None = None):
         self.call_sid = call_sid
         self.stream_sid = stream_sid
-        self.conversation_history: list[dict] = []
+        self.memory = ConversationMemory(max_messages=settings.session_max_messages)
         self.audio_buffer: list[bytes] = []
         self.last_audio_time: float = 0.0
         self.speech_start_time: float = 0.0
@@ -41,6 +59,17 @@ class CallSession:
         self.is_processing: bool = False
         self.leads_captured: list[dict] = []
         self.created_at: float = time.time()
+        # Streaming STT (phone_stt_backend="google_streaming"): one recognizer per utterance
+        self.recognizer: StreamingRecognizer | None = None
+        self.interim_transcript: str = ""
+
+    def _on_stt_result(self, text: str, is_final: bool) -> None:
+        """Receive interim/final streaming STT results while the caller talks."""
+        if self.recognizer is not None:
+            self.interim_transcript = self.recognizer.transcript()
+        logger.debug(
+            "STT %s for %s: %s", "final" if is_final else "interim", self.call_sid, text[:100],
+        )
 
     def add_audio_chunk(self, payload: bytes) -> None:
         """Add a mulaw audio chunk to the buffer."""
@@ -50,8 +79,23 @@ class CallSession:
         if not self.is_speaking:
             self.is_speaking = True
             self.speech_start_time = now
+            self.recognizer = create_streaming_recognizer(self.detected_language, self._on_stt_result)
 
         self.audio_buffer.append(payload)
+        if self.recognizer is not None:
+            self.recognizer.feed(payload)
+
+    def add_silence_chunk(self, payload: bytes) -> None:
+        """Feed a silent chunk to the streaming recognizer while an utterance is open."""
+        if self.is_speaking and self.recognizer is not None:
+            self.recognizer.feed(payload)
+
+    def take_recognizer(self) -> StreamingRecognizer | None:
+        """Detach the current utterance's recognizer (the next utterance gets a new one)."""
+        recognizer = self.recognizer
+        self.recognizer = None
+        self.interim_transcript = ""
+        return recognizer
 
     def get_speech_duration(self) -> float:
         """Get the duration of buffered audio in seconds."""
@@ -64,9 +108,14 @@ class CallSession:
         self.is_speaking = False
         self.speech_start_time = 0.0
 
+    @property
+    def conversation_history(self) -> list[dict]:
+        """Unsummarized conversation messages, oldest first."""
+        return self.memory.messages
+
     def add_to_history(self, role: str, content: str) -> None:
         """Add a message to conversation history."""
-        self.conversation_history.append({"role": role, "content": content})
+        self.memory.add_message(role, content)
 
 
 # Active call sessions keyed by call_sid
@@ -88,6 +137,9 @@ def remove_session(call_sid: str) -> None:
     """Remove a call session when the call ends."""
     if call_sid in _sessions:
         session = _sessions.pop(call_sid)
+        recognizer = session.take_recognizer()
+        if recognizer is not None:
+            recognizer.cancel()
         duration = time.time() - session.created_at
         logger.info(
             "Removed call session: %s (duration=%.0fs, turns=%d, leads=%d)",
@@ -117,30 +169,38 @@ def detect_silence(audio_chunk: bytes) -> bool:
         return True
 
 
-async def process_speech_turn(session: CallSession) -> bytes | None:
-    """Process a complete speech turn through the STT -> LLM -> TTS pipeline.
+async def _transcribe_turn(session: CallSession) -> tuple[str, str] | None:
+    """Run STT on the buffered speech and update the session language.
 
-    Args:
-        session: The call session with buffered audio.
+    With streaming STT the transcript has been built while the caller was
+    talking and only the last results are awaited; batch Whisper is used
+    otherwise, and as a fallback if the stream produced nothing.
 
     Returns:
-        Mulaw audio bytes of the response, or None if processing failed.
+        (transcript, detected language), or None if there is nothing to answer.
     """
-    if session.is_processing:
-        logger.debug("Already processing for %s, skipping", session.call_sid)
+    recognizer = session.take_recognizer()
+    speech_duration = session.get_speech_duration()
+    if speech_duration < MIN_SPEECH_DURATION_SEC:
+        logger.debug(
+            "Speech too short (%.2fs) for %s, ignoring",
+            speech_duration, session.call_sid,
+        )
+        if recognizer is not None:
+            recognizer.cancel()
+        session.clear_audio_buffer()
         return None
 
-    session.is_processing = True
-    try:
-        speech_duration = session.get_speech_duration()
-        if speech_duration < MIN_SPEECH_DURATION_SEC:
-            logger.debug(
-                "Speech too short (%.2fs) for %s, ignoring",
-                speech_duration, session.call_sid,
-            )
+    stt_result = None
+    if recognizer is not None:
+        stt_result = await finish_streaming_turn(recognizer)
+        if stt_result["transcript"]:
             session.clear_audio_buffer()
-            return None
+        else:
+            logger.warning("Streaming STT empty for %s, falling back to Whisper", session.call_sid)
+            stt_result = None
 
+    if stt_result is None:
         # 1. Convert mulaw buffer to WAV
         wav_bytes = mulaw_to_wav(session.audio_buffer)
         session.clear_audio_buffer()
@@ -152,42 +212,93 @@ async def process_speech_turn(session: CallSession) -> bytes | None:
             content_type="audio/wav",
             language_hint=session.detected_language,
         )
-        transcript = stt_result.get("transcript", "").strip()
-        detected_lang = stt_result.get("detected_language", "en")
+    transcript = stt_result.get("transcript", "").strip()
+    detected_lang = stt_result.get("detected_language", "en")
 
-        if not transcript:
-            logger.info("Empty transcript for %s, skipping", session.call_sid)
-            return None
+    if not transcript:
+        logger.info("Empty transcript for %s, skipping", session.call_sid)
+        return None
+
+    # Update session language
+    session.detected_language = detected_lang
+    logger.info("STT result for %s: [%s] %s", session.call_sid, detected_lang, transcript[:100])
+    return transcript, detected_lang
+
+
+def _record_reply(session: CallSession, llm_reply: str) -> str:
+    """Capture any lead in the reply, add it to history and return the spoken text."""
+    lead = extract_lead_data(llm_reply)
+    if lead:
+        session.leads_captured.append(lead)
+        logger.info("Lead captured during call %s: %s", session.call_sid, lead)
+
+    # Strip lead markers from the spoken response
+    clean_reply = strip_lead_marker(llm_reply)
+    session.add_to_history("assistant", clean_reply)
+    schedule_history_summary(session.memory, settings.phone_history_token_budget)
+
+    logger.info("LLM reply for %s: %s", session.call_sid, clean_reply[:100])
+    return clean_reply
+
+
+async def _small_talk_turn(session: CallSession, transcript: str, language: str) -> bytes | None:
+    """Answer a greeting / thanks / goodbye with its pre-rendered mulaw audio.
+
+    Returns:
+        Mulaw audio of the reply, or None if the transcript is not small talk.
+    """
+    start = time.perf_counter()
+    small_talk = match_small_talk(transcript, language, session.conversation_history[:-1])
+    if small_talk is None:
+        return None
+
+    clean_reply = _record_reply(session, small_talk_reply(*small_talk))
+    mulaw_audio = small_talk_mulaw(*small_talk)
+    if mulaw_audio is None:
+        mulaw_audio = await synthesize_speech_mulaw(clean_reply, language=small_talk[1])
+    logger.info(
+        "Small-talk reply (%s) for %s in %.1f ms",
+        small_talk[0], session.call_sid, (time.perf_counter() - start) * 1000,
+    )
+    return mulaw_audio
+
+
+async def process_speech_turn(session: CallSession) -> bytes | None:
+    """Process a complete speech turn through the STT -> LLM -> TTS pipeline.
+
+    Args:
+        session: The call session with buffered audio.
+
+    Returns:
+        Mulaw audio bytes of the response, or None if processing failed.
+    """
+    if session.is_processing:
+        logger.debug("Already processing for %s, skipping", session.call_sid)
+        return None
 
-        # Update session language
-        session.detected_language = detected_lang
-        logger.info("STT result for %s: [%s] %s", session.call_sid, detected_lang, transcript[:100])
+    session.is_processing = True
+    try:
+        stt = await _transcribe_turn(session)
+        if stt is None:
+            return None
+        transcript, detected_lang = stt
 
         # 3. LLM: Get phone-optimized response
         session.add_to_history("user", transcript)
+        small_talk_audio = await _small_talk_turn(session, transcript, detected_lang)
+        if small_talk_audio is not None:
+            return small_talk_audio
+
         llm_reply = await get_phone_response(
             user_message=transcript,
             history=session.conversation_history[:-1],  # Exclude the just-added message
             language_hint=detected_lang,
+            summary=session.memory.summary,
         )
+        clean_reply = _record_reply(session, llm_reply)
 
-        # Check for lead data in the response
-        lead = extract_lead_data(llm_reply)
-        if lead:
-            session.leads_captured.append(lead)
-            logger.info("Lead captured during call %s: %s", session.call_sid, lead)
-
-        # Strip lead markers from the spoken response
-        clean_reply = strip_lead_marker(llm_reply)
-        session.add_to_history("assistant", clean_reply)
-
-        logger.info("LLM reply for %s: %s", session.call_sid, clean_reply[:100])
-
-        # 4. TTS: Convert response to speech (MP3 bytes)
-        mp3_bytes = await synthesize_speech_bytes(clean_reply, language=detected_lang)
-
-        # 5. Convert MP3 to mulaw for Twilio
-        mulaw_response = mp3_to_mulaw(mp3_bytes)
+        # 4. TTS: Convert response to speech, directly as 8 kHz mulaw for Twilio
+        mulaw_response = await synthesize_speech_mulaw(clean_reply, language=detected_lang)
         logger.info(
             "Response ready for %s: %d bytes mulaw (%.1fs)",
             session.call_sid, len(mulaw_response),
@@ -203,7 +314,121 @@ async def process_speech_turn(session: CallSession) -> bytes | None:
         session.is_processing = False
 
 
-def build_media_message(stream_sid: str, mulaw_audio: bytes) -> list[dict]:
+async def process_speech_turn_pipelined(
+    session: CallSession,
+    send_audio: Callable[[bytes], Awaitable[None]],
+) -> bool:
+    """Process a speech turn with LLM, TTS and mulaw conversion pipelined per sentence.
+
+    LLM tokens are streamed and cut at sentence boundaries; each sentence is
+    synthesized and converted as soon as it is complete, while later sentences
+    are still being generated. Audio is handed to `send_audio` in order, as
+    soon as each sentence is ready.
+
+    Args:
+        session: The call session with buffered audio.
+        send_audio: Coroutine that sends one piece of mulaw audio to the caller.
+
+    Returns:
+        True if any audio was sent.
+    """
+    if session.is_processing:
+        logger.debug("Already processing for %s, skipping", session.call_sid)
+        return False
+
+    session.is_processing = True
+    synth_queue: asyncio.Queue[asyncio.Task | None] = asyncio.Queue()
+    producer: asyncio.Task | None = None
+    audio_sent = False
+    try:
+        stt = await _transcribe_turn(session)
+        if stt is None:
+            return False
+        transcript, detected_lang = stt
+
+        session.add_to_history("user", transcript)
+        small_talk_audio = await _small_talk_turn(session, transcript, detected_lang)
+        if small_talk_audio is not None:
+            await send_audio(small_talk_audio)
+            return True
+
+        history = session.conversation_history[:-1]  # Exclude the just-added message
+        turn_start = time.monotonic()
+
+        def enqueue(sentence: str) -> None:
+            synth_queue.put_nowait(
+                asyncio.create_task(synthesize_speech_mulaw(sentence, language=detected_lang))
+            )
+
+        async def produce() -> str:
+            splitter = SentenceSplitter()
+            reply = ""
+            spoken = 0
+            try:
+                async for delta in stream_phone_response(
+                    user_message=transcript,
+                    history=history,
+                    language_hint=detected_lang,
+                    summary=session.memory.summary,
+                ):
+                    reply += delta
+                    # Never speak the lead marker block
+                    safe = lead_safe_length(reply)
+                    if safe > spoken:
+                        for sentence in splitter.feed(reply[spoken:safe]):
+                            enqueue(sentence)
+                        spoken = safe
+                for sentence in splitter.flush():
+                    enqueue(sentence)
+
+                if not reply.strip():
+                    logger.warning("OpenAI returned empty response for phone call.")
+                    reply = PHONE_EMPTY_REPLY_FALLBACK
+                    enqueue(reply)
+                return reply.strip()
+            finally:
+                synth_queue.put_nowait(None)
+
+        producer = asyncio.create_task(produce())
+
+        sentences = 0
+        total_bytes = 0
+        while (task := await synth_queue.get()) is not None:
+            mulaw_audio = await task
+            if sentences == 0:
+                logger.info(
+                    "First audio ready for %s after %.0f ms",
+                    session.call_sid, (time.monotonic() - turn_start) * 1000,
+                )
+            await send_audio(mulaw_audio)
+            audio_sent = True
+            sentences += 1
+            total_bytes += len(mulaw_audio)
+
+        llm_reply = await producer
+        _record_reply(session, llm_reply)
+        logger.info(
+            "Pipelined response for %s: %d sentences, %d bytes mulaw (%.1fs), turn %.0f ms",
+            session.call_sid, sentences, total_bytes,
+            total_bytes / MULAW_SAMPLE_RATE, (time.monotonic() - turn_start) * 1000,
+        )
+        return audio_sent
+
+    except Exception as e:
+        logger.error("Error processing pipelined turn for %s: %s", session.call_sid, e, exc_info=True)
+        return audio_sent
+    finally:
+        # On failure or cancellation, stop generating and drop pending syntheses
+        if producer is not None and not producer.done():
+            producer.cancel()
+        while not synth_queue.empty():
+            pending = synth_queue.get_nowait()
+            if pending is not None:
+                pending.cancel()
+        session.is_processing = False
+
+
+def build_media_message(stream_sid: str, mulaw_audio: bytes, include_mark: bool = True) -> list[dict]:
     """Build Twilio Media Stream messages to send audio back to the caller.
 
     Twilio expects base64-encoded mulaw audio in 'media' events.
@@ -212,6 +437,7 @@ def build_media_message(stream_sid: str, mulaw_audio: bytes) -> list[dict]:
     Args:
         stream_sid: The Twilio stream SID.
         mulaw_audio: Raw mulaw audio bytes.
+        include_mark: Append a "response_end" mark after the audio.
 
     Returns:
         List of media message dicts to send over WebSocket.
@@ -232,12 +458,18 @@ def build_media_message(stream_sid: str, mulaw_audio: bytes) -> list[dict]:
         })
 
     # Send a mark event to know when playback finishes
-    messages.append({
+    if include_mark:
+        messages.append(build_mark_message(stream_sid))
+
+    return messages
+
+
+def build_mark_message(stream_sid: str, name: str = "response_end") -> dict:
+    """Build a Twilio mark event, echoed back once playback reaches it."""
+    return {
         "event": "mark",
         "streamSid": stream_sid,
         "mark": {
-            "name": "response_end",
+            "name": name,
         },
-    })
-
-    return messages
+    }
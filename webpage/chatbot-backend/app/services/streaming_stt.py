@@ -0,0 +1,229 @@
+"""Streaming speech-to-text for live phone calls.
+
+Instead of waiting for the end of an utterance and sending it to Whisper in
+one batch, the 8 kHz mulaw frames from the Twilio media stream are fed to a
+streaming recognizer as they arrive. Interim and final results flow back to
+the call session while the caller is still talking, so by the time silence
+is detected the transcript is (almost) ready.
+
+The phone STT backend is chosen per deployment with `phone_stt_backend`:
+"whisper" (batch, the default) or "google_streaming". Recognizers take their
+engine client as a parameter, so they can be driven by a local fake.
+"""
+
+import asyncio
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Callable
+
+from google.cloud import speech_v1 as speech
+
+from app.core.config import get_settings
+from app.services.language_id import detect_language
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+MULAW_SAMPLE_RATE = 8000
+
+# Our language code -> Google Speech language code
+GOOGLE_LANGUAGE_CODES = {
+    "ta": "ta-IN",
+    "en": "en-IN",
+    "hi": "hi-IN",
+}
+
+ResultCallback = Callable[[str, bool], None]
+
+
+class StreamingRecognizer(ABC):
+    """Feeds audio frames to a streaming engine and collects its results.
+
+    Subclasses implement `_run`, consuming `_audio()` and reporting results
+    with `_handle_result`.
+    """
+
+    def __init__(self, language_hint: str = "auto", on_result: ResultCallback | None = None):
+        self.language_hint = language_hint
+        self.on_result = on_result
+        self.final_segments: list[str] = []
+        self.interim = ""
+        self.detected_language: str | None = None
+        self._queue: asyncio.Queue[bytes | None] = asyncio.Queue()
+        self._task: asyncio.Task | None = None
+
+    def feed(self, chunk: bytes) -> None:
+        """Queue one audio frame; the engine stream starts on the first frame."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+        self._queue.put_nowait(chunk)
+
+    async def _audio(self) -> AsyncIterator[bytes]:
+        while (chunk := await self._queue.get()) is not None:
+            yield chunk
+
+    @abstractmethod
+    async def _run(self) -> None:
+        """Stream `_audio()` to the engine and report results with `_handle_result`."""
+
+    def _handle_result(self, text: str, is_final: bool, language_code: str = "") -> None:
+        """Record an interim or final result from the engine."""
+        text = text.strip()
+        if language_code:
+            self.detected_language = language_code.split("-")[0].lower()
+        if is_final:
+            if text:
+                self.final_segments.append(text)
+            self.interim = ""
+        else:
+            self.interim = text
+        if self.on_result is not None:
+            self.on_result(text, is_final)
+
+    def transcript(self) -> str:
+        """Final segments so far, plus the latest interim result."""
+        parts = [*self.final_segments, self.interim] if self.interim else self.final_segments
+        return " ".join(parts).strip()
+
+    async def finish(self, timeout: float) -> dict:
+        """
+        End the audio stream and wait for the remaining final results.
+
+        Args:
+            timeout: Seconds to wait for the engine after the last frame.
+
+        Returns:
+            A dict with "transcript" (str) and "detected_language" (str), like
+            stt_service.transcribe_audio. The transcript is empty if the engine
+            produced nothing.
+        """
+        self._queue.put_nowait(None)
+        if self._task is not None:
+            try:
+                await asyncio.wait_for(self._task, timeout)
+            except asyncio.TimeoutError:
+                logger.warning("Streaming STT did not finish within %.1fs; using partial results", timeout)
+            except Exception as e:
+                logger.warning("Streaming STT failed: %s", e)
+
+        transcript = self.transcript()
+        language = self.detected_language
+        if language not in GOOGLE_LANGUAGE_CODES:
+            language = detect_language(transcript) if transcript else "en"
+        return {"transcript": transcript, "detected_language": language}
+
+    def cancel(self) -> None:
+        """Stop the engine stream without waiting for results."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+
+
+_speech_client: speech.SpeechAsyncClient | None = None
+
+
+def get_speech_client() -> speech.SpeechAsyncClient:
+    """Get or create the Google Speech async client (lazy init, inside the event loop)."""
+    global _speech_client
+    if _speech_client is None:
+        _speech_client = speech.SpeechAsyncClient()
+        logger.info("Google Speech streaming client initialized")
+    return _speech_client
+
+
+class GoogleStreamingRecognizer(StreamingRecognizer):
+    """google-cloud-speech streaming recognition of 8 kHz mulaw."""
+
+    def __init__(
+        self,
+        language_hint: str = "auto",
+        on_result: ResultCallback | None = None,
+        client=None,
+    ):
+        super().__init__(language_hint, on_result)
+        self._client = client
+
+    def _streaming_config(self) -> speech.StreamingRecognitionConfig:
+        # Known language first; the others stay as alternatives for code-switching callers
+        primary = GOOGLE_LANGUAGE_CODES.get(self.language_hint, GOOGLE_LANGUAGE_CODES["en"])
+        alternatives = [code for code in GOOGLE_LANGUAGE_CODES.values() if code != primary]
+        return speech.StreamingRecognitionConfig(
+            config=speech.RecognitionConfig(
+                encoding=speech.RecognitionConfig.AudioEncoding.MULAW,
+                sample_rate_hertz=MULAW_SAMPLE_RATE,
+                language_code=primary,
+                alternative_language_codes=alternatives,
+                enable_automatic_punctuation=True,
+            ),
+            interim_results=True,
+        )
+
+    async def _requests(self) -> AsyncIterator[speech.StreamingRecognizeRequest]:
+        yield speech.StreamingRecognizeRequest(streaming_config=self._streaming_config())
+        async for chunk in self._audio():
+            yield speech.StreamingRecognizeRequest(audio_content=chunk)
+
+    async def _run(self) -> None:
+        client = self._client or get_speech_client()
+        responses = await client.streaming_recognize(requests=self._requests())
+        async for response in responses:
+            for result in response.results:
+                if result.alternatives:
+                    self._handle_result(
+                        result.alternatives[0].transcript,
+                        result.is_final,
+                        result.language_code,
+                    )
+
+
+class StreamingSTTStats:
+    """How quickly streaming transcripts are ready once the caller stops talking."""
+
+    def __init__(self):
+        self.turns = 0
+        self.fallbacks = 0
+        self.total_finish_ms = 0.0
+        self.max_finish_ms = 0.0
+
+    def record(self, finish_ms: float, fell_back: bool) -> None:
+        self.turns += 1
+        self.total_finish_ms += finish_ms
+        self.max_finish_ms = max(self.max_finish_ms, finish_ms)
+        if fell_back:
+            self.fallbacks += 1
+
+    def stats(self) -> dict:
+        return {
+            "backend": settings.phone_stt_backend,
+            "turns": self.turns,
+            "whisper_fallbacks": self.fallbacks,
+            "avg_ready_after_speech_ms": round(self.total_finish_ms / self.turns, 1) if self.turns else 0.0,
+            "max_ready_after_speech_ms": round(self.max_finish_ms, 1),
+        }
+
+
+streaming_stt_stats = StreamingSTTStats()
+
+
+def create_streaming_recognizer(
+    language_hint: str = "auto",
+    on_result: ResultCallback | None = None,
+) -> StreamingRecognizer | None:
+    """
+    Create a recognizer for one utterance, per the configured phone STT backend.
+
+    Returns:
+        The recognizer, or None when the backend is batch Whisper.
+    """
+    if settings.phone_stt_backend == "google_streaming":
+        return GoogleStreamingRecognizer(language_hint, on_result)
+    return None
+
+
+async def finish_streaming_turn(recognizer: StreamingRecognizer) -> dict:
+    """Finish a recognizer at end of speech and record how long the transcript took."""
+    start = time.perf_counter()
+    result = await recognizer.finish(settings.streaming_stt_final_timeout_sec)
+    streaming_stt_stats.record((time.perf_counter() - start) * 1000, not result["transcript"])
+    return result
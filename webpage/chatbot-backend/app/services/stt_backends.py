@@ -0,0 +1,271 @@
+"""Pluggable speech-to-text backends.
+
+`stt_service.transcribe_audio` delegates to the backend chosen by
+`stt_backend`:
+- "whisper_api": OpenAI Whisper over the network (default)
+- "local_whisper": a quantized Whisper-family model (faster-whisper /
+  CTranslate2, int8 by default) running on the CPU in a process pool
+
+Every backend returns {"transcript", "language", "duration"}, with
+"language" already one of "ta", "en", "hi". Latency and real-time factor
+(processing time / audio duration) are recorded per backend.
+"""
+
+import asyncio
+import io
+import logging
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+
+from app.core.config import get_settings
+from app.services.client_registry import get_openai_client
+from app.services.resilience import LatencyHistogram, whisper_provider
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+SUPPORTED_LANGUAGES = ("ta", "en", "hi")
+
+# Whisper API language name -> our code
+LANG_MAP = {
+    "tamil": "ta",
+    "english": "en",
+    "hindi": "hi",
+}
+
+
+class STTBackendStats:
+    """Latency and real-time factor for one backend."""
+
+    def __init__(self):
+        self.calls = 0
+        self.failures = 0
+        self.audio_sec = 0.0
+        self.processing_sec = 0.0
+        self.latency = LatencyHistogram()
+
+    def record(self, processing_sec: float, audio_sec: float) -> None:
+        self.calls += 1
+        self.processing_sec += processing_sec
+        self.audio_sec += audio_sec
+        self.latency.observe(processing_sec * 1000)
+
+    def snapshot(self) -> dict:
+        return {
+            "calls": self.calls,
+            "failures": self.failures,
+            "audio_sec": round(self.audio_sec, 1),
+            "real_time_factor": round(self.processing_sec / self.audio_sec, 3) if self.audio_sec else None,
+            "latency": self.latency.snapshot(),
+        }
+
+
+class STTBackend(ABC):
+    """Interface: transcribe one recording."""
+
+    name = "base"
+
+    def __init__(self):
+        self.stats = STTBackendStats()
+
+    @abstractmethod
+    async def _transcribe(self, audio_content: bytes, filename: str, content_type: str, language: str | None) -> dict:
+        """Backend-specific transcription; returns the dict described in transcribe()."""
+
+    async def transcribe(
+        self,
+        audio_content: bytes,
+        filename: str,
+        content_type: str,
+        language: str | None = None,
+    ) -> dict:
+        """
+        Transcribe audio.
+
+        Args:
+            audio_content: Raw audio bytes (any container Whisper accepts).
+            filename: Name with an extension matching the container.
+            content_type: MIME type of the audio.
+            language: "ta", "en" or "hi" to force a language, None to detect.
+
+        Returns:
+            A dict with "transcript" (str), "language" ("ta"/"en"/"hi") and
+            "duration" (audio seconds, 0.0 if unknown).
+        """
+        start = time.perf_counter()
+        try:
+            result = await self._transcribe(audio_content, filename, content_type, language)
+        except Exception:
+            self.stats.failures += 1
+            raise
+        self.stats.record(time.perf_counter() - start, result.get("duration") or 0.0)
+        return result
+
+    async def start(self) -> None:
+        """Prepare the backend at startup (no-op by default)."""
+
+    async def close(self) -> None:
+        """Release backend resources at shutdown (no-op by default)."""
+
+
+class WhisperAPIBackend(STTBackend):
+    """OpenAI Whisper API, under the Whisper deadline / hedging / circuit breaker."""
+
+    name = "whisper_api"
+
+    async def _transcribe(self, audio_content, filename, content_type, language):
+        # Hand the bytes to the client as a named in-memory file: no temp file,
+        # no extra copy, and hedged attempts can share the same immutable bytes
+        params = {
+            "model": "whisper-1",
+            "file": (filename, audio_content, content_type),
+            "response_format": "verbose_json",
+        }
+        if language:
+            params["language"] = language
+
+        response = await whisper_provider.call(
+            lambda: get_openai_client().audio.transcriptions.create(**params)
+        )
+        whisper_lang = getattr(response, "language", "english")
+        return {
+            "transcript": response.text.strip() if response.text else "",
+            "language": LANG_MAP.get(whisper_lang, "en"),
+            "duration": float(getattr(response, "duration", 0.0) or 0.0),
+        }
+
+
+# Per-process model for the local backend (loaded once by the pool initializer)
+_worker_model = None
+
+
+def _init_local_worker(model_name: str, compute_type: str, cpu_threads: int) -> None:
+    """Process pool initializer: load the quantized model once per worker."""
+    global _worker_model
+    from faster_whisper import WhisperModel
+
+    _worker_model = WhisperModel(
+        model_name,
+        device="cpu",
+        compute_type=compute_type,
+        cpu_threads=cpu_threads,
+    )
+
+
+def _transcribe_in_worker(audio_content: bytes, language: str | None, beam_size: int) -> dict:
+    """Runs in a pool worker: decode and transcribe one recording."""
+    segments, info = _worker_model.transcribe(
+        io.BytesIO(audio_content),
+        language=language,
+        beam_size=beam_size,
+    )
+    transcript = " ".join(segment.text.strip() for segment in segments)
+    return {
+        "transcript": transcript.strip(),
+        "language": info.language if info.language in SUPPORTED_LANGUAGES else "en",
+        "duration": float(info.duration),
+    }
+
+
+def _warm_worker() -> bool:
+    """Force the initializer (model load) to run ahead of the first request."""
+    return _worker_model is not None
+
+
+class LocalWhisperBackend(STTBackend):
+    """Quantized Whisper-family model on the CPU, in a process pool.
+
+    Requires the optional `faster-whisper` package (see the Dockerfile's
+    LOCAL_STT build argument).
+    """
+
+    name = "local_whisper"
+
+    def __init__(self):
+        super().__init__()
+        self._pool: ProcessPoolExecutor | None = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=settings.local_stt_workers,
+                initializer=_init_local_worker,
+                initargs=(
+                    settings.local_stt_model,
+                    settings.local_stt_compute_type,
+                    settings.local_stt_cpu_threads,
+                ),
+            )
+        return self._pool
+
+    async def _transcribe(self, audio_content, filename, content_type, language):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._get_pool(),
+            _transcribe_in_worker,
+            audio_content,
+            language,
+            settings.local_stt_beam_size,
+        )
+
+    async def start(self) -> None:
+        """Start the workers and load the model before the first request."""
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        pool = self._get_pool()
+        await asyncio.gather(*(
+            loop.run_in_executor(pool, _warm_worker)
+            for _ in range(settings.local_stt_workers)
+        ))
+        logger.info(
+            "Local STT ready: %s (%s) x%d workers in %.1fs",
+            settings.local_stt_model, settings.local_stt_compute_type,
+            settings.local_stt_workers, time.perf_counter() - start,
+        )
+
+    async def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+_BACKEND_CLASSES = {
+    backend.name: backend for backend in (WhisperAPIBackend, LocalWhisperBackend)
+}
+
+_backends: dict[str, STTBackend] = {}
+
+
+def get_stt_backend(name: str) -> STTBackend:
+    """Get (or create) a backend by name."""
+    backend = _backends.get(name)
+    if backend is None:
+        if name not in _BACKEND_CLASSES:
+            raise ValueError(f"Unknown STT backend: {name}")
+        backend = _backends[name] = _BACKEND_CLASSES[name]()
+    return backend
+
+
+async def start_stt_backends() -> None:
+    """Prepare the configured primary and fallback backends."""
+    for name in filter(None, (settings.stt_backend, settings.stt_fallback_backend)):
+        try:
+            await get_stt_backend(name).start()
+        except Exception as e:
+            logger.error(f"STT backend {name} failed to start: {e}", exc_info=True)
+
+
+async def close_stt_backends() -> None:
+    for backend in _backends.values():
+        await backend.close()
+
+
+def stt_backend_stats() -> dict:
+    """Per-backend latency and real-time factor."""
+    return {
+        "backend": settings.stt_backend,
+        "fallback_backend": settings.stt_fallback_backend or None,
+        "backends": {name: backend.stats.snapshot() for name, backend in _backends.items()},
+    }
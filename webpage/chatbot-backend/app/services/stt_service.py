@@ -1,29 +1,13 @@
 import logging
-import os
-import re
-import tempfile
-
-from openai import AsyncOpenAI
 
 from app.core.config import get_settings
+from app.services.language_id import identify_language
+from app.services.stt_backends import get_stt_backend
 
 logger = logging.getLogger(__name__)
 
 settings = get_settings()
 
-client = AsyncOpenAI(api_key=settings.openai_api_key)
-
-# Unicode patterns for fallback language detection
-TAMIL_PATTERN = re.compile(r"[\u0B80-\u0BFF]")
-HINDI_PATTERN = re.compile(r"[\u0900-\u097F]")
-
-# Whisper language name → our code
-LANG_MAP = {
-    "tamil": "ta",
-    "english": "en",
-    "hindi": "hi",
-}
-
 # Our code → Whisper ISO 639-1 hint
 HINT_MAP = {
     "ta": "ta",
@@ -32,22 +16,13 @@ HINT_MAP = {
 }
 
 
-def detect_language_from_text(text: str) -> str:
-    """Detect language from transcript text using Unicode ranges."""
-    if TAMIL_PATTERN.search(text):
-        return "ta"
-    if HINDI_PATTERN.search(text):
-        return "hi"
-    return "en"
-
-
 async def transcribe_audio(
     audio_content: bytes,
     content_type: str = "audio/webm",
     language_hint: str = "auto",
 ) -> dict:
     """
-    Transcribe audio using OpenAI Whisper API.
+    Transcribe audio with the configured STT backend (Whisper API or local CPU Whisper).
     Automatically detects language (Tamil, English, Hindi, Tanglish).
 
     Args:
@@ -71,73 +46,48 @@ async def transcribe_audio(
     else:
         suffix = ".webm"
 
-    # Write audio to temp file (Whisper API requires a file)
-    temp_path = None
-    try:
-        with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as f:
-            f.write(audio_content)
-            temp_path = f.name
-
-        # Build Whisper API params
-        params = {
-            "model": "whisper-1",
-            "file": open(temp_path, "rb"),
-            "response_format": "verbose_json",
-        }
-
-        # Pass language hint if user selected a specific language
-        if language_hint != "auto" and language_hint in HINT_MAP:
-            params["language"] = HINT_MAP[language_hint]
+    # Pass language hint if user selected a specific language
+    language = HINT_MAP.get(language_hint) if language_hint != "auto" else None
 
+    try:
         logger.info(
-            f"Whisper STT request - content_type: {content_type}, "
+            f"STT request ({settings.stt_backend}) - content_type: {content_type}, "
             f"size: {len(audio_content)} bytes, "
             f"language_hint: {language_hint}"
         )
 
-        response = await client.audio.transcriptions.create(**params)
-
-        # Close the file handle
-        params["file"].close()
-
-        transcript = response.text.strip() if response.text else ""
-        whisper_lang = getattr(response, "language", "english")
+        args = (audio_content, f"audio{suffix}", content_type, language)
+        try:
+            result = await get_stt_backend(settings.stt_backend).transcribe(*args)
+        except Exception as e:
+            if not settings.stt_fallback_backend:
+                raise
+            logger.warning(f"STT backend {settings.stt_backend} failed ({e}); using {settings.stt_fallback_backend}")
+            result = await get_stt_backend(settings.stt_fallback_backend).transcribe(*args)
 
-        # Map Whisper language to our code
-        detected_language = LANG_MAP.get(whisper_lang, "en")
+        transcript = result["transcript"]
+        detected_language = result["language"]
 
-        logger.info(
-            f"Whisper detected language: {whisper_lang} -> {detected_language}"
-        )
+        logger.info(f"STT detected language: {detected_language}")
 
-        # Fallback: check transcript text for Tamil/Hindi Unicode
-        # Handles Tanglish where Whisper might say "english" but text has Tamil chars
+        # Fallback: check the transcript text for Tamil/Hindi, in native script
+        # or romanized. Handles Tanglish where Whisper might say "english"
         if transcript:
-            text_lang = detect_language_from_text(transcript)
-            if text_lang == "ta" and detected_language != "ta":
-                logger.info(
-                    f"Language override from text: {detected_language} -> ta (Tamil chars found)"
-                )
-                detected_language = "ta"
-            elif text_lang == "hi" and detected_language != "hi":
+            guess = identify_language(transcript)
+            if guess.language != "en" and guess.language != detected_language:
                 logger.info(
-                    f"Language override from text: {detected_language} -> hi (Hindi chars found)"
+                    f"Language override from text: {detected_language} -> {guess.language} "
+                    f"({'romanized' if guess.romanized else 'native script'}, confidence {guess.confidence})"
                 )
-                detected_language = "hi"
+                detected_language = guess.language
 
         if not transcript:
-            logger.warning("Whisper returned empty transcript.")
+            logger.warning("STT returned empty transcript.")
             return {"transcript": "", "detected_language": detected_language}
 
         logger.info(f"STT transcript ({detected_language}): {transcript[:100]}...")
         return {"transcript": transcript, "detected_language": detected_language}
 
     except Exception as e:
-        logger.error(f"Whisper STT error: {e}", exc_info=True)
+        logger.error(f"STT error: {e}", exc_info=True)
         raise
-    finally:
-        if temp_path and os.path.exists(temp_path):
-            try:
-                os.unlink(temp_path)
-            except Exception:
-                pass
@@ -0,0 +1,54 @@
+"""Token counting for prompt budgeting and usage reporting.
+
+Uses the tiktoken encoding of the configured OpenAI model, loaded once and
+cached. If the encoding cannot be loaded (tiktoken fetches it on first use),
+counts fall back to a UTF-8 byte estimate rather than failing the request.
+"""
+
+import logging
+from functools import lru_cache
+
+import tiktoken
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+# Per-message framing overhead of the Chat Completions format
+TOKENS_PER_MESSAGE = 4
+TOKENS_PER_REPLY_PRIMING = 3
+
+
+@lru_cache()
+def get_encoding() -> tiktoken.Encoding | None:
+    """Load the tokenizer for the configured model (cached after the first call)."""
+    try:
+        try:
+            return tiktoken.encoding_for_model(settings.openai_model)
+        except KeyError:
+            return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        logger.warning(f"Could not load tiktoken encoding, using byte estimate: {e}")
+        return None
+
+
+@lru_cache(maxsize=4096)
+def count_tokens(text: str) -> int:
+    """Count the tokens in a piece of text."""
+    if not text:
+        return 0
+    encoding = get_encoding()
+    if encoding is None:
+        # ~4 UTF-8 bytes per token holds roughly for English, Tamil and Hindi
+        return max(1, round(len(text.encode("utf-8")) / 4))
+    return len(encoding.encode(text))
+
+
+def count_message_tokens(messages: list[dict]) -> int:
+    """Count the prompt tokens of a Chat Completions messages array."""
+    total = TOKENS_PER_REPLY_PRIMING
+    for message in messages:
+        total += TOKENS_PER_MESSAGE + count_tokens(message.get("content", ""))
+    return total
@@ -0,0 +1,190 @@
+"""Content-addressed cache for synthesized speech.
+
+The assistant repeats itself a lot (lead-collection prompts, contact
+details, pricing deflections), so synthesized audio is cached per sentence
+under sha256(cleaned text, voice name, encoding). A hot in-memory LRU tier
+sits in front of a bounded on-disk tier; both are limited by total bytes
+and evict least recently used entries. The disk tier survives restarts.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+_CACHE_SUFFIX = ".tts"
+
+
+def tts_cache_key(clean_text: str, voice_name: str, encoding: str) -> str:
+    """Content address of one synthesized sentence."""
+    digest = hashlib.sha256()
+    for part in (voice_name, encoding, clean_text):
+        digest.update(part.encode())
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+class TTSAudioCache:
+    """Two-tier (memory, disk) LRU cache of audio bytes, bounded by size."""
+
+    def __init__(self, memory_max_bytes: int, disk_max_bytes: int, disk_dir: str):
+        self.memory_max_bytes = memory_max_bytes
+        self.disk_max_bytes = disk_max_bytes
+        self.disk_dir = disk_dir
+        self._memory: OrderedDict[str, bytes] = OrderedDict()
+        self._memory_bytes = 0
+        # key -> size of the file on disk, least recently used first
+        self._disk: OrderedDict[str, int] = OrderedDict()
+        self._disk_bytes = 0
+        self._disk_ready = False
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.memory_evictions = 0
+        self.disk_evictions = 0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, key + _CACHE_SUFFIX)
+
+    def _load_disk_index(self) -> None:
+        """Index files left by previous runs, oldest access first (blocking)."""
+        os.makedirs(self.disk_dir, exist_ok=True)
+        entries = []
+        for name in os.listdir(self.disk_dir):
+            if name.endswith(_CACHE_SUFFIX):
+                stat = os.stat(os.path.join(self.disk_dir, name))
+                entries.append((stat.st_mtime, name[:-len(_CACHE_SUFFIX)], stat.st_size))
+        for _, key, size in sorted(entries):
+            self._disk[key] = size
+            self._disk_bytes += size
+        self._evict_disk()
+        self._disk_ready = True
+
+    def _remember(self, key: str, audio: bytes) -> None:
+        """Put audio in the memory tier, evicting LRU entries over the byte budget."""
+        if len(audio) > self.memory_max_bytes:
+            return
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= len(previous)
+        self._memory[key] = audio
+        self._memory_bytes += len(audio)
+        while self._memory_bytes > self.memory_max_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+            self.memory_evictions += 1
+
+    def _evict_disk(self) -> None:
+        while self._disk_bytes > self.disk_max_bytes and self._disk:
+            key, size = self._disk.popitem(last=False)
+            self._disk_bytes -= size
+            self.disk_evictions += 1
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def _read(self, key: str) -> bytes | None:
+        try:
+            with open(self._path(key), "rb") as f:
+                audio = f.read()
+            os.utime(self._path(key))  # keeps LRU order across restarts
+            return audio
+        except OSError:
+            return None
+
+    def _write(self, key: str, audio: bytes) -> None:
+        # Write-then-rename so a crash never leaves a truncated entry behind
+        tmp_path = f"{self._path(key)}.{threading.get_ident()}.part"
+        with open(tmp_path, "wb") as f:
+            f.write(audio)
+        os.replace(tmp_path, self._path(key))
+
+    async def start(self) -> None:
+        """Index the disk tier at startup."""
+        if self.disk_max_bytes > 0 and not self._disk_ready:
+            await asyncio.to_thread(self._load_disk_index)
+            logger.info(
+                f"TTS cache disk tier: {len(self._disk)} entries, "
+                f"{self._disk_bytes / 1024 / 1024:.1f} MB in {self.disk_dir}"
+            )
+
+    async def get(self, key: str) -> bytes | None:
+        """Return cached audio for `key` (memory first, then disk), or None."""
+        audio = self._memory.get(key)
+        if audio is not None:
+            self._memory.move_to_end(key)
+            self.memory_hits += 1
+            return audio
+
+        if key in self._disk:
+            audio = await asyncio.to_thread(self._read, key)
+            if audio is not None:
+                self._disk.move_to_end(key)
+                self._remember(key, audio)
+                self.disk_hits += 1
+                return audio
+            # File vanished underneath us
+            self._disk_bytes -= self._disk.pop(key, 0)
+
+        self.misses += 1
+        return None
+
+    async def put(self, key: str, audio: bytes) -> None:
+        """Store audio in both tiers."""
+        if not audio:
+            return
+        self._remember(key, audio)
+        if self.disk_max_bytes <= 0 or key in self._disk or len(audio) > self.disk_max_bytes:
+            return
+        if not self._disk_ready:
+            await self.start()
+        try:
+            await asyncio.to_thread(self._write, key, audio)
+        except OSError as e:
+            logger.warning(f"TTS cache write failed: {e}")
+            return
+        if key in self._disk:  # a concurrent put of the same sentence won
+            return
+        self._disk[key] = len(audio)
+        self._disk_bytes += len(audio)
+        self._evict_disk()
+
+    def clear_memory(self) -> None:
+        """Drop the memory tier (the disk tier is kept for the next run)."""
+        self._memory.clear()
+        self._memory_bytes = 0
+
+    def stats(self) -> dict:
+        """Per-tier size and hit/miss counters."""
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        hits = self.memory_hits + self.disk_hits
+        return {
+            "memory_entries": len(self._memory),
+            "memory_bytes": self._memory_bytes,
+            "memory_max_bytes": self.memory_max_bytes,
+            "disk_entries": len(self._disk),
+            "disk_bytes": self._disk_bytes,
+            "disk_max_bytes": self.disk_max_bytes,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+            "memory_evictions": self.memory_evictions,
+            "disk_evictions": self.disk_evictions,
+        }
+
+
+tts_cache = TTSAudioCache(
+    memory_max_bytes=settings.tts_cache_memory_mb * 1024 * 1024,
+    disk_max_bytes=settings.tts_cache_disk_mb * 1024 * 1024,
+    disk_dir=settings.tts_cache_dir,
+)
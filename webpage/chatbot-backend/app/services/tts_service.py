@@ -1,11 +1,29 @@
+import asyncio
+import contextlib
+import functools
 import logging
 import os
 import re
+import time
 import uuid
+from collections.abc import AsyncIterator
 
 from google.cloud import texttospeech_v1 as texttospeech
 
 from app.core.config import get_settings
+from app.services.audio_converter import (
+    MULAW_SAMPLE_RATE,
+    OggOpusJoiner,
+    join_mp3,
+    join_ogg_opus,
+    mp3_duration_sec,
+    mp3_frames,
+    ogg_opus_duration_sec,
+    strip_wav_header,
+)
+from app.services.resilience import tts_provider
+from app.services.sentence_splitter import split_for_synthesis
+from app.services.tts_cache import tts_cache, tts_cache_key
 
 logger = logging.getLogger(__name__)
 
@@ -18,133 +36,397 @@ VOICE_MAP = {
     "hi": {"language_code": "hi-IN", "name": "hi-IN-Chirp3-HD-Achernar"},
 }
 
+# Standard voices used when Chirp3-HD is slow or failing
+FALLBACK_VOICE_MAP = {
+    "ta": {"language_code": "ta-IN", "name": "ta-IN-Standard-A"},
+    "en": {"language_code": "en-IN", "name": "en-IN-Standard-A"},
+    "hi": {"language_code": "hi-IN", "name": "hi-IN-Standard-A"},
+}
+
 # Audio temp directory
 AUDIO_TEMP_DIR = settings.audio_temp_dir
 
+# Output encodings: Ogg Opus or MP3 for the web player, 8 kHz mulaw for Twilio media streams
+MP3 = "mp3"
+OGG_OPUS = "ogg_opus"
+MULAW_8K = "mulaw_8k"
+
+# Web player formats: encoding -> (file extension, media type)
+WEB_AUDIO_FORMATS = {
+    OGG_OPUS: (".ogg", "audio/ogg"),
+    MP3: (".mp3", "audio/mpeg"),
+}
+
+# How each encoding's clips are joined into one stream, and measured
+_JOINERS = {
+    MP3: join_mp3,
+    OGG_OPUS: join_ogg_opus,
+    MULAW_8K: b"".join,  # raw samples simply concatenate
+}
+_DURATIONS = {
+    MP3: mp3_duration_sec,
+    OGG_OPUS: ogg_opus_duration_sec,
+    MULAW_8K: lambda audio: len(audio) / MULAW_SAMPLE_RATE,
+}
+
+
+# clean_text_for_speech steps, in order: (guard, pattern, replacement). A step
+# only runs when its guard (a substring, or a set of characters any of which
+# must be present) shows the pattern could match the current text; the
+# patterns and their order are unchanged, so the output is too.
+_BOX_CHARS = frozenset("━═╌│┃┌┐└┘├┤┬┴┼")
+# Keep: . , ? ! : ' - (these create natural speech pauses)
+# Remove: * # ~ ^ ` | \ / @ $ % & + = { } [ ] < > " ;
+_SPECIAL_CHARS = frozenset('*#~^`|\\/@$%&+={}[]<>";')
+
+_SPEECH_CLEANUP_STEPS: tuple[tuple[str | frozenset[str], re.Pattern, str], ...] = (
+    # Markdown bold/italic markers: **text**, *text*, __text__, _text_
+    ("*", re.compile(r"\*{1,3}(.+?)\*{1,3}"), r"\1"),
+    ("_", re.compile(r"_{1,3}(.+?)_{1,3}"), r"\1"),
+    # Markdown headers: ## Header
+    ("#", re.compile(r"^#{1,6}\s*", re.MULTILINE), ""),
+    # Markdown links: [text](url) → text
+    ("](", re.compile(r"\[([^\]]+)\]\([^)]+\)"), r"\1"),
+    # Markdown inline code: `code`
+    ("`", re.compile(r"`([^`]+)`"), r"\1"),
+    # Markdown bullet points: - item, * item, • item
+    (frozenset("-*•"), re.compile(r"^[\s]*[-*•]\s+", re.MULTILINE), ""),
+    # Numbered list markers: 1. item, 2. item
+    (".", re.compile(r"^[\s]*\d+\.\s+", re.MULTILINE), ""),
+    # Markdown horizontal rules: ---, ***, ___
+    (frozenset("-*_"), re.compile(r"^[-*_]{3,}\s*$", re.MULTILINE), ""),
+    # Email addresses and URLs
+    ("@", re.compile(r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}"), ""),
+    ("http", re.compile(r"https?://[^\s]+"), ""),
+    # / between words → " or " (e.g., CRM/ERP → CRM or ERP)
+    ("/", re.compile(r"(\w)/(\w)"), r"\1 or \2"),
+    # Special symbols that shouldn't be spoken
+    (_BOX_CHARS, re.compile(r"[━═╌│┃┌┐└┘├┤┬┴┼]"), ""),
+    (_SPECIAL_CHARS, re.compile(r'[*#~^`|\\/@$%&+={}[\]<>";]'), ""),
+    # Sentences left incomplete after removing emails/URLs
+    ("or", re.compile(r"\b(?:at|to)\s+or\s+(?:visit|call)?\s*$", re.MULTILINE), "."),
+    ("reach us at", re.compile(r"reach us at\s*or\s*"), "reach us. "),
+    ("reach us at", re.compile(r"reach us at\s*\."), "reach us."),
+    ("reach us", re.compile(r"reach us\s+\."), "reach us."),
+    ("at", re.compile(r"\bat\s*\.\s*$", re.MULTILINE), "."),
+    ("visit", re.compile(r"\bvisit\s*\.\s*$", re.MULTILINE), "."),
+    ("You can reach us", re.compile(r"You can reach us\s+or\s*$", re.MULTILINE), "You can reach us."),
+    ("visit", re.compile(r"\bor\s+visit\s*\.?\s*$", re.MULTILINE), "."),
+    # Trailing "at" or "at ." left after email removal
+    ("at", re.compile(r"\bat\s*$", re.MULTILINE), "."),
+    # Restore + before phone numbers (was removed by special char cleanup)
+    ("91-", re.compile(r"\b(91-\d)"), r"+\1"),
+    # Multiple spaces and multiple newlines
+    ("  ", re.compile(r"  +"), " "),
+    ("\n\n\n", re.compile(r"\n{3,}"), "\n\n"),
+)
+
+# Replies repeat (contact details, lead prompts, per-sentence phone audio)
+SPEECH_CLEANUP_CACHE_SIZE = 2048
+
 
+@functools.lru_cache(maxsize=SPEECH_CLEANUP_CACHE_SIZE)
 def clean_text_for_speech(text: str) -> str:
     """
     Clean text for natural TTS output.
     Removes markdown, special symbols, and formatting that
     would be read aloud unnaturally.
     """
-    # Remove markdown bold/italic markers: **text**, *text*, __text__, _text_
-    text = re.sub(r"\*{1,3}(.+?)\*{1,3}", r"\1", text)
-    text = re.sub(r"_{1,3}(.+?)_{1,3}", r"\1", text)
+    for guard, pattern, replacement in _SPEECH_CLEANUP_STEPS:
+        if guard in text if isinstance(guard, str) else not guard.isdisjoint(text):
+            text = pattern.sub(replacement, text)
 
-    # Remove markdown headers: ## Header
-    text = re.sub(r"^#{1,6}\s*", "", text, flags=re.MULTILINE)
+    # Remove leading/trailing whitespace per line
+    if "\n" in text:
+        text = "\n".join(line.strip() for line in text.split("\n"))
 
-    # Remove markdown links: [text](url) → text
-    text = re.sub(r"\[([^\]]+)\]\([^)]+\)", r"\1", text)
+    return text.strip()
 
-    # Remove markdown inline code: `code`
-    text = re.sub(r"`([^`]+)`", r"\1", text)
 
-    # Remove markdown bullet points: - item, * item, • item
-    text = re.sub(r"^[\s]*[-*•]\s+", "", text, flags=re.MULTILINE)
+class TTSEngine:
+    """One long-lived Google TTS async client, shared by every synthesis.
 
-    # Remove numbered list markers: 1. item, 2. item
-    text = re.sub(r"^[\s]*\d+\.\s+", "", text, flags=re.MULTILINE)
+    Voice and audio configs are built once per language (Opus uses the
+    per-language sample rate in tts_opus_sample_rate_hz), and a semaphore caps
+    concurrent syntheses so a burst of replies queues here instead of
+    overloading the TTS quota. No call blocks the event loop.
 
-    # Remove markdown horizontal rules: ---, ***, ___
-    text = re.sub(r"^[-*_]{3,}\s*$", "", text, flags=re.MULTILINE)
+    Callers take a slot() before entering the resilience layer, so time spent
+    queueing never counts against the TTS deadline, the hedge timer or the
+    circuit breaker, and a hedged attempt runs inside its caller's slot.
+    """
 
-    # Replace email addresses with spoken form
-    text = re.sub(r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}", "", text)
+    def __init__(self):
+        self._client: texttospeech.TextToSpeechAsyncClient | None = None
+        self._semaphore = asyncio.Semaphore(settings.tts_max_concurrency)
+        self._voices = {
+            language: texttospeech.VoiceSelectionParams(**config)
+            for language, config in VOICE_MAP.items()
+        }
+        self._fallback_voices = {
+            language: texttospeech.VoiceSelectionParams(**config)
+            for language, config in FALLBACK_VOICE_MAP.items()
+        }
+        self._audio_configs = {
+            MP3: texttospeech.AudioConfig(
+                audio_encoding=texttospeech.AudioEncoding.MP3,
+                speaking_rate=1.0,
+                pitch=0.0,
+            ),
+            MULAW_8K: texttospeech.AudioConfig(
+                audio_encoding=texttospeech.AudioEncoding.MULAW,
+                sample_rate_hertz=MULAW_SAMPLE_RATE,
+                speaking_rate=1.0,
+                pitch=0.0,
+            ),
+        }
+        self._opus_configs = {
+            language: texttospeech.AudioConfig(
+                audio_encoding=texttospeech.AudioEncoding.OGG_OPUS,
+                sample_rate_hertz=self.opus_sample_rate(language),
+                speaking_rate=1.0,
+                pitch=0.0,
+            )
+            for language in VOICE_MAP
+        }
+        # encoding -> [clips, bytes, seconds of speech]
+        self._output = {encoding: [0, 0, 0.0] for encoding in _DURATIONS}
+        self.syntheses = 0
+        self.slots_taken = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.queued = 0
+        self.total_wait_ms = 0.0
+
+    @property
+    def client(self) -> texttospeech.TextToSpeechAsyncClient:
+        """The shared client (created on first use if the lifespan has not started it)."""
+        if self._client is None:
+            self._client = texttospeech.TextToSpeechAsyncClient()
+            logger.info("Google TTS async client initialized")
+        return self._client
+
+    def voice(self, language: str, fallback: bool = False) -> texttospeech.VoiceSelectionParams:
+        voices = self._fallback_voices if fallback else self._voices
+        return voices.get(language, voices["en"])
+
+    @staticmethod
+    def opus_sample_rate(language: str) -> int:
+        rates = settings.tts_opus_sample_rate_hz
+        return rates.get(language, rates.get("en", 24000))
+
+    def audio_config(self, encoding: str, language: str) -> texttospeech.AudioConfig:
+        if encoding == OGG_OPUS:
+            return self._opus_configs.get(language, self._opus_configs["en"])
+        return self._audio_configs[encoding]
+
+    def encoding_label(self, encoding: str, language: str) -> str:
+        """Encoding plus any per-language parameters, for cache keys."""
+        if encoding == OGG_OPUS:
+            return f"{encoding}@{self.opus_sample_rate(language)}"
+        return encoding
+
+    async def synthesize(
+        self,
+        clean_text: str,
+        voice: texttospeech.VoiceSelectionParams,
+        encoding: str = MP3,
+        language: str = "en",
+    ) -> bytes:
+        """
+        Synthesize already-cleaned text (one upstream request; the caller
+        holds a slot()).
+
+        Returns:
+            MP3 or Ogg Opus bytes, or raw mulaw samples (WAV header removed)
+            for MULAW_8K.
+        """
+        response = await self.client.synthesize_speech(
+            input=texttospeech.SynthesisInput(text=clean_text),
+            voice=voice,
+            audio_config=self.audio_config(encoding, language),
+        )
+        self.syntheses += 1
+        audio = response.audio_content
+        if encoding == MULAW_8K:
+            audio = strip_wav_header(audio)
+        self._record_output(encoding, audio)
+        return audio
+
+    @contextlib.asynccontextmanager
+    async def slot(self):
+        """Wait for one of the tts_max_concurrency synthesis slots and hold it."""
+        start = time.perf_counter()
+        if self._semaphore.locked():
+            self.queued += 1
+        async with self._semaphore:
+            self.total_wait_ms += (time.perf_counter() - start) * 1000
+            self.slots_taken += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            try:
+                yield
+            finally:
+                self.in_flight -= 1
+
+    def _record_output(self, encoding: str, audio: bytes) -> None:
+        output = self._output[encoding]
+        output[0] += 1
+        output[1] += len(audio)
+        output[2] += _DURATIONS[encoding](audio)
+
+    def output_stats(self) -> dict:
+        """Size of synthesized audio per encoding, per second of speech."""
+        return {
+            encoding: {
+                "clips": clips,
+                "bytes": size,
+                "speech_sec": round(seconds, 1),
+                "bytes_per_speech_sec": round(size / seconds) if seconds else 0,
+            }
+            for encoding, (clips, size, seconds) in self._output.items()
+        }
+
+    async def start(self) -> None:
+        """Create the client inside the running event loop at startup."""
+        _ = self.client
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.transport.close()
+            self._client = None
+
+    def stats(self) -> dict:
+        return {
+            "max_concurrency": settings.tts_max_concurrency,
+            "syntheses": self.syntheses,
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "queued": self.queued,
+            "avg_queue_wait_ms": round(self.total_wait_ms / self.slots_taken, 1) if self.slots_taken else 0.0,
+            "text_cleanup_cache": clean_text_for_speech.cache_info()._asdict(),
+            "output": self.output_stats(),
+        }
+
+
+tts_engine = TTSEngine()
+
+
+async def _synthesize_with_voice(
+    clean_text: str, language: str, encoding: str, fallback: bool
+) -> tuple[bytes, bool]:
+    """Returns (audio bytes, whether the primary voice produced them)."""
+    audio = await tts_engine.synthesize(
+        clean_text, tts_engine.voice(language, fallback), encoding, language,
+    )
+    return audio, not fallback
 
-    # Remove URLs
-    text = re.sub(r"https?://[^\s]+", "", text)
 
-    # Replace / between words with " or " (e.g., CRM/ERP → CRM or ERP)
-    text = re.sub(r"(\w)/(\w)", r"\1 or \2", text)
+async def _synthesize_sentence(sentence: str, language: str, encoding: str) -> bytes:
+    """
+    Synthesize one sentence, from the TTS cache when possible.
 
-    # Remove special symbols that shouldn't be spoken
-    text = re.sub(r"[━═╌│┃┌┐└┘├┤┬┴┼]", "", text)
+    Runs under the TTS deadline, hedging and circuit breaker, and falls back to
+    the standard voice when Chirp3-HD fails or is too slow. Fallback audio is
+    not cached, so the sentence is retried with Chirp3-HD next time.
+    """
+    key = None
+    if settings.tts_cache_enabled:
+        key = tts_cache_key(
+            sentence, tts_engine.voice(language).name, tts_engine.encoding_label(encoding, language),
+        )
+        cached = await tts_cache.get(key)
+        if cached is not None:
+            return cached
+
+    # Queue for a slot first: waiting is not upstream latency
+    async with tts_engine.slot():
+        audio, primary = await tts_provider.call(
+            lambda: _synthesize_with_voice(sentence, language, encoding, fallback=False),
+            fallback=lambda: _synthesize_with_voice(sentence, language, encoding, fallback=True),
+        )
+    if key is not None and primary:
+        await tts_cache.put(key, audio)
+    return audio
 
-    # Remove remaining special characters (keep basic punctuation for natural pauses)
-    # Keep: . , ? ! : ' - (these create natural speech pauses)
-    # Remove: * # ~ ^ ` | \ / @ $ % & + = { } [ ] < > " ;
-    text = re.sub(r'[*#~^`|\\/@$%&+={}[\]<>";]', "", text)
 
-    # Clean up sentences left incomplete after removing emails/URLs
-    text = re.sub(r"\b(?:at|to)\s+or\s+(?:visit|call)?\s*$", ".", text, flags=re.MULTILINE)
-    text = re.sub(r"reach us at\s*or\s*", "reach us. ", text)
-    text = re.sub(r"reach us at\s*\.", "reach us.", text)
-    text = re.sub(r"reach us\s+\.", "reach us.", text)
-    text = re.sub(r"\bat\s*\.\s*$", ".", text, flags=re.MULTILINE)
-    text = re.sub(r"\bvisit\s*\.\s*$", ".", text, flags=re.MULTILINE)
-    text = re.sub(r"You can reach us\s+or\s*$", "You can reach us.", text, flags=re.MULTILINE)
-    text = re.sub(r"\bor\s+visit\s*\.?\s*$", ".", text, flags=re.MULTILINE)
-    # Clean trailing "at" or "at ." left after email removal
-    text = re.sub(r"\bat\s*$", ".", text, flags=re.MULTILINE)
+def _start_chunks(clean_text: str, language: str, encoding: str) -> list[asyncio.Task]:
+    """
+    Plan cleaned text into chunks and start synthesizing them.
 
-    # Restore + before phone numbers (was removed by special char cleanup)
-    text = re.sub(r"\b(91-\d)", r"+\1", text)
+    Returns:
+        One task per chunk, in playback order. At most tts_chunk_concurrency
+        of them synthesize at once.
+    """
+    chunks = split_for_synthesis(clean_text, settings.tts_chunk_max_chars) or [clean_text]
+    semaphore = asyncio.Semaphore(settings.tts_chunk_concurrency)
 
-    # Clean up multiple spaces
-    text = re.sub(r"  +", " ", text)
+    async def synthesize_chunk(chunk: str) -> bytes:
+        async with semaphore:
+            return await _synthesize_sentence(chunk, language, encoding)
 
-    # Clean up multiple newlines
-    text = re.sub(r"\n{3,}", "\n\n", text)
+    return [asyncio.create_task(synthesize_chunk(chunk)) for chunk in chunks]
 
-    # Remove leading/trailing whitespace per line
-    text = "\n".join(line.strip() for line in text.split("\n"))
 
-    return text.strip()
+async def _synthesize(clean_text: str, language: str, encoding: str) -> bytes:
+    """
+    Synthesize cleaned text in chunks, concurrently, and join the clips.
+
+    The text is planned into sentences (long ones split at clause
+    boundaries), so synthesis time stays close to that of the longest chunk
+    rather than growing with reply length, no request nears the provider's
+    input limit, and replies that only partly repeat earlier ones (the
+    contact details, a lead-collection prompt) still reuse cached audio.
+    """
+    tasks = _start_chunks(clean_text, language, encoding)
+    try:
+        parts = await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+    return _JOINERS[encoding](parts)
+
 
+def audio_media_type(filename: str) -> str:
+    """Media type of a generated audio file, from its extension."""
+    for extension, media_type in WEB_AUDIO_FORMATS.values():
+        if filename.endswith(extension):
+            return media_type
+    return "audio/mpeg"
 
-async def synthesize_speech(text: str, language: str = "en") -> str:
+
+async def synthesize_speech(text: str, language: str = "en", encoding: str = MP3) -> str:
     """
     Synthesize speech from text using Google Cloud TTS Chirp3-HD.
 
     Args:
         text: The text to convert to speech.
         language: Language code ("ta", "en", "hi").
+        encoding: MP3 or OGG_OPUS.
 
     Returns:
-        Filename of the generated MP3 audio file.
+        Filename of the generated audio file (.mp3 or .ogg).
     """
     try:
-        voice_config = VOICE_MAP.get(language, VOICE_MAP["en"])
-
         os.makedirs(AUDIO_TEMP_DIR, exist_ok=True)
 
-        filename = f"tts_{uuid.uuid4().hex}.mp3"
+        extension, _ = WEB_AUDIO_FORMATS[encoding]
+        filename = f"tts_{uuid.uuid4().hex}{extension}"
         filepath = os.path.join(AUDIO_TEMP_DIR, filename)
 
-        client = texttospeech.TextToSpeechClient()
-
         # Clean text for natural speech output
         clean_text = clean_text_for_speech(text)
 
         logger.info(f"TTS input cleaned: {len(text)} -> {len(clean_text)} chars")
 
-        synthesis_input = texttospeech.SynthesisInput(text=clean_text)
-
-        voice = texttospeech.VoiceSelectionParams(
-            language_code=voice_config["language_code"],
-            name=voice_config["name"],
-        )
-
-        audio_config = texttospeech.AudioConfig(
-            audio_encoding=texttospeech.AudioEncoding.MP3,
-            speaking_rate=1.0,
-            pitch=0.0,
-        )
-
-        response = client.synthesize_speech(
-            input=synthesis_input,
-            voice=voice,
-            audio_config=audio_config,
-        )
+        audio_content = await _synthesize(clean_text, language, encoding)
 
         with open(filepath, "wb") as f:
-            f.write(response.audio_content)
+            f.write(audio_content)
 
         logger.info(
             f"TTS synthesis completed: {filename} "
-            f"({language}, {voice_config['name']}, {len(response.audio_content)} bytes)"
+            f"({language}, {len(audio_content)} bytes)"
         )
         return filename
 
@@ -153,45 +435,74 @@ async def synthesize_speech(text: str, language: str = "en") -> str:
         raise
 
 
-async def synthesize_speech_bytes(text: str, language: str = "en") -> bytes:
-    """Synthesize speech and return raw MP3 bytes (no file written).
+async def stream_speech(text: str, language: str = "en", encoding: str = MP3) -> AsyncIterator[bytes]:
+    """
+    Synthesize speech as MP3 or Ogg Opus, yielding each chunk's audio as soon
+    as it (and every chunk before it) is ready.
 
-    Used by the Twilio voice pipeline where we need bytes for
-    mulaw conversion rather than a file on disk.
+    All chunks are synthesized concurrently from the start; appended in
+    order, the yielded pieces form one continuous MP3 or Ogg stream.
 
     Args:
         text: The text to convert to speech.
         language: Language code ("ta", "en", "hi").
-
-    Returns:
-        Raw MP3 audio bytes.
+        encoding: MP3 or OGG_OPUS.
     """
-    voice_config = VOICE_MAP.get(language, VOICE_MAP["en"])
+    clean_text = clean_text_for_speech(text)
+    tasks = _start_chunks(clean_text, language, encoding)
+    ogg = OggOpusJoiner() if encoding == OGG_OPUS else None
+    try:
+        for index, task in enumerate(tasks):
+            clip = await task
+            if ogg is not None:
+                yield ogg.append(clip, last=index == len(tasks) - 1)
+            else:
+                yield mp3_frames(clip)
+    finally:
+        for task in tasks:
+            task.cancel()
+
 
-    client = texttospeech.TextToSpeechClient()
+async def synthesize_speech_bytes(text: str, language: str = "en", encoding: str = MP3) -> bytes:
+    """Synthesize speech and return the encoded audio bytes (no file written).
+
+    Args:
+        text: The text to convert to speech.
+        language: Language code ("ta", "en", "hi").
+        encoding: MP3 or OGG_OPUS.
 
+    Returns:
+        Raw MP3 (or Ogg Opus) audio bytes.
+    """
     clean_text = clean_text_for_speech(text)
     logger.info("TTS bytes input cleaned: %d -> %d chars", len(text), len(clean_text))
 
-    synthesis_input = texttospeech.SynthesisInput(text=clean_text)
-    voice = texttospeech.VoiceSelectionParams(
-        language_code=voice_config["language_code"],
-        name=voice_config["name"],
-    )
-    audio_config = texttospeech.AudioConfig(
-        audio_encoding=texttospeech.AudioEncoding.MP3,
-        speaking_rate=1.0,
-        pitch=0.0,
-    )
+    audio_content = await _synthesize(clean_text, language, encoding)
 
-    response = client.synthesize_speech(
-        input=synthesis_input,
-        voice=voice,
-        audio_config=audio_config,
-    )
+    logger.info("TTS bytes synthesis: %s, %d bytes", language, len(audio_content))
+    return audio_content
+
+
+async def synthesize_speech_mulaw(text: str, language: str = "en") -> bytes:
+    """Synthesize speech directly as Twilio-ready 8 kHz mulaw.
+
+    Used by the Twilio voice pipeline: Google renders telephony audio itself,
+    so there is no MP3 decode, resample or re-encode per turn.
+
+    Args:
+        text: The text to convert to speech.
+        language: Language code ("ta", "en", "hi").
+
+    Returns:
+        Raw mulaw audio bytes at 8000 Hz mono.
+    """
+    clean_text = clean_text_for_speech(text)
+    logger.info("TTS mulaw input cleaned: %d -> %d chars", len(text), len(clean_text))
+
+    audio_content = await _synthesize(clean_text, language, MULAW_8K)
 
     logger.info(
-        "TTS bytes synthesis: %s, %s, %d bytes",
-        language, voice_config["name"], len(response.audio_content),
+        "TTS mulaw synthesis: %s, %d bytes (%.1fs)",
+        language, len(audio_content), len(audio_content) / MULAW_SAMPLE_RATE,
     )
-    return response.audio_content
+    return audio_content
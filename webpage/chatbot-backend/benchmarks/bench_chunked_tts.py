@@ -0,0 +1,95 @@
+"""Wall time of single-shot vs chunked reply synthesis.
+
+Single-shot sends the whole cleaned reply in one TTS request; chunked plans
+it with split_for_synthesis and synthesizes the chunks concurrently
+(tts_service._synthesize, up to tts_chunk_concurrency at a time). The TTS
+client is a fake answering after 150 ms + 0.8 ms per character with
+silent MP3 frames, so the join is exercised too.
+
+Run from webpage/chatbot-backend:
+    python -m benchmarks.bench_chunked_tts
+"""
+
+import asyncio
+import statistics
+import time
+from types import SimpleNamespace
+
+from app.services import tts_service
+from app.services.resilience import ResilientProvider
+from app.services.tts_service import MP3, clean_text_for_speech
+
+TTS_BASE_SEC = 0.150
+TTS_PER_CHAR_SEC = 0.0008
+
+# MPEG-1 Layer III, 128 kbps, 44.1 kHz: 417-byte frames of 26 ms
+MP3_FRAME = b"\xff\xfb\x90\x00" + b"\x00" * 413
+MP3_FRAME_SEC = 1152 / 44100
+SPEECH_SEC_PER_CHAR = 0.065
+
+SENTENCES = [
+    "VMKD X AI LABS builds websites, mobile apps, chatbots and AI automation for businesses.",
+    "Our team has delivered projects for retail, healthcare, education and manufacturing clients.",
+    "Pricing depends on scope, timeline and features, and we share a detailed quote after a short call.",
+    "Most websites are delivered in two to four weeks; larger platforms are planned in phases.",
+]
+REPLY_CHARS = (80, 250, 500, 1000, 2000)
+RUNS = 3
+
+
+class FakeTTSClient:
+    """Answers after TTS_BASE_SEC + TTS_PER_CHAR_SEC per character with silent MP3 of matching length."""
+
+    async def synthesize_speech(self, input, voice, audio_config):
+        await asyncio.sleep(TTS_BASE_SEC + TTS_PER_CHAR_SEC * len(input.text))
+        frames = max(1, round(len(input.text) * SPEECH_SEC_PER_CHAR / MP3_FRAME_SEC))
+        return SimpleNamespace(audio_content=MP3_FRAME * frames)
+
+
+def _reply(chars: int) -> str:
+    """Whole sentences from SENTENCES, about `chars` characters long."""
+    sentences = []
+    while sum(len(sentence) + 1 for sentence in sentences) < chars:
+        sentences.append(SENTENCES[len(sentences) % len(SENTENCES)])
+    return " ".join(sentences)
+
+
+async def _single_shot(text: str) -> bytes:
+    async with tts_service.tts_engine.slot():
+        return await tts_service.tts_engine.synthesize(text, tts_service.tts_engine.voice("en"), MP3, "en")
+
+
+async def _chunked(text: str) -> bytes:
+    return await tts_service._synthesize(text, "en", MP3)
+
+
+def _wall_ms(synthesize, text: str) -> float:
+    async def run() -> float:
+        start = time.perf_counter()
+        await synthesize(text)
+        return (time.perf_counter() - start) * 1000
+
+    return statistics.median(asyncio.run(run()) for _ in range(RUNS))
+
+
+def main() -> None:
+    tts_service.settings.tts_cache_enabled = False
+    tts_service.tts_engine._client = FakeTTSClient()
+    tts_service.tts_provider = ResilientProvider("google_tts_bench", timeout_sec=10.0)
+
+    settings = tts_service.settings
+    print(
+        f"fake TTS {TTS_BASE_SEC * 1000:.0f} ms + {TTS_PER_CHAR_SEC * 1000} ms/char; "
+        f"tts_chunk_max_chars={settings.tts_chunk_max_chars}, "
+        f"tts_chunk_concurrency={settings.tts_chunk_concurrency}, median of {RUNS}"
+    )
+    print("reply chars   single-shot   chunked")
+    for chars in REPLY_CHARS:
+        text = clean_text_for_speech(_reply(chars))
+        single = _wall_ms(_single_shot, text)
+        chunked = _wall_ms(_chunked, text)
+        print(f"{len(text):11}   {single:8.0f} ms   {chunked:5.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Accuracy and per-call cost of language identification.
+
+Compares identify_language with the Unicode-range regex detector it
+replaced, over the accuracy set in tests/test_language_id.py.
+
+Run from webpage/chatbot-backend:
+    python -m benchmarks.bench_language_id
+"""
+
+import re
+import timeit
+
+from app.services.language_id import detect_language
+from tests.test_language_id import ACCURACY_CASES, MIXED_SCRIPT_CASES
+
+SAMPLES = {
+    "tamil": "வணக்கம், உங்கள் சேவைகள் என்ன?",
+    "tanglish": "enaku oru ecommerce website venum",
+    "english": "how much does a website cost for a small shop",
+}
+
+
+def legacy_detect_language(text: str) -> str:
+    """The detector used before language_id (first native character wins)."""
+    if re.compile(r"[஀-௿]").search(text):
+        return "ta"
+    if re.compile(r"[ऀ-ॿ]").search(text):
+        return "hi"
+    return "en"
+
+
+def _accuracy(detector, cases) -> str:
+    correct = sum(detector(text) == expected for text, expected in cases)
+    return f"{correct}/{len(cases)}"
+
+
+def _microseconds(detector, text: str, number: int = 100_000) -> float:
+    return timeit.timeit(lambda: detector(text), number=number) / number * 1e6
+
+
+def main() -> None:
+    for name, detector in (("legacy", legacy_detect_language), ("language_id", detect_language)):
+        print(
+            f"{name:12} accuracy {_accuracy(detector, ACCURACY_CASES)}, "
+            f"mixed script {_accuracy(detector, MIXED_SCRIPT_CASES)}"
+        )
+        for sample, text in SAMPLES.items():
+            print(f"{'':12} {sample:9} {_microseconds(detector, text):6.2f} us/call")
+
+
+if __name__ == "__main__":
+    main()
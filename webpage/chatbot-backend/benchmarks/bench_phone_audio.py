@@ -0,0 +1,155 @@
+"""Conversion cost and time to first frame of phone (Twilio) reply audio.
+
+Compares the MP3 -> pydub/ffmpeg -> 8 kHz mulaw conversion phone turns used
+to run on every clip with the direct MULAW synthesis that replaced it
+(Google's WAV wrapper removed by strip_wav_header). Time to first frame is
+measured from the start of synthesis to the first Twilio media message,
+with a fake TTS client that answers after 150 ms + 0.8 ms per character.
+
+The legacy path needs ffmpeg and ffprobe (pydub); without them that half is
+skipped.
+
+Run from webpage/chatbot-backend:
+    python -m benchmarks.bench_phone_audio
+"""
+
+import asyncio
+import audioop
+import io
+import math
+import shutil
+import statistics
+import struct
+import time
+import timeit
+from types import SimpleNamespace
+
+from google.cloud import texttospeech
+
+from app.services import tts_service
+from app.services.audio_converter import MULAW_SAMPLE_RATE, PCM_SAMPLE_WIDTH, strip_wav_header
+from app.services.resilience import ResilientProvider
+from app.services.stream_processor import build_media_message
+from app.services.tts_service import MP3, synthesize_speech_mulaw
+
+TTS_BASE_SEC = 0.150
+TTS_PER_CHAR_SEC = 0.0008
+# Speech length of a clip per input character
+SPEECH_SEC_PER_CHAR = 0.065
+GOOGLE_MP3_SAMPLE_RATE = 24000
+
+SENTENCES = [
+    "Hello! Welcome to VMKD X AI LABS.",
+    "We build websites, mobile apps, chatbots and AI automation for businesses of every size.",
+    "Our team will call you back within one working day to discuss your requirement in detail.",
+]
+RUNS = 5
+
+
+def legacy_mp3_to_mulaw(mp3_bytes: bytes) -> bytes:
+    """The per-clip conversion phone turns ran before MULAW synthesis."""
+    from pydub import AudioSegment
+
+    audio = AudioSegment.from_mp3(io.BytesIO(mp3_bytes))
+    audio = audio.set_frame_rate(MULAW_SAMPLE_RATE).set_channels(1).set_sample_width(PCM_SAMPLE_WIDTH)
+    return audioop.lin2ulaw(audio.raw_data, PCM_SAMPLE_WIDTH)
+
+
+def _tone(seconds: float, sample_rate: int) -> bytes:
+    """16-bit PCM of a 220 Hz tone."""
+    count = int(seconds * sample_rate)
+    return b"".join(
+        struct.pack("<h", int(8000 * math.sin(2 * math.pi * 220 * index / sample_rate)))
+        for index in range(count)
+    )
+
+
+def _mulaw_wav(seconds: float) -> bytes:
+    """What Google returns for MULAW: 8 kHz mulaw samples in a WAV container."""
+    samples = audioop.lin2ulaw(_tone(seconds, MULAW_SAMPLE_RATE), PCM_SAMPLE_WIDTH)
+    fmt = struct.pack("<4sIHHIIHH", b"fmt ", 16, 7, 1, MULAW_SAMPLE_RATE, MULAW_SAMPLE_RATE, 1, 8)
+    body = b"WAVE" + fmt + struct.pack("<4sI", b"data", len(samples)) + samples
+    return b"RIFF" + struct.pack("<I", len(body)) + body
+
+
+def _mp3(seconds: float) -> bytes:
+    """What Google returns for MP3: a 24 kHz mono clip (encoded with ffmpeg)."""
+    from pydub import AudioSegment
+
+    segment = AudioSegment(
+        _tone(seconds, GOOGLE_MP3_SAMPLE_RATE),
+        frame_rate=GOOGLE_MP3_SAMPLE_RATE, sample_width=PCM_SAMPLE_WIDTH, channels=1,
+    )
+    return segment.export(format="mp3").read()
+
+
+class FakeTTSClient:
+    """Answers after TTS_BASE_SEC + TTS_PER_CHAR_SEC per character with a clip of matching length."""
+
+    def __init__(self, with_mp3: bool):
+        self.clips = {}
+        for text in SENTENCES:
+            seconds = len(text) * SPEECH_SEC_PER_CHAR
+            self.clips[text, texttospeech.AudioEncoding.MULAW] = _mulaw_wav(seconds)
+            if with_mp3:
+                self.clips[text, texttospeech.AudioEncoding.MP3] = _mp3(seconds)
+
+    async def synthesize_speech(self, input, voice, audio_config):
+        await asyncio.sleep(TTS_BASE_SEC + TTS_PER_CHAR_SEC * len(input.text))
+        return SimpleNamespace(audio_content=self.clips[input.text, audio_config.audio_encoding])
+
+
+async def _legacy_first_frame(text: str) -> list[dict]:
+    mp3_bytes = await tts_service._synthesize(text, "en", MP3)
+    mulaw_audio = await asyncio.to_thread(legacy_mp3_to_mulaw, mp3_bytes)
+    return build_media_message("MZbench", mulaw_audio, include_mark=False)
+
+
+async def _direct_first_frame(text: str) -> list[dict]:
+    mulaw_audio = await synthesize_speech_mulaw(text, language="en")
+    return build_media_message("MZbench", mulaw_audio, include_mark=False)
+
+
+def _first_frame_ms(first_frame, text: str) -> float:
+    async def run() -> float:
+        start = time.perf_counter()
+        messages = await first_frame(text)
+        assert messages[0]["event"] == "media"
+        return (time.perf_counter() - start) * 1000
+
+    return statistics.median(asyncio.run(run()) for _ in range(RUNS))
+
+
+def _conversion_ms(convert, clip: bytes, number: int) -> float:
+    return timeit.timeit(lambda: convert(clip), number=number) / number * 1000
+
+
+def main() -> None:
+    has_ffmpeg = all(shutil.which(tool) for tool in ("ffmpeg", "ffprobe"))
+    tts_service.settings.tts_cache_enabled = False
+    tts_service.tts_engine._client = client = FakeTTSClient(with_mp3=has_ffmpeg)
+    tts_service.tts_provider = ResilientProvider("google_tts_bench", timeout_sec=10.0)
+
+    print("per-clip conversion CPU time")
+    for text in SENTENCES:
+        seconds = len(text) * SPEECH_SEC_PER_CHAR
+        line = f"  {seconds:4.1f} s clip: strip_wav_header "
+        line += f"{_conversion_ms(strip_wav_header, client.clips[text, texttospeech.AudioEncoding.MULAW], 10_000):8.4f} ms"
+        if has_ffmpeg:
+            mp3_clip = client.clips[text, texttospeech.AudioEncoding.MP3]
+            line += f", legacy mp3_to_mulaw {_conversion_ms(legacy_mp3_to_mulaw, mp3_clip, 5):8.2f} ms"
+        print(line)
+
+    print(f"time to first frame (fake TTS {TTS_BASE_SEC * 1000:.0f} ms + {TTS_PER_CHAR_SEC * 1000} ms/char, median of {RUNS})")
+    for text in SENTENCES:
+        line = f"  {len(text):3} chars: direct mulaw {_first_frame_ms(_direct_first_frame, text):7.1f} ms"
+        if has_ffmpeg:
+            line += f", legacy MP3 path {_first_frame_ms(_legacy_first_frame, text):7.1f} ms"
+        print(line)
+
+    if not has_ffmpeg:
+        print("legacy MP3 -> mulaw path skipped: ffmpeg/ffprobe are not installed")
+
+
+if __name__ == "__main__":
+    main()
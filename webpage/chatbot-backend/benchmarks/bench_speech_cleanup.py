@@ -0,0 +1,34 @@
+"""Per-call cost of clean_text_for_speech.
+
+Compares the sequential re.sub implementation it replaced with the guarded
+step table, uncached and through its LRU cache, over the prompt and FAQ
+strings of the golden corpus in tests/test_speech_cleanup.py.
+
+Run from webpage/chatbot-backend:
+    python -m benchmarks.bench_speech_cleanup
+"""
+
+import timeit
+
+from app.services.tts_service import clean_text_for_speech
+from tests.test_speech_cleanup import FUZZ_CASES, _golden_corpus, legacy_clean_text_for_speech
+
+
+def _microseconds(cleaner, corpus: list[str], number: int = 20) -> float:
+    seconds = timeit.timeit(lambda: [cleaner(text) for text in corpus], number=number)
+    return seconds / number / len(corpus) * 1e6
+
+
+def main() -> None:
+    replies = _golden_corpus()[:-FUZZ_CASES]
+    print(f"{len(replies)} replies")
+    for name, cleaner in (
+        ("legacy", legacy_clean_text_for_speech),
+        ("uncached", clean_text_for_speech.__wrapped__),
+        ("cached", clean_text_for_speech),
+    ):
+        print(f"{name:9} {_microseconds(cleaner, replies):7.2f} us/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""Latency, real-time factor and language accuracy of the STT backends.
+
+Runs every clip of a labelled corpus through WhisperAPIBackend and
+LocalWhisperBackend (language detection on, as for "auto" uploads) and
+prints per-backend latency percentiles, real-time factor (processing time /
+audio duration) and language-identification accuracy, overall and per
+language. The corpus is a directory with one subdirectory per language:
+
+    clips/
+      ta/  *.webm, *.ogg, *.wav, *.mp3, *.m4a
+      hi/  ...
+      en/  ...
+
+A backend is skipped when it cannot run here: whisper_api needs
+OPENAI_API_KEY, local_whisper needs the optional faster-whisper package
+(model load time is excluded from its latencies). --preprocess sends each
+clip through prepare_for_stt first, as /api/voice does.
+
+Run from webpage/chatbot-backend:
+    python -m benchmarks.bench_stt_backends path/to/clips
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import mimetypes
+import statistics
+import time
+from pathlib import Path
+
+from app.core.config import get_settings
+from app.services.audio_preprocessor import AudioRejected, prepare_for_stt
+from app.services.client_registry import clients
+from app.services.stt_backends import SUPPORTED_LANGUAGES, LocalWhisperBackend, STTBackend, WhisperAPIBackend
+
+AUDIO_SUFFIXES = {".webm": "audio/webm", ".ogg": "audio/ogg", ".wav": "audio/wav", ".mp3": "audio/mpeg", ".m4a": "audio/mp4"}
+
+
+def load_corpus(root: Path) -> list[tuple[str, Path]]:
+    """(expected language, clip path) for every clip under root/<language>/."""
+    corpus = []
+    for language in SUPPORTED_LANGUAGES:
+        directory = root / language
+        if directory.is_dir():
+            corpus.extend(
+                (language, path) for path in sorted(directory.iterdir())
+                if path.suffix.lower() in AUDIO_SUFFIXES
+            )
+    return corpus
+
+
+def skip_reason(name: str) -> str | None:
+    """Why a backend cannot run in this environment, or None."""
+    if name == WhisperAPIBackend.name and not get_settings().openai_api_key:
+        return "OPENAI_API_KEY is not set"
+    if name == LocalWhisperBackend.name and importlib.util.find_spec("faster_whisper") is None:
+        return "faster-whisper is not installed"
+    return None
+
+
+async def _clip_input(path: Path, preprocess: bool) -> tuple[bytes, str, str] | None:
+    """(audio, filename, content type) to send for one clip, or None if preprocessing rejects it."""
+    content_type = AUDIO_SUFFIXES.get(path.suffix.lower()) or mimetypes.guess_type(path.name)[0]
+    audio = path.read_bytes()
+    if not preprocess:
+        return audio, path.name, content_type
+    try:
+        prepared = await prepare_for_stt(audio, content_type)
+    except AudioRejected:
+        return None
+    extension = mimetypes.guess_extension(prepared.content_type) or path.suffix
+    return prepared.content, f"{path.stem}{extension}", prepared.content_type
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def run_backend(backend: STTBackend, corpus: list[tuple[str, Path]], preprocess: bool) -> None:
+    await backend.start()
+    latencies_ms, audio_sec, processing_sec = [], 0.0, 0.0
+    correct: dict[str, list[bool]] = {language: [] for language in SUPPORTED_LANGUAGES}
+    failures = skipped = 0
+    try:
+        for expected, path in corpus:
+            clip = await _clip_input(path, preprocess)
+            if clip is None:
+                skipped += 1
+                continue
+            start = time.perf_counter()
+            try:
+                result = await backend.transcribe(*clip)
+            except Exception as e:
+                failures += 1
+                print(f"  {path.name}: failed ({e})")
+                continue
+            elapsed = time.perf_counter() - start
+            latencies_ms.append(elapsed * 1000)
+            processing_sec += elapsed
+            audio_sec += result["duration"]
+            correct[expected].append(result["language"] == expected)
+    finally:
+        await backend.close()
+
+    print(f"{backend.name}: {len(latencies_ms)} clips, {failures} failed, {skipped} rejected by preprocessing")
+    if not latencies_ms:
+        return
+    print(
+        f"  latency p50 {_percentile(latencies_ms, 0.50):7.0f} ms, "
+        f"p95 {_percentile(latencies_ms, 0.95):7.0f} ms, "
+        f"mean {statistics.fmean(latencies_ms):7.0f} ms"
+    )
+    if audio_sec:
+        print(f"  real-time factor {processing_sec / audio_sec:.3f} ({audio_sec:.1f} s of audio)")
+    scored = [hit for hits in correct.values() for hit in hits]
+    per_language = ", ".join(
+        f"{language} {sum(hits)}/{len(hits)}" for language, hits in correct.items() if hits
+    )
+    print(f"  language accuracy {sum(scored)}/{len(scored)} ({per_language})")
+
+
+async def main(root: Path, names: list[str], preprocess: bool) -> None:
+    corpus = load_corpus(root)
+    if not corpus:
+        raise SystemExit(f"No clips under {root}/{{{','.join(SUPPORTED_LANGUAGES)}}}/")
+    print(f"{len(corpus)} clips from {root}")
+
+    backends = {backend.name: backend for backend in (WhisperAPIBackend, LocalWhisperBackend)}
+    try:
+        for name in names:
+            reason = skip_reason(name)
+            if reason:
+                print(f"{name}: skipped, {reason}")
+                continue
+            await run_backend(backends[name](), corpus, preprocess)
+    finally:
+        await clients.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("clips", type=Path, help="directory with ta/, hi/ and en/ subdirectories of clips")
+    parser.add_argument(
+        "--backends", nargs="+", default=[WhisperAPIBackend.name, LocalWhisperBackend.name],
+        choices=[WhisperAPIBackend.name, LocalWhisperBackend.name],
+    )
+    parser.add_argument("--preprocess", action="store_true", help="run prepare_for_stt on each clip first")
+    args = parser.parse_args()
+    asyncio.run(main(args.clips, args.backends, args.preprocess))
@@ -0,0 +1,15 @@
+"""Shared test setup.
+
+Settings are read at import time, so audio files and the TTS disk cache are
+pointed at a temporary directory before any app module is imported.
+"""
+
+import os
+import sys
+import tempfile
+
+_TMP_DIR = tempfile.mkdtemp(prefix="chatbot-tests-")
+os.environ.setdefault("AUDIO_TEMP_DIR", os.path.join(_TMP_DIR, "audio"))
+os.environ.setdefault("TTS_CACHE_DIR", os.path.join(_TMP_DIR, "tts_cache"))
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,272 @@
+import audioop
+import io
+import random
+import struct
+import wave
+
+import pytest
+
+from app.services.audio_converter import (
+    MULAW_SAMPLE_RATE,
+    OPUS_GRANULE_RATE,
+    PCM_SAMPLE_WIDTH,
+    OggOpusJoiner,
+    _ogg_crc,
+    _wav_header,
+    join_mp3,
+    join_ogg_opus,
+    mp3_duration_sec,
+    mulaw_to_wav,
+    ogg_opus_duration_sec,
+    strip_wav_header,
+)
+
+
+def _legacy_wav_header(data_size: int, sample_rate: int, num_channels: int = 1) -> bytes:
+    """The header mulaw_to_wav wrote field by field into a BytesIO before it was packed in one call."""
+    buffer = io.BytesIO()
+    buffer.write(b"RIFF")
+    buffer.write(struct.pack("<I", 36 + data_size))
+    buffer.write(b"WAVE")
+    buffer.write(b"fmt ")
+    buffer.write(struct.pack("<I", 16))
+    buffer.write(struct.pack("<H", 1))
+    buffer.write(struct.pack("<H", num_channels))
+    buffer.write(struct.pack("<I", sample_rate))
+    buffer.write(struct.pack("<I", sample_rate * num_channels * PCM_SAMPLE_WIDTH))
+    buffer.write(struct.pack("<H", num_channels * PCM_SAMPLE_WIDTH))
+    buffer.write(struct.pack("<H", PCM_SAMPLE_WIDTH * 8))
+    buffer.write(b"data")
+    buffer.write(struct.pack("<I", data_size))
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize("data_size", [0, 2, 320, 160000, 2**31])
+@pytest.mark.parametrize("sample_rate", [8000, 16000, 24000, 48000])
+@pytest.mark.parametrize("num_channels", [1, 2])
+def test_wav_header_matches_the_legacy_header(data_size, sample_rate, num_channels):
+    header = _wav_header(data_size, sample_rate, num_channels)
+    assert len(header) == 44
+    assert header == _legacy_wav_header(data_size, sample_rate, num_channels)
+
+
+def test_mulaw_to_wav_is_a_valid_wav():
+    mulaw = bytes(range(256)) * 10
+    wav_bytes = mulaw_to_wav([mulaw[:1000], mulaw[1000:]])
+
+    with wave.open(io.BytesIO(wav_bytes)) as wav:
+        assert wav.getnchannels() == 1
+        assert wav.getsampwidth() == PCM_SAMPLE_WIDTH
+        assert wav.getframerate() == MULAW_SAMPLE_RATE
+        assert wav.readframes(wav.getnframes()) == audioop.ulaw2lin(mulaw, PCM_SAMPLE_WIDTH)
+
+
+def test_mulaw_to_wav_rejects_empty_audio():
+    with pytest.raises(ValueError):
+        mulaw_to_wav([b"", b""])
+
+
+def test_strip_wav_header_returns_the_samples():
+    samples = bytes(range(200))
+    assert strip_wav_header(_wav_header(len(samples), 8000) + samples) == samples
+    # Not a WAV file: unchanged
+    assert strip_wav_header(samples) == samples
+
+
+def test_strip_wav_header_skips_extra_chunks():
+    samples = b"\x7f" * 64
+    fmt = _wav_header(len(samples), 8000)[12:36]
+    odd_chunk = b"LIST" + struct.pack("<I", 3) + b"abc\x00"  # word-aligned padding byte
+    body = b"WAVE" + fmt + odd_chunk + b"data" + struct.pack("<I", len(samples)) + samples
+    assert strip_wav_header(b"RIFF" + struct.pack("<I", len(body)) + body) == samples
+
+
+# MPEG-1 Layer III, 128 kbps, 44.1 kHz, no padding: 417-byte frames of 1152 samples
+MP3_FRAME_HEADER = b"\xff\xfb\x90\x00"
+MP3_FRAME_LENGTH = 417
+MP3_FRAME_SEC = 1152 / 44100
+
+
+def _mp3_frame(fill: int, body: bytes = b"") -> bytes:
+    payload = body + bytes([fill]) * (MP3_FRAME_LENGTH - 4 - len(body))
+    return MP3_FRAME_HEADER + payload
+
+
+def _id3v2(payload: bytes) -> bytes:
+    size = len(payload)
+    synchsafe = bytes((size >> shift) & 0x7F for shift in (21, 14, 7, 0))
+    return b"ID3\x04\x00\x00" + synchsafe + payload
+
+
+def _mp3_clip(frames: list[bytes], tagged: bool = True) -> bytes:
+    """A clip as Google TTS might return it: ID3v2 tag, Xing header frame, audio frames, ID3v1 tag."""
+    if not tagged:
+        return b"".join(frames)
+    xing = _mp3_frame(0, b"\x00" * 32 + b"Xing" + struct.pack(">II", 1, len(frames)))
+    id3v1 = b"TAG" + b"\x00" * 125
+    return _id3v2(b"TIT2" + b"\x00" * 40) + xing + b"".join(frames) + id3v1
+
+
+def test_join_mp3_keeps_only_the_audio_frames():
+    first = [_mp3_frame(1), _mp3_frame(2)]
+    second = [_mp3_frame(3), _mp3_frame(4), _mp3_frame(5)]
+
+    joined = join_mp3([_mp3_clip(first), _mp3_clip(second)])
+
+    assert joined == b"".join(first + second)
+    assert mp3_duration_sec(joined) == pytest.approx(5 * MP3_FRAME_SEC)
+
+
+def test_join_mp3_of_untagged_clips_is_plain_concatenation():
+    clips = [_mp3_clip([_mp3_frame(index)], tagged=False) for index in range(3)]
+    assert join_mp3(clips) == b"".join(clips)
+
+
+def test_join_mp3_of_one_clip_is_unchanged():
+    clip = _mp3_clip([_mp3_frame(1)])
+    assert join_mp3([clip]) is clip
+
+
+@pytest.mark.parametrize("frames", [0, 1, 7])
+def test_mp3_duration_skips_tags_and_header_frame(frames):
+    clip = _mp3_clip([_mp3_frame(index) for index in range(frames)])
+    assert mp3_duration_sec(clip) == pytest.approx(frames * MP3_FRAME_SEC)
+
+
+def test_mp3_duration_stops_at_garbage():
+    assert mp3_duration_sec(_mp3_frame(1) + b"not a frame" + _mp3_frame(2)) == pytest.approx(MP3_FRAME_SEC)
+
+
+def _reference_ogg_crc(data: bytes) -> int:
+    """Bitwise CRC-32 as RFC 3533 specifies it (poly 0x04C11DB7, unreflected, zero init)."""
+    crc = 0
+    for byte in data:
+        crc ^= byte << 24
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x04C11DB7) if crc & 0x80000000 else crc << 1
+            crc &= 0xFFFFFFFF
+    return crc
+
+
+def _ogg_page(serial: int, sequence: int, granule: int, packet: bytes, header_type: int = 0) -> bytes:
+    """One page holding one packet (under 255 bytes), with a valid checksum."""
+    assert len(packet) < 255
+    page = bytearray(struct.pack(
+        "<4sBBqIIIB", b"OggS", 0, header_type, granule, serial, sequence, 0, 1,
+    ) + bytes([len(packet)]) + packet)
+    struct.pack_into("<I", page, 22, _reference_ogg_crc(page))
+    return bytes(page)
+
+
+OPUS_PRE_SKIP = 312
+OPUS_FRAME_SAMPLES = 960  # 20 ms at 48 kHz
+
+
+def _opus_clip(serial: int, packets: list[bytes]) -> bytes:
+    """An Ogg Opus file as Google TTS returns it: OpusHead, OpusTags, then one audio packet per page."""
+    head = b"OpusHead" + struct.pack("<BBHIhB", 1, 1, OPUS_PRE_SKIP, 24000, 0, 0)
+    tags = b"OpusTags" + struct.pack("<I", 6) + b"Google" + struct.pack("<I", 0)
+    pages = [_ogg_page(serial, 0, 0, head, 0x02), _ogg_page(serial, 1, 0, tags)]
+    for index, packet in enumerate(packets):
+        last = index == len(packets) - 1
+        granule = OPUS_PRE_SKIP + (index + 1) * OPUS_FRAME_SAMPLES
+        pages.append(_ogg_page(serial, index + 2, granule, packet, 0x04 if last else 0))
+    return b"".join(pages)
+
+
+def _parse_ogg(data: bytes) -> list[dict]:
+    pages = []
+    offset = 0
+    while offset < len(data):
+        capture, version, header_type, granule, serial, sequence, crc, segments = struct.unpack_from(
+            "<4sBBqIIIB", data, offset,
+        )
+        table = data[offset + 27:offset + 27 + segments]
+        end = offset + 27 + segments + sum(table)
+        unsummed = bytearray(data[offset:end])
+        unsummed[22:26] = b"\x00" * 4
+        pages.append({
+            "capture": capture, "version": version, "header_type": header_type,
+            "granule": granule, "serial": serial, "sequence": sequence,
+            "crc_ok": crc == _reference_ogg_crc(bytes(unsummed)),
+            "body": data[offset + 27 + segments:end],
+        })
+        offset = end
+    return pages
+
+
+def test_ogg_crc_check_value():
+    assert _ogg_crc(b"123456789") == 0x89A1897F
+    assert _ogg_crc(b"") == 0
+
+
+def test_ogg_crc_matches_the_bitwise_reference():
+    rng = random.Random(7)
+    for length in (1, 27, 255, 4096):
+        data = bytes(rng.randrange(256) for _ in range(length))
+        assert _ogg_crc(data) == _reference_ogg_crc(data)
+
+
+def _three_clips() -> list[tuple[int, list[bytes]]]:
+    return [
+        (0x1111, [b"a1", b"a2", b"a3"]),
+        (0x2222, [b"b1", b"b2"]),
+        (0x3333, [b"c1", b"c2", b"c3", b"c4"]),
+    ]
+
+
+def test_join_ogg_opus_is_one_valid_logical_stream():
+    clips = _three_clips()
+    joined = join_ogg_opus([_opus_clip(serial, packets) for serial, packets in clips])
+    pages = _parse_ogg(joined)
+
+    assert all(page["capture"] == b"OggS" and page["version"] == 0 for page in pages)
+    assert all(page["crc_ok"] for page in pages)
+    # One serial (the first clip's), pages numbered without gaps
+    assert {page["serial"] for page in pages} == {0x1111}
+    assert [page["sequence"] for page in pages] == list(range(len(pages)))
+    # Begin-of-stream only on the first page, end-of-stream only on the last
+    assert [bool(page["header_type"] & 0x02) for page in pages] == [True] + [False] * (len(pages) - 1)
+    assert [bool(page["header_type"] & 0x04) for page in pages] == [False] * (len(pages) - 1) + [True]
+    # Only the first clip's header pages, then every audio packet in order
+    bodies = [page["body"] for page in pages]
+    assert bodies[0].startswith(b"OpusHead") and bodies[1].startswith(b"OpusTags")
+    assert sum(body.startswith((b"OpusHead", b"OpusTags")) for body in bodies) == 2
+    assert bodies[2:] == [packet for _, packets in clips for packet in packets]
+
+
+def test_join_ogg_opus_granule_positions_run_on():
+    clips = _three_clips()
+    joined = join_ogg_opus([_opus_clip(serial, packets) for serial, packets in clips])
+    granules = [page["granule"] for page in _parse_ogg(joined)][2:]
+
+    expected = []
+    offset = 0
+    for _, packets in clips:
+        clip_granules = [OPUS_PRE_SKIP + (index + 1) * OPUS_FRAME_SAMPLES for index in range(len(packets))]
+        expected.extend(granule + offset for granule in clip_granules)
+        offset += clip_granules[-1]
+    assert granules == expected
+    assert granules == sorted(granules)
+
+    # Later clips' pre-skip samples are played, only the first clip's is skipped
+    ends = [OPUS_PRE_SKIP + len(packets) * OPUS_FRAME_SAMPLES for _, packets in clips]
+    assert ogg_opus_duration_sec(joined) == pytest.approx((sum(ends) - OPUS_PRE_SKIP) / OPUS_GRANULE_RATE)
+
+
+def test_ogg_opus_joiner_appends_incrementally():
+    clips = [_opus_clip(serial, packets) for serial, packets in _three_clips()]
+    joiner = OggOpusJoiner()
+    pieces = [joiner.append(clip, last=index == len(clips) - 1) for index, clip in enumerate(clips)]
+
+    assert b"".join(pieces) == join_ogg_opus(clips)
+    # The first piece is playable on its own: it carries the stream's headers
+    first = _parse_ogg(pieces[0])
+    assert first[0]["body"].startswith(b"OpusHead")
+    assert [page["sequence"] for page in _parse_ogg(pieces[1])][0] == len(first)
+
+
+def test_join_ogg_opus_of_one_clip_is_unchanged():
+    clip = _opus_clip(0x1111, [b"a1"])
+    assert join_ogg_opus([clip]) is clip
+    assert ogg_opus_duration_sec(clip) == pytest.approx(OPUS_FRAME_SAMPLES / OPUS_GRANULE_RATE)
@@ -0,0 +1,164 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.routers import voice
+from app.services import audio_stream
+from app.services.audio_stream import AudioStreamStore
+
+
+class FakeSpeech:
+    """Stands in for tts_service.stream_speech: yields scripted pieces, then optionally fails.
+
+    Replies whose text is in `held` stay unfinished until `release` is set.
+    """
+
+    def __init__(self, pieces: list[bytes], error: Exception | None = None, delay: float = 0.0):
+        self.pieces = pieces
+        self.error = error
+        self.delay = delay
+        self.held: set[str] = set()
+        self.release = asyncio.Event()
+
+    async def __call__(self, text, language, encoding):
+        for piece in self.pieces:
+            await asyncio.sleep(self.delay)
+            yield piece
+        if text in self.held:
+            await self.release.wait()
+        if self.error is not None:
+            raise self.error
+
+
+@pytest.fixture
+def speech(monkeypatch):
+    def install(*args, **kwargs) -> FakeSpeech:
+        fake = FakeSpeech(*args, **kwargs)
+        monkeypatch.setattr(audio_stream, "stream_speech", fake)
+        return fake
+
+    return install
+
+
+async def _read_all(stream) -> bytes:
+    return b"".join([piece async for piece in stream.read()])
+
+
+def test_store_evicts_the_oldest_finished_streams(speech):
+    fake = speech([b"a"])
+
+    async def run():
+        store = AudioStreamStore(ttl_sec=60, max_entries=3)
+        fake.held.add("live")
+        live = store.start("live", "en")
+        finished = [store.start(f"done {index}", "en") for index in range(2)]
+        await asyncio.sleep(0.01)
+
+        newest = store.start("newest", "en")
+        await asyncio.sleep(0.01)
+        kept = [stream_id for stream_id in (live, *finished, newest) if store.get(stream_id)]
+        fake.release.set()
+        return store, kept, [live, finished[1], newest]
+
+    store, kept, expected = asyncio.run(run())
+    assert kept == expected
+    assert store.stats()["evicted"] == 1
+    assert store.stats()["retained"] == 3
+
+
+def test_store_keeps_live_streams_past_the_limit(speech):
+    fake = speech([b"a"])
+    fake.held.update(f"reply {index}" for index in range(3))
+
+    async def run():
+        store = AudioStreamStore(ttl_sec=60, max_entries=2)
+        ids = [store.start(f"reply {index}", "en") for index in range(3)]
+        await asyncio.sleep(0)
+        retained = [stream_id for stream_id in ids if store.get(stream_id)]
+        store.clear()
+        return store, ids, retained
+
+    store, ids, retained = asyncio.run(run())
+    assert retained == ids
+    assert store.evicted == 0
+
+
+def test_wait_for_audio(speech):
+    async def run(fake_args) -> tuple[bool, bytes]:
+        speech(*fake_args)
+        store = AudioStreamStore(ttl_sec=60, max_entries=8)
+        stream = store.get(store.start("reply", "en"))
+        return await stream.wait_for_audio(), await _read_all(stream)
+
+    assert asyncio.run(run(([b"a", b"b"], None, 0.01))) == (True, b"ab")
+    assert asyncio.run(run(([], RuntimeError("TTS down")))) == (False, b"")
+    # A failure after the first piece cannot change the response any more
+    assert asyncio.run(run(([b"a"], RuntimeError("TTS down")))) == (True, b"a")
+
+
+def test_audio_stream_endpoint_returns_502_when_synthesis_fails(speech, monkeypatch):
+    speech([], RuntimeError("TTS down"), delay=0.01)
+
+    async def run():
+        store = AudioStreamStore(ttl_sec=60, max_entries=8)
+        monkeypatch.setattr(voice, "audio_streams", store)
+        with pytest.raises(HTTPException) as failed:
+            await voice.get_audio_stream(store.start("reply", "en"))
+        with pytest.raises(HTTPException) as missing:
+            await voice.get_audio_stream("unknown")
+        return failed.value, missing.value
+
+    failed, missing = asyncio.run(run())
+    assert failed.status_code == 502
+    assert missing.status_code == 404
+
+
+def test_audio_stream_cancelled_before_its_first_piece_fails(speech, monkeypatch):
+    fake = speech([])
+    fake.held.add("reply")
+
+    async def run():
+        store = AudioStreamStore(ttl_sec=60, max_entries=8)
+        monkeypatch.setattr(voice, "audio_streams", store)
+        stream = store.get(store.start("reply", "en"))
+        await asyncio.sleep(0)
+        stream.cancel()
+        with pytest.raises(HTTPException) as failed:
+            await voice.get_audio_stream(stream.stream_id)
+        return stream, store, failed.value
+
+    stream, store, failed = asyncio.run(run())
+    assert isinstance(stream.error, asyncio.CancelledError)
+    assert failed.status_code == 502
+    assert store.stats()["failed"] == 1
+
+
+def test_audio_stream_endpoint_streams_the_audio(speech, monkeypatch):
+    speech([b"first", b"second"], delay=0.01)
+
+    async def run():
+        store = AudioStreamStore(ttl_sec=60, max_entries=8)
+        monkeypatch.setattr(voice, "audio_streams", store)
+        response = await voice.get_audio_stream(store.start("reply", "en"))
+        return response, b"".join([chunk async for chunk in response.body_iterator])
+
+    response, body = asyncio.run(run())
+    assert response.status_code == 200
+    assert response.media_type == "audio/mpeg"
+    assert body == b"firstsecond"
+
+
+def test_check_audio_stream_reports_a_failed_stream(speech, monkeypatch):
+    async def run(fake_args):
+        speech(*fake_args)
+        store = AudioStreamStore(ttl_sec=60, max_entries=8)
+        monkeypatch.setattr(voice, "audio_streams", store)
+        await voice._check_audio_stream(f"{voice.AUDIO_STREAM_PATH}{store.start('reply', 'en')}")
+
+    asyncio.run(run(([b"audio"],)))
+    with pytest.raises(HTTPException) as failed:
+        asyncio.run(run(([], RuntimeError("TTS down"))))
+    assert failed.value.status_code == 502
+    # Files (non-streamed replies, small talk) are not checked
+    asyncio.run(voice._check_audio_stream("/api/audio/greeting_en.ogg"))
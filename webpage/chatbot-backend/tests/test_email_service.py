@@ -0,0 +1,70 @@
+import pytest
+
+from app.core.prompts import FAQ_LEAD_PROMPT
+from app.services.email_service import asks_for_lead_field, extract_lead_data, lead_safe_length
+
+
+def _history(assistant_message: str) -> list[dict]:
+    return [
+        {"role": "user", "content": "Tell me about your services"},
+        {"role": "assistant", "content": assistant_message},
+    ]
+
+
+@pytest.mark.parametrize("message", [
+    "We build custom chatbots. May I have your name?",
+    "Thanks, Ravi! What is your mobile number?",
+    "Great. Could you share your email address?",
+    "Got it.\nWhat is your requirement?",
+    "Thanks!\n\nWhat's your email? ",
+    "உங்கள் மொபைல் எண்ணைப் பகிரவும்.",
+    "உங்கள் பெயர் என்ன",
+    "आपका ईमेल क्या है",
+    "कृपया अपना मोबाइल नंबर बताइए।",
+    *FAQ_LEAD_PROMPT.values(),
+])
+def test_detects_a_lead_field_question(message):
+    assert asks_for_lead_field(_history(message))
+
+
+@pytest.mark.parametrize("message", [
+    "You can reach us at:\nEmail: info@vmkdxailabs.com\nPhone: +91-7824030723",
+    "Our team will email you the proposal by Monday.",
+    "What is your name? Thanks, we will be in touch.",
+    "Which of our services are you interested in?",
+    "Do you need a chatbot or a voice agent?",
+    "மின்னஞ்சல்: info@vmkdxailabs.com",
+    "हमारा ईमेल info@vmkdxailabs.com है।",
+    "",
+])
+def test_ignores_replies_that_only_mention_contact_details(message):
+    assert not asks_for_lead_field(_history(message))
+
+
+def test_only_the_last_assistant_message_counts():
+    history = [
+        {"role": "assistant", "content": "May I have your name?"},
+        {"role": "user", "content": "Ravi"},
+        {"role": "assistant", "content": "Thanks Ravi, we will call you soon."},
+        {"role": "user", "content": "ok"},
+    ]
+    assert not asks_for_lead_field(history)
+    assert not asks_for_lead_field([])
+
+
+def test_lead_marker_is_ignored_when_reading_the_question():
+    message = 'Thanks! May I have your email?\n|||LEAD_DATA|||{"name": "x"}|||END_LEAD_DATA|||'
+    assert asks_for_lead_field(_history(message))
+
+
+def test_extract_lead_data_requires_every_field():
+    complete = '|||LEAD_DATA|||{"name": "Ravi", "mobile": "98765", "email": "r@x.io", "requirement": "bot"}|||END_LEAD_DATA|||'
+    partial = '|||LEAD_DATA|||{"name": "Ravi", "mobile": "", "email": "r@x.io", "requirement": "bot"}|||END_LEAD_DATA|||'
+    assert extract_lead_data(complete)["name"] == "Ravi"
+    assert extract_lead_data(partial) is None
+
+
+def test_lead_safe_length_holds_back_a_partial_marker():
+    assert lead_safe_length("Thanks Ravi!") == len("Thanks Ravi!")
+    assert lead_safe_length("Thanks Ravi! ||") == len("Thanks Ravi! ")
+    assert lead_safe_length("Thanks |||LEAD_DATA|||{") == len("Thanks ")
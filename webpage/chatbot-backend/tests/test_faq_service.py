@@ -0,0 +1,77 @@
+import pytest
+
+from app.core.prompts import FAQ_ENTRIES, FAQ_LEAD_PROMPT
+from app.services.faq_service import FAQIndex, answer_from_faq
+
+# Queries the FAQ fast path must answer, with the entry they belong to
+FAQ_QUERIES = [
+    ("what services do you offer", "services"),
+    ("Services?", "services"),
+    ("உங்கள் சேவைகள் என்னென்ன?", "services"),
+    ("aap kya services dete ho", "services"),
+    ("where are you located", "location"),
+    ("where is your office located", "location"),
+    ("unga office enga irukku", "location"),
+    ("aap kahan ho", "location"),
+    ("What is VMKD X AI LABS?", "what_is_vmkd"),
+    ("Who are you", "what_is_vmkd"),
+    ("how can i contact you", "contact"),
+    ("how much does it cost", "pricing"),
+    ("price enna", "pricing"),
+    ("आपकी कीमत क्या है", "pricing"),
+    ("kitna cost hoga", "pricing"),
+    ("can i book a demo please", "consultation"),
+    ("How do I book a consultation", "consultation"),
+    ("which industries do you serve", "industries"),
+    ("what technologies do you use", "technologies"),
+    ("tech stack?", "technologies"),
+]
+
+# Close to an FAQ question, but qualified so that the canned answer would not
+# answer it (or not about the company at all): the LLM must handle these
+LLM_QUERIES = [
+    "do you offer services in USA",
+    "do you offer services in Dubai?",
+    "where are you located in Chennai",
+    "where is your office in Madurai",
+    "what services do you offer for hospitals",
+    "what is the price of a website",
+    "do you work with hospitals",
+    "I need a chatbot for my restaurant",
+    "my email is anand@example.com",
+    "my number is 9876543210",
+]
+
+
+@pytest.fixture(scope="module")
+def index():
+    return FAQIndex(FAQ_ENTRIES, threshold=0.65)
+
+
+@pytest.mark.parametrize("query,key", FAQ_QUERIES)
+def test_faq_queries_match_their_entry(index, query, key):
+    result = index.match(query)
+    assert result is not None
+    assert result[0] == key
+
+
+@pytest.mark.parametrize("query", LLM_QUERIES)
+def test_qualified_queries_go_to_the_llm(index, query):
+    assert index.match(query) is None
+
+
+def test_uncovered_words_names_the_qualifier(index):
+    assert index.uncovered_words("do you offer services in Dubai?", "services") == ["dubai"]
+    # Inflections of an entry's words are covered
+    assert index.uncovered_words("which service do you provide", "services") == []
+    assert index.uncovered_words("சேவை", "services") == []
+
+
+def test_answer_from_faq_adds_the_lead_prompt_on_the_first_answer():
+    reply = answer_from_faq("where are you located", [], "en")
+    assert reply.startswith(FAQ_ENTRIES["location"]["answer"])
+    assert reply.endswith(FAQ_LEAD_PROMPT["en"])
+
+    history = [{"role": "user", "content": "hi"}, {"role": "assistant", "content": "Hello! How can I help?"}]
+    assert answer_from_faq("where are you located", history, "ta") == FAQ_ENTRIES["location"]["answer_ta"]
+    assert answer_from_faq("where are you located in Chennai", history, "en") is None
@@ -0,0 +1,49 @@
+from app.services.email_service import extract_lead_from_conversation
+from app.services.history_manager import MAX_LEAD_MESSAGES, ConversationMemory
+
+
+def _long_conversation(memory: ConversationMemory) -> None:
+    memory.add_turn("I need a website for my clinic", "Sure! What is your name?")
+    memory.add_turn("My name is Ravi Kumar", "Thanks Ravi. What is your mobile number?")
+    memory.add_turn("9876543210", "And your email?")
+    for index in range(5):
+        memory.add_turn(f"what about pricing {index}", "It depends on the scope.")
+
+
+def test_lead_details_survive_the_message_cap():
+    memory = ConversationMemory(max_messages=6)
+    _long_conversation(memory)
+
+    assert extract_lead_from_conversation("ravi@example.com", memory.history()) is None
+    assert extract_lead_from_conversation("ravi@example.com", memory.lead_history()) == {
+        "name": "Ravi Kumar",
+        "mobile": "9876543210",
+        "email": "ravi@example.com",
+        "requirement": "a website for my clinic",
+    }
+
+
+def test_lead_details_survive_folding():
+    memory = ConversationMemory(max_messages=40)
+    _long_conversation(memory)
+    memory.fold(memory.messages[:8], "Ravi wants a clinic website.")
+
+    assert memory.lead_messages == [
+        "I need a website for my clinic",
+        "My name is Ravi Kumar",
+        "9876543210",
+    ]
+    assert extract_lead_from_conversation("ravi@example.com", memory.lead_history())["name"] == "Ravi Kumar"
+
+
+def test_only_the_first_and_lead_bearing_messages_are_retained():
+    memory = ConversationMemory(max_messages=2)
+    memory.add_turn("hello", "Hi!")
+    for index in range(20):
+        memory.add_turn(f"call me on 98765432{index:02d}", "Noted.")
+        memory.add_turn("ok thanks", "You're welcome.")
+
+    assert len(memory.lead_messages) == MAX_LEAD_MESSAGES
+    assert memory.lead_messages[0] == "hello"
+    assert "ok thanks" not in memory.lead_messages
+    assert memory.lead_messages[-1] == "call me on 9876543219"
@@ -0,0 +1,94 @@
+import pytest
+
+from app.services.language_id import detect_language, identify_language, language_hint_from_history
+
+# Accuracy set: native script, romanized Tamil ("Tanglish"), romanized Hindi
+# ("Hinglish") and English, as typed into the chat widget or transcribed.
+ACCURACY_CASES = [
+    ("வணக்கம், உங்கள் சேவைகள் என்ன?", "ta"),
+    ("नमस्ते, वेबसाइट की कीमत क्या है?", "hi"),
+    ("enna price irukku", "ta"),
+    ("website panna evlo aagum", "ta"),
+    ("unga services pathi sollunga", "ta"),
+    ("naan oru app venum", "ta"),
+    ("romba nandri", "ta"),
+    ("epdi contact pannalam", "ta"),
+    ("seri, naan details anupuren", "ta"),
+    ("enaku oru ecommerce website venum", "ta"),
+    ("ungaluku chatbot theriyuma", "ta"),
+    ("website banane me kitna kharcha hoga", "hi"),
+    ("aap kya services dete hain", "hi"),
+    ("mujhe ek app chahiye", "hi"),
+    ("kya aap chatbot bana sakte ho", "hi"),
+    ("theek hai, dhanyavad", "hi"),
+    ("mera naam Rahul hai", "hi"),
+    ("kitne din lagenge", "hi"),
+    ("what services do you offer", "en"),
+    ("how much does a website cost", "en"),
+    ("I need a mobile app for my shop", "en"),
+    ("my name is Karthik", "en"),
+    ("can you build a chatbot", "en"),
+    ("please share your pricing", "en"),
+    ("website price", "en"),
+    ("hello", "en"),
+    ("thanks a lot", "en"),
+    ("do you do SEO and digital marketing", "en"),
+    ("what is the timeline for an ecommerce store", "en"),
+    ("Anand, 9876543210, anand@example.com", "en"),
+    ("I want to talk to sales", "en"),
+    ("", "en"),
+]
+
+# Mixed script: any native character decides over Latin text (as before);
+# between Tamil and Devanagari the majority script wins, Tamil on a tie.
+MIXED_SCRIPT_CASES = [
+    ("website cost எவ்வளவு?", "ta"),
+    ("I need a chatbot for my shop, நன்றி", "ta"),
+    ("please call me ஆ", "ta"),
+    ("app ka price क्या है", "hi"),
+    ("मुझे website चाहिए", "hi"),
+    ("மிக்க நன்றி धन्यवाद", "ta"),
+    ("வணக்கம் नमस्ते जी आप कैसे हैं", "hi"),
+    ("க क", "ta"),
+]
+
+
+@pytest.mark.parametrize("text, expected", ACCURACY_CASES + MIXED_SCRIPT_CASES)
+def test_detect_language(text, expected):
+    assert detect_language(text) == expected
+
+
+def test_accuracy_set_is_fully_recognized():
+    correct = sum(detect_language(text) == expected for text, expected in ACCURACY_CASES)
+    assert correct == len(ACCURACY_CASES)
+
+
+@pytest.mark.parametrize("text", ["enna price irukku", "aap kya services dete hain"])
+def test_romanized_guesses_are_flagged(text):
+    guess = identify_language(text)
+    assert guess.romanized
+    assert guess.confidence >= 0.75
+
+
+def test_native_script_confidence_reflects_latin_share():
+    assert identify_language("வணக்கம்").confidence == 1.0
+    assert identify_language("website cost எவ்வளவு?").confidence < 1.0
+    assert not identify_language("வணக்கம்").romanized
+
+
+def test_english_without_function_words_is_unsure():
+    guess = identify_language("website price")
+    assert guess.language == "en"
+    assert guess.confidence == 0.5
+
+
+def test_history_hint_uses_only_a_confident_latest_user_message():
+    assert language_hint_from_history([
+        {"role": "user", "content": "enna price irukku"},
+        {"role": "assistant", "content": "Our pricing depends on the scope."},
+    ]) == "ta"
+    assert language_hint_from_history([
+        {"role": "user", "content": "நன்றி"},
+        {"role": "user", "content": "website price"},
+    ]) == "auto"
+    assert language_hint_from_history([]) == "auto"
@@ -0,0 +1,33 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app import main
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(main.settings, "metrics_token", "s3cret")
+    main.rate_limit_store.clear()
+    yield TestClient(main.app)
+    main.rate_limit_store.clear()
+
+
+def test_metrics_requires_the_token(client):
+    assert client.get("/api/metrics").status_code == 401
+    assert client.get("/api/metrics", headers={"X-Metrics-Token": "guess"}).status_code == 401
+
+    response = client.get("/api/metrics", headers={"X-Metrics-Token": "s3cret"})
+    assert response.status_code == 200
+    assert "response_cache" in response.json()
+
+
+def test_metrics_is_disabled_without_a_configured_token(client, monkeypatch):
+    monkeypatch.setattr(main.settings, "metrics_token", "")
+    assert client.get("/api/metrics", headers={"X-Metrics-Token": ""}).status_code == 404
+
+
+def test_metrics_is_rate_limited(client):
+    limit = main.RATE_LIMITS["/api/metrics"]
+    statuses = [client.get("/api/metrics").status_code for _ in range(limit + 1)]
+    assert statuses[:limit] == [401] * limit
+    assert statuses[-1] == 429
@@ -0,0 +1,222 @@
+import asyncio
+import time
+
+import httpx
+import openai
+import pytest
+from google.api_core import exceptions as google_exceptions
+
+from app.services.resilience import CircuitBreaker, CircuitOpenError, ResilientProvider, is_client_error
+
+
+class FakeUpstream:
+    """Coroutine factory that answers after a delay, or raises, and counts calls."""
+
+    def __init__(self, delays: list[float] | None = None, error: Exception | None = None):
+        self.delays = list(delays or [0.0])
+        self.error = error
+        self.calls = 0
+
+    async def __call__(self) -> str:
+        delay = self.delays[min(self.calls, len(self.delays) - 1)]
+        self.calls += 1
+        call = self.calls
+        await asyncio.sleep(delay)
+        if self.error is not None:
+            raise self.error
+        return f"reply {call}"
+
+
+async def _fallback() -> str:
+    return "fallback"
+
+
+def _provider(**kwargs) -> ResilientProvider:
+    options = {"name": "fake", "timeout_sec": 1.0, "failure_threshold": 3, "reset_sec": 0.05}
+    options.update(kwargs)
+    return ResilientProvider(**options)
+
+
+def test_deadline_times_out_to_the_fallback():
+    provider = _provider(timeout_sec=0.05)
+    upstream = FakeUpstream(delays=[1.0])
+
+    result = asyncio.run(provider.call(upstream, fallback=_fallback))
+
+    assert result == "fallback"
+    assert provider.timeouts == 1
+    assert provider.fallbacks == 1
+    assert provider.breaker.consecutive_failures == 1
+
+
+def test_deadline_raises_without_fallback():
+    provider = _provider(timeout_sec=0.05)
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(provider.call(FakeUpstream(delays=[1.0])))
+
+
+def test_hedge_fires_after_the_latency_percentile_and_can_win():
+    provider = _provider(hedge_percentile=0.95, hedge_min_samples=5)
+    for _ in range(5):
+        provider.latency.observe(20.0)
+    # First attempt stalls, the hedged second attempt answers quickly
+    upstream = FakeUpstream(delays=[0.5, 0.01])
+
+    start = time.perf_counter()
+    result = asyncio.run(provider.call(upstream))
+
+    assert result == "reply 2"
+    assert upstream.calls == 2
+    assert provider.hedges == 1
+    assert provider.hedge_wins == 1
+    assert time.perf_counter() - start < 0.3
+
+
+def test_no_hedge_until_warmed_up():
+    provider = _provider(hedge_percentile=0.95, hedge_min_samples=5)
+    upstream = FakeUpstream(delays=[0.1])
+
+    assert asyncio.run(provider.call(upstream)) == "reply 1"
+    assert upstream.calls == 1
+    assert provider.hedges == 0
+
+
+def test_breaker_opens_after_threshold_and_short_circuits():
+    provider = _provider(reset_sec=60.0)
+    failing = FakeUpstream(error=RuntimeError("boom"))
+
+    async def run():
+        for _ in range(3):
+            assert await provider.call(failing, fallback=_fallback) == "fallback"
+        assert provider.breaker.state == "open"
+        # Open circuit: upstream is not called at all
+        assert await provider.call(failing, fallback=_fallback) == "fallback"
+        with pytest.raises(CircuitOpenError):
+            await provider.call(failing)
+
+    asyncio.run(run())
+    assert failing.calls == 3
+    assert provider.short_circuits == 2
+
+
+def _openai_error(error_class, status: int) -> openai.APIStatusError:
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    return error_class("upstream said no", response=httpx.Response(status, request=request), body=None)
+
+
+CLIENT_ERRORS = [
+    _openai_error(openai.BadRequestError, 400),
+    _openai_error(openai.UnprocessableEntityError, 422),
+    google_exceptions.InvalidArgument("bad audio"),
+]
+PROVIDER_ERRORS = [
+    _openai_error(openai.RateLimitError, 429),
+    _openai_error(openai.InternalServerError, 500),
+    openai.APIConnectionError(request=httpx.Request("POST", "https://api.openai.com")),
+    google_exceptions.ServiceUnavailable("try later"),
+    google_exceptions.TooManyRequests("slow down"),
+    asyncio.TimeoutError(),
+    RuntimeError("boom"),
+]
+
+
+@pytest.mark.parametrize("error", CLIENT_ERRORS + PROVIDER_ERRORS, ids=repr)
+def test_is_client_error(error):
+    assert is_client_error(error) == (error in CLIENT_ERRORS)
+
+
+@pytest.mark.parametrize("error", CLIENT_ERRORS, ids=repr)
+def test_client_errors_skip_the_breaker_and_the_fallback(error):
+    provider = _provider(reset_sec=60.0)
+    rejected = FakeUpstream(error=error)
+
+    async def run():
+        for _ in range(5):
+            with pytest.raises(type(error)):
+                await provider.call(rejected, fallback=_fallback)
+        # Healthy traffic still goes upstream
+        return await provider.call(FakeUpstream())
+
+    assert asyncio.run(run()) == "reply 1"
+    assert provider.breaker.state == "closed"
+    assert provider.breaker.consecutive_failures == 0
+    assert provider.fallbacks == 0
+    assert provider.failures == 0
+    assert provider.client_errors == 5
+
+
+def test_client_error_on_a_probe_lets_the_next_probe_through():
+    provider = _provider()
+
+    async def run():
+        for _ in range(3):
+            await provider.call(FakeUpstream(error=RuntimeError("boom")), fallback=_fallback)
+        await asyncio.sleep(0.06)
+        with pytest.raises(google_exceptions.InvalidArgument):
+            await provider.call(FakeUpstream(error=CLIENT_ERRORS[-1]))
+        return await provider.call(FakeUpstream())
+
+    assert asyncio.run(run()) == "reply 1"
+    assert provider.breaker.state == "closed"
+
+
+def test_half_open_lets_a_single_probe_through():
+    provider = _provider()
+    provider.breaker.opened_at = time.monotonic() - 1.0
+    assert provider.breaker.state == "half_open"
+    upstream = FakeUpstream(delays=[0.05])
+
+    async def run():
+        return await asyncio.gather(*(provider.call(upstream, fallback=_fallback) for _ in range(5)))
+
+    results = asyncio.run(run())
+
+    assert upstream.calls == 1
+    assert results.count("reply 1") == 1
+    assert results.count("fallback") == 4
+    assert provider.breaker.state == "closed"
+
+
+def test_failed_probe_reopens_the_circuit():
+    provider = _provider()
+    provider.breaker.opened_at = time.monotonic() - 1.0
+    failing = FakeUpstream(error=RuntimeError("still down"))
+
+    assert asyncio.run(provider.call(failing, fallback=_fallback)) == "fallback"
+    assert provider.breaker.state == "open"
+    assert not provider.breaker.probing
+
+
+def test_half_open_transitions_on_the_breaker():
+    breaker = CircuitBreaker(failure_threshold=2, reset_sec=0.02)
+    breaker.record_failure()
+    assert breaker.state == "closed" and breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+
+    time.sleep(0.03)
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+    assert not breaker.allow()  # probe in flight
+    breaker.release_probe()  # cancelled probe
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.allow() and breaker.allow()
+
+
+def test_cancelled_probe_does_not_wedge_the_breaker():
+    provider = _provider()
+    provider.breaker.opened_at = time.monotonic() - 1.0
+
+    async def run():
+        task = asyncio.ensure_future(provider.call(FakeUpstream(delays=[1.0])))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(run())
+    assert provider.breaker.state == "half_open"
+    assert provider.breaker.allow()
@@ -0,0 +1,36 @@
+import asyncio
+from types import SimpleNamespace
+
+from app.services import llm_service
+from app.services.response_cache import ResponseCache, build_cache_key
+
+QUESTION = "Can you build an app for my clinic?"
+
+
+def test_cache_key_depends_on_the_system_prompt():
+    key = build_cache_key(QUESTION, "en", [], "prompt A")
+    assert key == build_cache_key(f"  {QUESTION.upper()} ", "en", [], "prompt A")
+    assert key != build_cache_key(QUESTION, "en", [], "prompt B")
+
+
+def test_replies_are_not_shared_across_system_prompts(monkeypatch):
+    calls = []
+
+    async def fake_completion(**params):
+        system_prompt = params["messages"][0]["content"]
+        calls.append(system_prompt)
+        message = SimpleNamespace(content=f"reply for {system_prompt}")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+    system_prompt = {"current": "prompt A"}
+    monkeypatch.setattr(llm_service, "response_cache", ResponseCache(max_entries=16, ttl_sec=60))
+    monkeypatch.setattr(llm_service, "create_completion", fake_completion)
+    monkeypatch.setattr(llm_service, "build_chat_system_prompt", lambda language_hint, query: system_prompt["current"])
+
+    assert asyncio.run(llm_service.get_chat_response(QUESTION)) == "reply for prompt A"
+    assert asyncio.run(llm_service.get_chat_response(QUESTION)) == "reply for prompt A"
+    system_prompt["current"] = "prompt B"
+    assert asyncio.run(llm_service.get_chat_response(QUESTION)) == "reply for prompt B"
+
+    assert calls == ["prompt A", "prompt B"]
+    assert llm_service.response_cache.hits == 1
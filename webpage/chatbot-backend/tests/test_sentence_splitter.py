@@ -0,0 +1,86 @@
+import random
+
+import pytest
+
+from app.services.sentence_splitter import _split_long, split_for_synthesis, split_sentences
+
+
+def test_split_sentences_keeps_numbers_and_addresses_intact():
+    text = "Call +91-7824030723 before 9.00 today. Or visit vmkdxailabs.com for details!"
+    assert split_sentences(text) == [
+        "Call +91-7824030723 before 9.00 today.",
+        "Or visit vmkdxailabs.com for details!",
+    ]
+
+
+def test_split_sentences_handles_tamil_and_hindi():
+    text = "வணக்கம், எப்படி உதவ முடியும்? हम वेबसाइट बनाते हैं। आपका नाम क्या है?"
+    assert split_sentences(text) == [
+        "வணக்கம், எப்படி உதவ முடியும்?",
+        "हम वेबसाइट बनाते हैं।",
+        "आपका नाम क्या है?",
+    ]
+
+
+def test_split_long_leaves_short_text_alone():
+    assert _split_long("Short sentence.", 40) == ["Short sentence."]
+    assert _split_long("x" * 40, 40) == ["x" * 40]
+
+
+def test_split_long_prefers_the_strongest_clause_boundary():
+    text = "We build websites, apps and chatbots; pricing depends on scope, timeline and features."
+    assert _split_long(text, 60) == [
+        "We build websites, apps and chatbots;",
+        "pricing depends on scope, timeline and features.",
+    ]
+
+
+def test_split_long_cuts_at_the_last_fitting_separator():
+    # The whole separator must fit: "three, " would end past the limit
+    text = "one, two, three, four, five, six"
+    assert _split_long(text, 16) == ["one, two,", "three, four,", "five, six"]
+
+
+def test_split_long_falls_back_to_spaces_then_hard_cuts():
+    assert _split_long("alpha beta gamma delta", 11) == ["alpha beta", "gamma delta"]
+    assert _split_long("abcdefghij", 4) == ["abcd", "efgh", "ij"]
+    # Hard-cut pieces carry no whitespace from around the cut
+    assert _split_long("abcdefgh website", 8) == ["abcdefgh", "website"]
+    assert _split_long("abcdefg\nwebsite", 8) == ["abcdefg", "website"]
+
+
+def test_split_for_synthesis_splits_only_long_sentences():
+    short = "Thank you for contacting us."
+    long = "Our packages include hosting, maintenance, SEO, analytics: all priced per month."
+    assert split_for_synthesis(f"{short} {long}", 50) == [
+        short,
+        "Our packages include hosting, maintenance, SEO,",
+        "analytics: all priced per month.",
+    ]
+
+
+def test_split_for_synthesis_of_empty_text():
+    assert split_for_synthesis("", 100) == []
+    assert split_for_synthesis("   \n ", 100) == []
+
+
+WORDS = [
+    "website", "app", "chatbot", "pricing", "வணக்கம்", "நன்றி", "वेबसाइट", "कीमत",
+    "a", "of", "supercalifragilisticexpialidocious",
+]
+SEPARATORS = [" ", " ", " ", ", ", "; ", ": ", " - ", " — ", ". ", "? ", "। ", "\n"]
+
+
+@pytest.mark.parametrize("max_chars", [8, 20, 50, 300])
+def test_split_for_synthesis_chunks_fit_and_keep_every_word(max_chars):
+    rng = random.Random(max_chars)
+    for _ in range(500):
+        text = "".join(
+            rng.choice(WORDS) + rng.choice(SEPARATORS) for _ in range(rng.randint(1, 60))
+        ).strip()
+        chunks = split_for_synthesis(text, max_chars)
+
+        assert all(0 < len(chunk) <= max_chars for chunk in chunks)
+        assert all(chunk == chunk.strip() for chunk in chunks)
+        # Only whitespace is lost (and words longer than max_chars are cut)
+        assert "".join("".join(chunks).split()) == "".join(text.split())
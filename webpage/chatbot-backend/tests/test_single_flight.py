@@ -0,0 +1,113 @@
+import asyncio
+
+import pytest
+
+from app.services.single_flight import SingleFlight, request_key
+
+
+class FakeUpstream:
+    """Counts calls; each answers after `delay`, or raises `error`, and cleans up slowly when cancelled."""
+
+    def __init__(self, delay: float = 0.05, error: Exception | None = None):
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+        self.cancelled = 0
+
+    async def __call__(self) -> str:
+        self.calls += 1
+        call = self.calls
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            # Cleanup that yields to the event loop (e.g. closing a connection)
+            await asyncio.sleep(0)
+            raise
+        if self.error is not None:
+            raise self.error
+        return f"answer {call}"
+
+
+def test_request_key_ignores_dict_order():
+    assert request_key({"a": 1, "b": [1, 2]}) == request_key({"b": [1, 2], "a": 1})
+    assert request_key({"a": 1}) != request_key({"a": 2})
+
+
+def test_concurrent_callers_share_one_call():
+    upstream = FakeUpstream()
+    flight = SingleFlight("test")
+
+    async def run():
+        return await asyncio.gather(*(flight.do("key", upstream) for _ in range(5)))
+
+    assert asyncio.run(run()) == ["answer 1"] * 5
+    assert upstream.calls == 1
+    assert flight.stats()["upstream_calls"] == 1
+    assert flight.stats()["coalesced"] == 4
+    assert flight.stats()["in_flight"] == 0
+
+
+def test_exception_reaches_every_waiter():
+    upstream = FakeUpstream(error=RuntimeError("upstream down"))
+    flight = SingleFlight("test")
+
+    async def run():
+        return await asyncio.gather(*(flight.do("key", upstream) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert upstream.calls == 1
+
+
+def test_one_cancelled_waiter_leaves_the_call_running():
+    upstream = FakeUpstream()
+    flight = SingleFlight("test")
+
+    async def run():
+        waiters = [asyncio.create_task(flight.do("key", upstream)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        waiters[0].cancel()
+        return await asyncio.gather(*waiters, return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert isinstance(results[0], asyncio.CancelledError)
+    assert results[1:] == ["answer 1", "answer 1"]
+    assert upstream.cancelled == 0
+
+
+def test_new_caller_after_every_waiter_is_cancelled_starts_a_fresh_call():
+    upstream = FakeUpstream()
+    flight = SingleFlight("test")
+
+    async def run():
+        waiters = [asyncio.create_task(flight.do("key", upstream)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        for waiter in waiters:
+            waiter.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+        # The cancelled call is still unwinding; a newcomer must not join it
+        return await flight.do("key", upstream)
+
+    assert asyncio.run(run()) == "answer 2"
+    assert upstream.calls == 2
+    assert upstream.cancelled == 1
+    assert flight.stats()["in_flight"] == 0
+
+
+@pytest.mark.parametrize("waiters", [1, 3])
+def test_cancelling_every_waiter_cancels_the_call(waiters):
+    upstream = FakeUpstream(delay=1.0)
+    flight = SingleFlight("test")
+
+    async def run():
+        tasks = [asyncio.create_task(flight.do("key", upstream)) for _ in range(waiters)]
+        await asyncio.sleep(0.01)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await asyncio.sleep(0.01)
+
+    asyncio.run(run())
+    assert upstream.cancelled == 1
+    assert flight.stats()["in_flight"] == 0
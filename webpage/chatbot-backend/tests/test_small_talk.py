@@ -0,0 +1,17 @@
+from app.services.small_talk import match_small_talk
+
+
+def test_small_talk_still_matches_after_a_reply_with_contact_details():
+    history = [
+        {"role": "user", "content": "How can I contact you?"},
+        {"role": "assistant", "content": "Email: info@vmkdxailabs.com\nPhone: +91-7824030723"},
+    ]
+    assert match_small_talk("thank you", "en", history) == ("thanks", "en")
+
+
+def test_small_talk_defers_to_the_llm_while_a_lead_field_is_asked():
+    history = [
+        {"role": "user", "content": "I need a chatbot"},
+        {"role": "assistant", "content": "Happy to help. May I have your name?"},
+    ]
+    assert match_small_talk("thank you", "en", history) is None
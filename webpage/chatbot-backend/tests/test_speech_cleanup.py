@@ -0,0 +1,117 @@
+import random
+import re
+
+import pytest
+
+from app.core.prompts import FAQ_ENTRIES, FAQ_LEAD_PROMPT, PHONE_SYSTEM_PROMPT, SMALL_TALK_REPLIES, SYSTEM_PROMPT
+from app.services.tts_service import clean_text_for_speech
+
+
+def legacy_clean_text_for_speech(text: str) -> str:
+    """clean_text_for_speech as it was before the guarded, cached step table."""
+    text = re.sub(r"\*{1,3}(.+?)\*{1,3}", r"\1", text)
+    text = re.sub(r"_{1,3}(.+?)_{1,3}", r"\1", text)
+    text = re.sub(r"^#{1,6}\s*", "", text, flags=re.MULTILINE)
+    text = re.sub(r"\[([^\]]+)\]\([^)]+\)", r"\1", text)
+    text = re.sub(r"`([^`]+)`", r"\1", text)
+    text = re.sub(r"^[\s]*[-*•]\s+", "", text, flags=re.MULTILINE)
+    text = re.sub(r"^[\s]*\d+\.\s+", "", text, flags=re.MULTILINE)
+    text = re.sub(r"^[-*_]{3,}\s*$", "", text, flags=re.MULTILINE)
+    text = re.sub(r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}", "", text)
+    text = re.sub(r"https?://[^\s]+", "", text)
+    text = re.sub(r"(\w)/(\w)", r"\1 or \2", text)
+    text = re.sub(r"[━═╌│┃┌┐└┘├┤┬┴┼]", "", text)
+    text = re.sub(r'[*#~^`|\\/@$%&+={}[\]<>";]', "", text)
+    text = re.sub(r"\b(?:at|to)\s+or\s+(?:visit|call)?\s*$", ".", text, flags=re.MULTILINE)
+    text = re.sub(r"reach us at\s*or\s*", "reach us. ", text)
+    text = re.sub(r"reach us at\s*\.", "reach us.", text)
+    text = re.sub(r"reach us\s+\.", "reach us.", text)
+    text = re.sub(r"\bat\s*\.\s*$", ".", text, flags=re.MULTILINE)
+    text = re.sub(r"\bvisit\s*\.\s*$", ".", text, flags=re.MULTILINE)
+    text = re.sub(r"You can reach us\s+or\s*$", "You can reach us.", text, flags=re.MULTILINE)
+    text = re.sub(r"\bor\s+visit\s*\.?\s*$", ".", text, flags=re.MULTILINE)
+    text = re.sub(r"\bat\s*$", ".", text, flags=re.MULTILINE)
+    text = re.sub(r"\b(91-\d)", r"+\1", text)
+    text = re.sub(r"  +", " ", text)
+    text = re.sub(r"\n{3,}", "\n\n", text)
+    text = "\n".join(line.strip() for line in text.split("\n"))
+    return text.strip()
+
+
+# Frozen outputs for typical replies: markdown, contact details, Tamil, Hindi
+GOLDEN_CASES = [
+    (
+        "**Great question!** We build _custom_ websites.\n\n## Pricing\n- Basic: ₹15,000\n- Pro: ₹45,000\n\n"
+        "1. Share your name\n2. Share your mobile\n\n"
+        "You can reach us at info@vmkdxailabs.com or visit https://vmkdxailabs.com.",
+        "Great question! We build custom websites.\n\nPricing\nBasic: ₹15,000\nPro: ₹45,000\n"
+        "Share your name\nShare your mobile\n\nYou can reach us.",
+    ),
+    ("We integrate CRM/ERP systems.", "We integrate CRM or ERP systems."),
+    ("Call us at 91-7824030723 or email info@vmkdxailabs.com", "Call us at +91-7824030723 or email"),
+    ("[Our site](https://vmkdxailabs.com) has `details`.", "Our site has details."),
+    (
+        "எங்கள் சேவைகள்: **வலைத்தள வடிவமைப்பு**, *மொபைல் ஆப்*.",
+        "எங்கள் சேவைகள்: வலைத்தள வடிவமைப்பு, மொபைல் ஆப்.",
+    ),
+    (
+        "हमारी सेवाएँ:\n\n\n\n---\n[हमारी वेबसाइट](https://vmkdxailabs.com) देखें।",
+        "हमारी सेवाएँ:\n\nहमारी वेबसाइट देखें।",
+    ),
+]
+
+# Tokens the fuzzed corpus is built from: every pattern's trigger, plus the
+# whitespace and words the incomplete-sentence cleanup keys on
+FUZZ_TOKENS = [
+    "**", "*", "_", "__", "#", "## ", "[", "]", "(", ")", "](", "`", "-", "•", "1. ",
+    "\n", "\n\n\n", "  ", " ", "\t", "a", "at", "to", "or", "visit", "call", "reach us",
+    "reach us at", "You can reach us", "91-7", "/", "x/y", "@", "a@b.com", "http://x.y/z",
+    "━", "│", "$", "%", "வணக்கம்", "नमस्ते", ".", ",", "?", "!",
+]
+FUZZ_CASES = 20_000
+
+
+def _strings(value) -> list[str]:
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, dict):
+        return _strings(list(value.values()))
+    if isinstance(value, (list, tuple)):
+        return [text for item in value for text in _strings(item)]
+    return []
+
+
+def _golden_corpus() -> list[str]:
+    corpus = [text for text, _ in GOLDEN_CASES]
+    for prompt in (SYSTEM_PROMPT, PHONE_SYSTEM_PROMPT):
+        corpus.append(prompt)
+        corpus.extend(prompt.split("\n\n"))
+    corpus.extend(_strings(FAQ_ENTRIES))
+    corpus.extend(_strings(FAQ_LEAD_PROMPT))
+    corpus.extend(_strings(SMALL_TALK_REPLIES))
+    rng = random.Random(1)
+    for _ in range(FUZZ_CASES):
+        corpus.append("".join(rng.choice(FUZZ_TOKENS) for _ in range(rng.randint(1, 25))))
+    return corpus
+
+
+@pytest.mark.parametrize("text,expected", GOLDEN_CASES)
+def test_golden_outputs(text, expected):
+    assert legacy_clean_text_for_speech(text) == expected
+    assert clean_text_for_speech(text) == expected
+
+
+def test_matches_legacy_implementation_on_golden_corpus():
+    mismatches = [
+        text for text in _golden_corpus()
+        if clean_text_for_speech.__wrapped__(text) != legacy_clean_text_for_speech(text)
+    ]
+    assert mismatches == []
+
+
+def test_cached_result_matches_uncached():
+    text = GOLDEN_CASES[0][0]
+    first = clean_text_for_speech(text)
+    hits = clean_text_for_speech.cache_info().hits
+    assert clean_text_for_speech(text) == first == clean_text_for_speech.__wrapped__(text)
+    assert clean_text_for_speech.cache_info().hits == hits + 1
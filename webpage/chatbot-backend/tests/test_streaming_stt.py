@@ -0,0 +1,143 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import stream_processor
+from app.services.stream_processor import CallSession, _transcribe_turn
+from app.services.streaming_stt import GoogleStreamingRecognizer, StreamingRecognizer
+
+FRAME = b"\x00" * 160  # 20 ms of 8 kHz mulaw
+
+
+def _response(text: str, is_final: bool, language_code: str) -> SimpleNamespace:
+    result = SimpleNamespace(
+        alternatives=[SimpleNamespace(transcript=text)],
+        is_final=is_final,
+        language_code=language_code,
+    )
+    return SimpleNamespace(results=[result])
+
+
+class FakeSpeechClient:
+    """Stands in for SpeechAsyncClient: one more word of interim result per
+    audio frame, then the whole phrase as a final result when audio ends."""
+
+    def __init__(self, words: list[str], language_code: str = "en-in", hang: bool = False):
+        self.words = words
+        self.language_code = language_code
+        self.hang = hang
+        self.config = None
+        self.frames = 0
+
+    async def streaming_recognize(self, requests):
+        return self._responses(requests)
+
+    async def _responses(self, requests):
+        async for request in requests:
+            if self.config is None:
+                self.config = request.streaming_config
+                continue
+            self.frames += 1
+            if self.words:
+                yield _response(" ".join(self.words[:self.frames]), False, self.language_code)
+        if self.hang:
+            await asyncio.sleep(3600)
+        if self.words:
+            yield _response(" ".join(self.words), True, self.language_code)
+
+
+def test_recognizer_without_run_fails_at_creation():
+    class Incomplete(StreamingRecognizer):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_interim_then_final_results():
+    client = FakeSpeechClient(["I", "need", "a", "chatbot"], language_code="en-in")
+    results = []
+
+    async def run():
+        recognizer = GoogleStreamingRecognizer("ta", lambda text, final: results.append((text, final)), client)
+        for _ in range(3):
+            recognizer.feed(FRAME)
+        await asyncio.sleep(0.01)
+        interim = recognizer.transcript()
+        return interim, await recognizer.finish(timeout=1.0)
+
+    interim, result = asyncio.run(run())
+
+    assert interim == "I need a"
+    assert results == [("I", False), ("I need", False), ("I need a", False), ("I need a chatbot", True)]
+    assert result == {"transcript": "I need a chatbot", "detected_language": "en"}
+    # The hinted language is primary, the others stay as alternatives
+    assert client.config.config.language_code == "ta-IN"
+    assert set(client.config.config.alternative_language_codes) == {"en-IN", "hi-IN"}
+    assert client.config.interim_results
+
+
+def test_finish_timeout_returns_partial_results():
+    client = FakeSpeechClient(["vanakkam", "enakku", "website"], hang=True)
+
+    async def run():
+        recognizer = GoogleStreamingRecognizer("auto", client=client)
+        for _ in range(2):
+            recognizer.feed(FRAME)
+        await asyncio.sleep(0.01)
+        start = time.perf_counter()
+        result = await recognizer.finish(timeout=0.05)
+        recognizer.cancel()
+        return result, time.perf_counter() - start
+
+    result, elapsed = asyncio.run(run())
+
+    assert result["transcript"] == "vanakkam enakku"
+    assert result["detected_language"] == "en"
+    assert elapsed < 0.5
+
+
+class FakeWhisper:
+    def __init__(self):
+        self.calls = []
+
+    async def __call__(self, audio_content, content_type, language_hint):
+        self.calls.append((audio_content, content_type, language_hint))
+        return {"transcript": "from whisper", "detected_language": "hi"}
+
+
+def _turn_with(client: FakeSpeechClient, monkeypatch) -> tuple[tuple[str, str] | None, FakeWhisper]:
+    whisper = FakeWhisper()
+    monkeypatch.setattr(stream_processor, "transcribe_audio", whisper)
+
+    async def run():
+        session = CallSession("CA-test")
+        session.recognizer = GoogleStreamingRecognizer(client=client)
+        for _ in range(25):  # 0.5 s of speech
+            session.audio_buffer.append(FRAME)
+            session.recognizer.feed(FRAME)
+        await asyncio.sleep(0.01)
+        return await _transcribe_turn(session), session
+
+    (result, session) = asyncio.run(run())
+    assert session.audio_buffer == []
+    return result, whisper
+
+
+def test_empty_stream_falls_back_to_whisper(monkeypatch):
+    result, whisper = _turn_with(FakeSpeechClient([]), monkeypatch)
+
+    assert result == ("from whisper", "hi")
+    assert len(whisper.calls) == 1
+    wav_bytes, content_type, _ = whisper.calls[0]
+    assert content_type == "audio/wav"
+    assert wav_bytes[:4] == b"RIFF"
+
+
+def test_streamed_transcript_skips_whisper(monkeypatch):
+    result, whisper = _turn_with(FakeSpeechClient(["namaste", "ji"], language_code="hi-in"), monkeypatch)
+
+    assert result == ("namaste ji", "hi")
+    assert whisper.calls == []
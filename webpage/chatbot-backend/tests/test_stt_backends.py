@@ -0,0 +1,50 @@
+import asyncio
+
+import pytest
+
+from app.services.stt_backends import STTBackend, get_stt_backend
+
+
+class FakeBackend(STTBackend):
+    name = "fake"
+
+    def __init__(self, error: Exception | None = None):
+        super().__init__()
+        self.error = error
+
+    async def _transcribe(self, audio_content, filename, content_type, language):
+        if self.error is not None:
+            raise self.error
+        return {"transcript": "vanakkam", "language": language or "ta", "duration": 2.0}
+
+
+def test_backend_without_transcribe_fails_at_creation():
+    class Incomplete(STTBackend):
+        name = "incomplete"
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_transcribe_records_latency_and_real_time_factor():
+    backend = FakeBackend()
+    result = asyncio.run(backend.transcribe(b"audio", "audio.webm", "audio/webm"))
+
+    assert result == {"transcript": "vanakkam", "language": "ta", "duration": 2.0}
+    snapshot = backend.stats.snapshot()
+    assert snapshot["calls"] == 1
+    assert snapshot["audio_sec"] == 2.0
+    assert snapshot["real_time_factor"] < 0.1
+
+
+def test_transcribe_counts_failures():
+    backend = FakeBackend(error=RuntimeError("decode failed"))
+    with pytest.raises(RuntimeError):
+        asyncio.run(backend.transcribe(b"audio", "audio.webm", "audio/webm"))
+    assert backend.stats.failures == 1
+    assert backend.stats.calls == 0
+
+
+def test_unknown_backend_name():
+    with pytest.raises(ValueError):
+        get_stt_backend("cloud_magic")
@@ -0,0 +1,127 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import tts_service
+from app.services.resilience import ResilientProvider
+from app.services.tts_service import MP3, TTSEngine
+
+
+class FakeTTSClient:
+    """Stands in for TextToSpeechAsyncClient, answering after scripted delays."""
+
+    def __init__(self, delays: list[float]):
+        self.delays = delays
+        self.calls = 0
+        self.active = 0
+        self.max_active = 0
+
+    async def synthesize_speech(self, input, voice, audio_config):
+        delay = self.delays[min(self.calls, len(self.delays) - 1)]
+        self.calls += 1
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            self.active -= 1
+        return SimpleNamespace(audio_content=f"audio:{voice.name}:{input.text}".encode())
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    """A fresh engine and TTS provider wired into tts_service, with caching off."""
+
+    def build(slots: int, delays: list[float], **provider_options) -> tuple[TTSEngine, ResilientProvider]:
+        engine = TTSEngine()
+        engine._semaphore = asyncio.Semaphore(slots)
+        engine._client = FakeTTSClient(delays)
+        options = {"name": "google_tts_test", "timeout_sec": 1.0, "failure_threshold": 1}
+        options.update(provider_options)
+        provider = ResilientProvider(**options)
+        monkeypatch.setattr(tts_service, "tts_engine", engine)
+        monkeypatch.setattr(tts_service, "tts_provider", provider)
+        monkeypatch.setattr(tts_service.settings, "tts_cache_enabled", False)
+        return engine, provider
+
+    return build
+
+
+def _synthesize_concurrently(count: int) -> list[bytes]:
+    async def run():
+        return await asyncio.gather(*(
+            tts_service._synthesize_sentence(f"Sentence {index}.", "en", MP3) for index in range(count)
+        ))
+
+    return asyncio.run(run())
+
+
+def test_queued_requests_do_not_count_as_upstream_timeouts(engine):
+    # N slots, N + 1 requests: the last one queues for a full synthesis,
+    # which together with its own synthesis exceeds the deadline
+    slots = 2
+    tts_engine, provider = engine(slots, delays=[0.06], timeout_sec=0.1)
+
+    results = _synthesize_concurrently(slots + 1)
+
+    assert all(b"Chirp3-HD" in audio for audio in results)
+    assert provider.timeouts == 0
+    assert provider.failures == 0
+    assert provider.fallbacks == 0
+    assert provider.breaker.state == "closed"
+    assert tts_engine.queued == 1
+    assert tts_engine._client.max_active == slots
+    assert tts_engine.stats()["avg_queue_wait_ms"] > 0
+
+
+def test_hedged_attempt_runs_in_the_callers_slot(engine):
+    # One slot: the hedge must not wait for the stalled first attempt's slot
+    tts_engine, provider = engine(1, delays=[0.5, 0.01], hedge_percentile=0.95, hedge_min_samples=5)
+    for _ in range(5):
+        provider.latency.observe(10.0)
+
+    start = time.perf_counter()
+    (audio,) = _synthesize_concurrently(1)
+
+    assert time.perf_counter() - start < 0.3
+    assert b"Chirp3-HD" in audio
+    assert provider.hedge_wins == 1
+    assert tts_engine._client.calls == 2
+    assert tts_engine.slots_taken == 1
+
+
+def test_concurrent_syntheses_do_not_stall_the_event_loop(engine):
+    # 20 replies at once on the shared client: at most tts_max_concurrency
+    # upstream at a time, and the loop keeps serving other work meanwhile
+    slots = tts_service.settings.tts_max_concurrency
+    tts_engine, provider = engine(slots, delays=[0.05])
+    tick_sec = 0.005
+
+    async def run() -> tuple[list[bytes], float]:
+        lags = []
+        stop = asyncio.Event()
+
+        async def ticker():
+            loop = asyncio.get_running_loop()
+            while not stop.is_set():
+                expected = loop.time() + tick_sec
+                await asyncio.sleep(tick_sec)
+                lags.append(loop.time() - expected)
+
+        ticking = asyncio.create_task(ticker())
+        results = await asyncio.gather(*(
+            tts_service._synthesize_sentence(f"Sentence {index}.", "en", MP3) for index in range(20)
+        ))
+        stop.set()
+        await ticking
+        return results, max(lags)
+
+    results, max_lag = asyncio.run(run())
+
+    assert len(set(results)) == 20
+    assert tts_engine._client.max_active == slots
+    assert tts_engine.max_in_flight == slots
+    assert provider.timeouts == 0
+    assert max_lag < 0.05
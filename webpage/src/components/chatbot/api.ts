@@ -27,6 +27,12 @@ export async function sendChatMessage(request: ChatRequest): Promise<ChatRespons
   return data;
 }
 
+// Opus replies are much smaller than MP3; browsers that cannot play Ogg Opus get MP3
+function preferredAudioFormat(): "ogg" | "mp3" {
+  const probe = document.createElement("audio");
+  return probe.canPlayType('audio/ogg; codecs="opus"') ? "ogg" : "mp3";
+}
+
 export async function sendVoiceMessage(
   audioBlob: Blob,
   language: Language,
@@ -36,6 +42,7 @@ export async function sendVoiceMessage(
   formData.append("audio", audioBlob, "recording.webm");
   formData.append("language", language);
   formData.append("session_id", sessionId);
+  formData.append("audio_format", preferredAudioFormat());
 
   const res = await fetch(`${API_BASE}/voice`, {
     method: "POST",
@@ -36,17 +36,11 @@ export function useChatbot(): UseChatbotReturn {
       setIsLoading(true);
 
       try {
-        // Build history from last 10 messages
-        const history = [...messages, userMsg].slice(-10).map((m) => ({
-          role: m.role,
-          content: m.content,
-        }));
-
+        // History is kept server-side per session_id; only the new message is sent
         const response = await sendChatMessage({
           message: text,
           language,
           session_id: sessionIdRef.current,
-          history,
         });
 
         const assistantMsg: ChatMessage = {
@@ -73,7 +67,7 @@ export function useChatbot(): UseChatbotReturn {
         setIsLoading(false);
       }
     },
-    [messages, language]
+    [language]
   );
 
   const sendVoice = useCallback(
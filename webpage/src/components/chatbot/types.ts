@@ -13,7 +13,8 @@ export interface ChatRequest {
   message: string;
   language: Language;
   session_id: string;
-  history: { role: "user" | "assistant"; content: string }[];
+  /** Deprecated: the server keeps conversation history per session_id. */
+  history?: { role: "user" | "assistant"; content: string }[];
 }
 
 export interface LeadData {